@@ -1,16 +1,25 @@
 import os
-from distutils.dir_util import copy_tree
 import pickle
 import importlib
 import numpy as np
 from textwrap import dedent, shorten
 import pandas as pd
 import webbrowser
+import requests
 from shutil import copyfile
 from JMTracker import settings, input_option_settings
+from JMTracker.profiling import profiler
+from JMTracker.metrics import metrics_run
+from JMTracker.scrapper import scrapper_registry
+from JMTracker.snapshots import SnapshotArchive
+from JMTracker.background import BackgroundJob
+from JMTracker.scaffolding import Scaffolder, render_name
+from JMTracker.ical import DeadlineFeed
+from JMTracker.tables import PagedTable
+from JMTracker.storage import PostingIndex, PostingQuery, edit_posting
+from JMTracker.auxiliary import time_left_labels
 import logging
 import PySimpleGUI as sg
-import humanize
 
 
 class Tracker():
@@ -95,6 +104,315 @@ class Tracker():
         self._pending_updates_url = os.path.join(
             self._storage_dir, 'updates_pending_review.pkl'
         )
+        self._snapshots = SnapshotArchive(
+            os.path.join(self._storage_dir, 'snapshots'))
+        # Applied postings at the last snapshot refresh, see _save_postings
+        self._applied_keys = None
+        self._deadline_feed = DeadlineFeed(
+            os.path.join(self._output_dir, 'deadlines.ics'),
+            os.path.join(self._storage_dir, 'deadlines_ics.json'))
+        # Stored dataframes kept in memory between screens, see _read_frame
+        self._frame_cache = {}
+        return
+
+    def _read_frame(self, url):
+        """Load a pickled dataframe, reusing the copy in memory while the
+        file is unchanged. Returns a copy callers are free to modify."""
+        stat = os.stat(url)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._frame_cache.get(url, None)
+        if cached is None or cached[0] != version:
+            cached = (version, pd.read_pickle(url))
+            self._frame_cache[url] = cached
+        return cached[1].copy()
+
+    def _write_frame(self, df, url):
+        """Pickle a dataframe, keeping a copy in memory. The file is replaced
+        atomically, so an interrupted write never leaves it corrupt."""
+        self._write_frames({url: df})
+        return
+
+    def _write_frames(self, frames):
+        """Pickle several dataframes, given by file path, as in _write_frame.
+        Every file is written before any is replaced, so a failed write
+        leaves all of them as they were."""
+        for url, df in frames.items():
+            df.to_pickle(url + '.tmp')
+        for url, df in frames.items():
+            os.replace(url + '.tmp', url)
+            stat = os.stat(url)
+            self._frame_cache[url] = ((stat.st_mtime_ns, stat.st_size),
+                                      df.copy())
+        return
+
+    @profiler.timed('storage.load_postings')
+    def _load_postings(self):
+        """Load the stored postings dataframe"""
+        return self._read_frame(self._postings_url)
+
+    @profiler.timed('storage.save_postings')
+    def _save_postings(self, postings, updates=None):
+        """Store the postings dataframe, and the updates pending review
+        along with it if given"""
+        frames = {self._postings_url: postings}
+        if updates is not None:
+            frames[self._pending_updates_url] = updates
+        self._write_frames(frames)
+        self._export_deadlines(postings)
+        # Snapshot the pages of postings just marked applied
+        if self._applied_keys is not None and \
+                settings['snapshots_auto_refresh'] and \
+                len(self._applied(postings) - self._applied_keys) > 0:
+            self.refresh_snapshots()
+        return
+
+    @staticmethod
+    def _applied(postings):
+        """Set of origin and origin_id of the applied postings"""
+        if 'status' not in postings.columns:
+            return set()
+        sel = postings['status'] == 'applied'
+        return set(zip(postings.loc[sel, 'origin'],
+                       postings.loc[sel, 'origin_id']))
+
+    @profiler.timed('storage.export_deadlines')
+    def _export_deadlines(self, postings):
+        """Update the .ics file of deadlines with the stored postings"""
+        if not settings['ical_export_enabled'] or \
+                'status' not in postings.columns:
+            return
+        try:
+            self._deadline_feed.export(postings, settings['ical_statuses'])
+        except OSError as err:
+            logging.warning(f"Couldn't export the deadlines calendar: {err}")
+        return
+
+    @profiler.timed('storage.load_pending_updates')
+    def _load_pending_updates(self):
+        """Load the updates pending review"""
+        return self._read_frame(self._pending_updates_url)
+
+    @profiler.timed('storage.save_pending_updates')
+    def _save_pending_updates(self, updates):
+        """Store the updates pending review"""
+        self._write_frame(updates, self._pending_updates_url)
+        return
+
+    @staticmethod
+    def _update_fields(updates):
+        """Fields changed by each pending update
+
+        Returns
+        -------
+        DataFrame
+            one boolean column per field, aligned with updates
+        """
+        notes = updates['update_notes'].fillna('').str.split(',').explode()
+        notes = notes.str.replace('new', '', regex=False).str.strip()
+        notes = notes[notes.str.len() > 0]
+        if notes.shape[0] == 0:
+            return pd.DataFrame(index=updates.index, dtype=bool)
+        fields = pd.crosstab(notes.index, notes.values) > 0
+        fields = fields.reindex(index=updates.index, fill_value=False)
+        fields.columns.name = None
+        return fields
+
+    @profiler.timed('storage.resolve_updates')
+    def _resolve_updates(self, keys, fields=None, accept=True):
+        """Accept or reject pending updates, writing each file once
+
+        Parameters
+        ----------
+        keys: DataFrame
+            origin and origin_id of the updates to resolve
+        fields: list, optional
+            only resolve the updates of these fields, all if None
+        accept: bool, optional
+            whether the new values are copied into the postings
+
+        Returns
+        -------
+        int
+            number of field updates resolved
+        """
+        updates = self._load_pending_updates()
+        updates.reset_index(inplace=True, drop=True)
+        key_cols = ['origin', 'origin_id']
+        rows = pd.MultiIndex.from_frame(updates[key_cols]).isin(
+            pd.MultiIndex.from_frame(keys[key_cols]))
+        flags = self._update_fields(updates)
+        if fields is not None:
+            flags = flags.loc[:, [x for x in fields if x in flags.columns]]
+        resolved = flags.loc[rows, :]
+        if resolved.to_numpy().sum() == 0:
+            return 0
+
+        # Postings first: if the second write fails the updates are still
+        # pending and accepting them again gives the same result
+        if accept:
+            postings = self._load_postings()
+            positions = pd.MultiIndex.from_frame(postings[key_cols]).get_indexer(
+                pd.MultiIndex.from_frame(updates.loc[rows, key_cols]))
+            for field in resolved.columns:
+                sel = resolved[field].to_numpy() & (positions >= 0)
+                postings.iloc[positions[sel],
+                              postings.columns.get_loc(field)] = \
+                    updates.loc[rows, field + '_new'].to_numpy()[sel]
+            self._save_postings(postings)
+
+        left = self._update_fields(updates)
+        left.loc[resolved.index, resolved.columns] &= ~resolved
+        # Rebuild the notes of the updates with fields left to review
+        notes = pd.Series('', index=updates.index)
+        for field in left.columns:
+            notes = notes + np.where(left[field], f'new {field},', '')
+        updates['update_notes'] = notes
+        self._save_pending_updates(updates.loc[notes != '', :])
+        return int(resolved.to_numpy().sum())
+
+    @profiler.timed('storage.edit_postings')
+    def _edit_postings(self, keys, changes):
+        """Set several postings to the same values with a single write
+
+        Parameters
+        ----------
+        keys: DataFrame
+            origin and origin_id of the postings to edit
+        changes: dict
+            new values by column
+
+        Returns
+        -------
+        int
+            number of postings edited
+        """
+        postings = self._load_postings()
+        key_cols = ['origin', 'origin_id']
+        positions = pd.MultiIndex.from_frame(postings[key_cols]).get_indexer(
+            pd.MultiIndex.from_frame(keys[key_cols]))
+        if (positions < 0).any():
+            logging.warning(f"{(positions < 0).sum():d} edited postings were "
+                            "not found in the postings file")
+        positions = positions[positions >= 0]
+        if len(positions) == 0:
+            return 0
+        logging.info(f"Setting {len(positions):d} postings to {changes}")
+        for col, value in changes.items():
+            if col in postings.columns:
+                postings.iloc[positions, postings.columns.get_loc(col)] = value
+        self._save_postings(postings)
+        return len(positions)
+
+    # Events of the bulk edit controls
+    _bulk_events = ['-SET STATUS-', '-SET VALUE-', '-MARK APPLIED-']
+
+    def _bulk_edit_layout(self, statuses):
+        """Controls to edit the selected rows of a table together
+
+        Parameters
+        ----------
+        statuses: list
+            statuses offered
+
+        Returns
+        -------
+        list
+            a layout row
+        """
+        custom_cols = self._personal_settings['custom_posting_cols']
+        row = [sg.Text("Selected:"),
+               sg.Combo(statuses, default_value=statuses[0],
+                        key='-BULK STATUS-', readonly=True),
+               sg.Button("Set status", key='-SET STATUS-'),
+               sg.Button("Mark applied", key='-MARK APPLIED-')]
+        if len(custom_cols) > 0:
+            row += [sg.Combo(custom_cols, default_value=custom_cols[0],
+                             key='-BULK COLUMN-', readonly=True),
+                    sg.Input(key='-BULK VALUE-', size=(15, 1)),
+                    sg.Button("Set value", key='-SET VALUE-')]
+        return row
+
+    def _bulk_edit(self, table, rows, event, values,
+                   window_location=(None, None)):
+        """Apply a bulk edit event to the selected rows of a PagedTable,
+        writing the postings file once
+
+        Returns
+        -------
+        bool
+            whether any posting was edited
+        """
+        if rows is None or len(rows) == 0:
+            sg.popup("Select the postings to edit first",
+                     location=window_location)
+            return False
+        if event == '-SET STATUS-':
+            changes = {'status': values['-BULK STATUS-']}
+        elif event == '-MARK APPLIED-':
+            changes = {'status': 'applied'}
+        else:
+            changes = {values['-BULK COLUMN-']: values['-BULK VALUE-'].strip()}
+        if changes.get('status', None) == 'ignore':
+            res = sg.popup_ok_cancel(
+                f"Are you sure you wish to ignore {len(rows):d} postings?",
+                location=window_location
+            )
+            if res != 'OK':
+                return False
+
+        positions = table.positions(rows)
+        self._edit_postings(table.postings.iloc[positions, :], changes)
+        table.update_rows(positions, changes)
+        return True
+
+    def _scaffolder(self):
+        """A Scaffolder for the configured paths, None with an error popup
+        if they are not configured"""
+        base = self._personal_settings['scaffolding_base']
+        out_dir = self._personal_settings['scaffolding_output_dir']
+        if base is None or out_dir is None:
+            sg.popup_error("To crate a folder you must first configure"
+                           " the scaffolding paths in the configuration menu")
+            return None
+        return Scaffolder(base, out_dir, settings['scaffolding_link_mode'],
+                          settings['scaffolding_workers'])
+
+    def _known_ids(self, origin):
+        """origin_id of the stored postings of a source, so that scrappers
+        can skip them"""
+        if not os.path.isfile(self._postings_url):
+            return set()
+        postings = self._load_postings()
+        return set(postings.loc[postings['origin'] == origin, 'origin_id'])
+
+    def refresh_snapshots(self, background=True):
+        """Store local snapshots of the shortlisted postings' pages
+
+        Parameters
+        ----------
+        background: bool, optional
+            refresh on a background thread
+
+        Returns
+        -------
+        Thread, dict or None
+            the refresh thread if background, else the refresh counts. None
+            if snapshots are disabled or there are no postings
+        """
+        if not settings['snapshots_enabled'] or \
+                not os.path.isfile(self._postings_url):
+            return None
+        postings = self._load_postings()
+        self._applied_keys = self._applied(postings)
+        sel = postings['status'].isin(settings['snapshot_statuses'])
+        postings = postings.loc[sel, ['origin', 'origin_id', 'url']].copy()
+        if background:
+            return self._snapshots.refresh_in_background(postings)
+        return self._snapshots.refresh(postings)
+
+    def _open_posting(self, row):
+        """Open the snapshot of a posting, or its website if it has none"""
+        self._snapshots.open(row['origin'], row['origin_id'], row['url'])
         return
 
     def main_gui(self):
@@ -109,51 +427,46 @@ class Tracker():
             [sg.Text("Edit ignored postings:"),
              sg.Button("view", key="-IGNORED-")],
             [sg.Text("View deadlines:"), sg.Button("view", key="-DEADLINES-")],
+            [sg.Text("Deadline calendar:"),
+             sg.Button("view", key="-CALENDAR-")],
             [sg.Text("Manage applications:"), sg.Button(
                 "view", key="-APPLICATIONS-")],
             [sg.Text("Settings:"), sg.Button("view", key="-SETTINGS-")],
             [sg.Text("View help:"), sg.Button("view", key="-HELP-")],
             [sg.Button("Close")]
         ]
+        # Each screen runs while the main window is hidden, then control
+        # comes back to this loop
+        screens = {
+            "-UPDATE POSTINGS-": self.update_postings_gui,
+            "-NEW-": self.review_new_postings,
+            "-IGNORED-": self.review_ignored_gui,
+            "-MANUAL-": self.manual_entry,
+            "-DEADLINES-": self.review_interested_gui,
+            "-CALENDAR-": self.view_deadlines,
+            "-APPLICATIONS-": self.review_applications_gui,
+            "-SETTINGS-": self.set_configuration_gui,
+            "-UPDATES-": self.review_updates,
+        }
         window = sg.Window('Job Market Tracker', layout, resizable=True)
+        # Later refreshes start when postings are marked applied
+        if settings['snapshots_auto_refresh'] and \
+                settings['snapshots_refresh_on_start']:
+            self.refresh_snapshots()
+        elif os.path.isfile(self._postings_url):
+            self._applied_keys = self._applied(self._load_postings())
+        else:
+            self._applied_keys = set()
         while True:
             event, values = window.read()
-            window_location = window.CurrentLocation(True)
             if event == sg.WIN_CLOSED or event == "Close":
                 window.close()
                 return
-            elif event == "-UPDATE POSTINGS-":
-                window.close()
-                self.update_postings_gui(window_location)
-                return self.main_gui()
-            elif event == "-NEW-":
-                window.close()
-                self.review_new_postings(window_location)
-                return self.main_gui()
-            elif event == '-IGNORED-':
-                window.close()
-                self.review_ignored_gui(window_location)
-                return self.main_gui()
-            elif event == "-MANUAL-":
-                window.close()
-                self.manual_entry(window_location)
-                return self.main_gui()
-            elif event == "-DEADLINES-":
-                window.close()
-                self.review_interested_gui(window_location)
-                return self.main_gui()
-            elif event == "-APPLICATIONS-":
-                window.close()
-                self.review_applications_gui(window_location)
-                return self.main_gui()
-            elif event == "-SETTINGS-":
-                window.close()
-                self.set_configuration_gui(window_location)
-                return self.main_gui()
-            elif event == "-UPDATES-":
-                window.close()
-                self.review_updates()
-                return self.main_gui()
+            window_location = window.CurrentLocation(True)
+            if event in screens:
+                window.hide()
+                screens[event](window_location)
+                window.un_hide()
             elif event == "-HELP-":
                 help_text = dedent(
                     """
@@ -188,6 +501,8 @@ class Tracker():
                     each deadline (particularly those that show up as very far
                     in the future). The system allows you to modify the deadline
                     of each interested posting manually at this stage.
+                    "Deadline calendar" shows how many deadlines fall on each
+                    day of the coming weeks, and the postings due on a day.
 
                     If you have any questions or found a bug, please submit an issues
                     to the github page. If there's a new version and you would
@@ -203,10 +518,10 @@ class Tracker():
                                   size=(65, 35), font='Helvetica 12')
             else:
                 logging.info(f"Got unkown event {event}")
-                return
 
         return
 
+    @profiler.action('update_postings_gui')
     def update_postings_gui(self, window_location=(None, None)):
         """Prompt to update files from AEA and EJM
         """
@@ -227,12 +542,19 @@ class Tracker():
                 hint = 'hint: download from here'
                 if expected_extension is not None:
                     hint = f'hint: download from here as {expected_extension}'
+                buttons = [sg.Text(hint),
+                           sg.Button("link", key=f"-LINK-{origin}-"),
+                           sg.Button("help", key=f"-HELP-{origin}-")]
+                # Sources with both a link and a download action get a
+                # separate button for the action
+                if source_setting.get('download_url', None) is not None and \
+                        source_setting.get('download_action', None) is not None:
+                    buttons.append(
+                        sg.Button("download", key=f"-DOWNLOAD-{origin}-"))
                 layout = [
                     [sg.Text(f"{origin} file: "), sg.Input(),
                      sg.FileBrowse(key=f"-IN-{origin}-")],
-                    [sg.Text(hint),
-                     sg.Button("link", key=f"-LINK-{origin}-"),
-                     sg.Button("help", key=f"-HELP-{origin}-")],
+                    buttons,
                     [sg.Button(f"Update {origin}", key=f"-UPDATE-{origin}-")],
                 ]
                 # Add a separator
@@ -245,11 +567,35 @@ class Tracker():
             layout = [
                 [sg.Column(mid_layouts)],
                 [sg.HSeparator()],
-                [sg.Button("Close and Save", key="-CLOSE-")]
+                [sg.Text('', key='-PROGRESS-', size=(60, 1))],
+                [sg.Button("Cancel", key="-CANCEL-", disabled=True),
+                 sg.Button("Close and Save", key="-CLOSE-")]
             ]
 
             return layout
 
+        # Updates and scrapes run in the background so the window stays
+        # responsive. Only one runs at a time.
+        job = None
+
+        def start_job(name, kind, target):
+            window['-PROGRESS-'].update(f"{name}: starting")
+            window['-CANCEL-'].update(disabled=False)
+            return BackgroundJob(window, target, name, kind).start()
+
+        def download(origin, source_setting):
+            """Run the download action, in the background for scrappers"""
+            action = source_setting['download_action']
+            scrapper_class = scrapper_registry.get(origin, None)
+            if scrapper_class is None or action != scrapper_class.gui_scrape:
+                action(window_location)
+                return None
+            known_ids = self._known_ids(origin)
+
+            def scrape(progress):
+                return scrapper_class.scrape_for_user(progress, known_ids)
+            return start_job(origin, 'scrape', scrape)
+
         # Building Window
         layout = core_layout(updated_origins)
         size = (None, None)
@@ -259,8 +605,41 @@ class Tracker():
             event, values = window.read()
             window_location = window.CurrentLocation(True)
             if event == sg.WIN_CLOSED or event == "-CLOSE-":
+                if job is not None:
+                    # A job cancelled before its store stage stores nothing,
+                    # one already storing finishes. Its result is dropped
+                    job.detach()
+                    job.cancel()
                 window.close()
+                if job is not None:
+                    # A job waiting on a retry backoff or a parse only sees
+                    # the cancel later, it then finishes on its own
+                    job.join(BackgroundJob.close_timeout)
                 break
+            elif event == BackgroundJob.progress_event:
+                name, stage, detail = values[event]
+                window['-PROGRESS-'].update(f"{name}: {stage} {detail}")
+            elif event == BackgroundJob.done_event:
+                name, kind, (status, message) = values[event]
+                job = None
+                window['-PROGRESS-'].update('')
+                window['-CANCEL-'].update(disabled=True)
+                if len(message) > 0:
+                    sg.popup(message, location=window_location)
+                if kind == 'update' and status:
+                    window.close()
+                    updated_origins[name] = True
+                    layout = core_layout(updated_origins)
+                    window = sg.Window('Refresh Listings', layout, size=size,
+                                       location=window_location)
+            elif event == '-CANCEL-':
+                if job is not None:
+                    job.cancel()
+                    window['-PROGRESS-'].update(f"{job.name}: cancelling")
+            elif job is not None and \
+                    any(x in event for x in ['UPDATE', 'LINK', 'DOWNLOAD']):
+                sg.popup(f"Please wait for the {job.name} {job.kind} to "
+                         "finish, or cancel it", location=window_location)
             elif 'UPDATE' in event:
                 origin = event.split("-")[2]
                 source_setting = [x for x in self._input_option_settings if
@@ -270,17 +649,13 @@ class Tracker():
                 if not os.path.isfile(url):
                     sg.popup(f"{origin} file {url} not found!")
                     continue
-                status, message = self.update_source_postings(
-                    url, source_setting, window_location
-                )
-                if not status:
-                    sg.popup(message, location=window_location)
-                    continue
-                window.close()
-                updated_origins[origin] = True
-                layout = core_layout(updated_origins)
-                window = sg.Window('Refresh Listings', layout, size=size,
-                                   location=window_location)
+
+                def update(progress, url=url, source_setting=source_setting):
+                    return self.update_source_postings(
+                        url, source_setting, interactive=False,
+                        progress=progress
+                    )
+                job = start_job(origin, 'update', update)
             elif 'LINK' in event:
                 origin = event.split("-")[2]
                 source_setting = [x for x in self._input_option_settings if
@@ -295,9 +670,15 @@ class Tracker():
                                        " or an action for downloading")
                         continue
                     else:
-                        action(window_location)
+                        job = download(origin, source_setting)
                         continue
 
+            elif 'DOWNLOAD' in event:
+                origin = event.split("-")[2]
+                source_setting = [x for x in self._input_option_settings if
+                                  x['origin'] == origin][0]
+                job = download(origin, source_setting)
+
             elif 'HELP' in event:
                 origin = event.split("-")[2]
                 source_setting = [x for x in self._input_option_settings if
@@ -311,8 +692,56 @@ class Tracker():
 
         return
 
+    @profiler.action('update_all_postings')
+    def update_all_postings(self, origins=None):
+        """Download and process the postings of every source that has a
+        scrapper, without user interaction.
+
+        Parameters
+        ----------
+        origins: list of str, optional
+            only update these sources
+
+        Returns
+        -------
+        dict
+            maps each updated origin to the status and message of its update
+        """
+        results = {}
+        for source_setting in self._input_option_settings:
+            origin = source_setting['origin']
+            if origins is not None and origin not in origins:
+                continue
+            scrapper_class = scrapper_registry.get(origin, None)
+            if scrapper_class is None:
+                logging.info(f"No scrapper for {origin}, skipping it")
+                continue
+
+            logging.info(f"Downloading {origin} postings")
+            scrapper = scrapper_class.for_update(
+                source_setting, known_ids=self._known_ids(origin))
+            try:
+                status, message = scrapper.get_postings()
+            except requests.RequestException as err:
+                status = False
+                message = f"Failed to download the {origin} postings: {err}"
+            if status and scrapper.stored_url is not None:
+                status, message = self.update_source_postings(
+                    scrapper.stored_url, source_setting, interactive=False
+                )
+
+            if status:
+                logging.info(f"{origin} postings updated. {message}")
+            else:
+                logging.error(f"Failed to update {origin}: {message}")
+            results[origin] = (status, message)
+        self.refresh_snapshots(background=False)
+        return results
+
+    @profiler.timed('update_source_postings')
     def update_source_postings(self, url, source_setting,
-                               window_location=(None, None)):
+                               window_location=(None, None),
+                               interactive=True, progress=None):
         """Process the postings for a specific source.
 
         Parameters
@@ -326,15 +755,45 @@ class Tracker():
         window_location : tuple, optional
             window location for any popup
 
+        interactive : bool, optional
+            show the message about new and updated postings in a popup,
+            otherwise it is only returned. Must be False off the GUI thread
+
+        progress : function, optional
+            called with the stage and a detail string as the update goes.
+            It may raise background.Cancelled to stop the update, which only
+            stores its results once every stage is done
+
         Returns
         -------
         status: bool
             success status of the update process
 
         message: str
-            in case of failure a descriptive message
+            in case of failure a descriptive message, otherwise notes on the
+            new and updated postings for the user
 
         """
+        with metrics_run('ingest', span_prefix='update_source_postings',
+                         origin=source_setting['origin']) as run:
+            status, message = self._ingest_source_postings(
+                url, source_setting, run, progress
+            )
+            if not status:
+                run.status = 'failed'
+        if status and interactive and len(message) > 0:
+            sg.popup(message, location=window_location)
+        return status, message
+
+    def _ingest_source_postings(self, url, source_setting, run,
+                                progress=None):
+        """Core of update_source_postings, recording metrics into run"""
+
+        def stage(name, detail=''):
+            """A metrics stage of the run, also reported as progress"""
+            if progress is not None:
+                progress(name, detail)
+            return run.stage(name)
 
         # --- 1) Copy, load, validate, and parse --- #
         url_validator = source_setting.get('url_validator', None)
@@ -363,108 +822,125 @@ class Tracker():
             return False, message
 
         # Load the data
-        df = source_setting['loader'](new_url)
-        # Validate it if requested
-        validator = source_setting.get('validator', None)
-        if validator is not None:
-            status, message = validator(df)
-            if not status:
-                return status, message
-
-        # Renaming rules
-        renaming_rules = source_setting.get('renaming_rules', {})
-        df.rename(columns=renaming_rules, inplace=True)
-
-        # Keep columns
-        required_columns = ['origin_id', 'title', 'location', 'institution',
-                            'deadline', 'url']
-        optional_columns = ['section', 'division', 'department', 'keywords',
-                            'full_text']
-
-        keep = (
-            set(required_columns) | set(optional_columns) |
-            set([x for x in renaming_rules.values()])
-        ) & set(df.columns)
-        keep = list(keep)
-        df = df.loc[:, keep].copy()
-
-        # Load the current postings for reference
-        if os.path.isfile(self._postings_url):
-            all_postings = pd.read_pickle(self._postings_url)
-        else:
-            all_postings = None
-
-        # Handle missing required
-        missing_required = [x for x in required_columns if x not in df.columns]
-        for col in missing_required:
-            generator = source_setting.get(f'{col}_generator', None)
-            if generator is None:
-                message = dedent(f"""
-                The file for {origin} is missing required columns {col}
-                and a generator was not supplied in the setting. This
-                likely indicates your file is corrupted or wrong, or that
-                you modified the system setting erronously.
-                """)
-                return False, message
-            df[col] = df.apply(lambda x: generator(x, all_postings), axis=1)
-
-        # Handle missing optional
-        missing_optional = [x for x in optional_columns if x not in df.columns]
-        for col in missing_optional:
-            generator = source_setting.get(f'{col}_generator', None)
-            if generator is None:
-                df[col] = ''
+        run.inc('bytes_read', os.path.getsize(new_url))
+        with stage('load', f'reading {os.path.basename(new_url)}'):
+            df = source_setting['loader'](new_url)
+        run.inc('rows_loaded', df.shape[0])
+        with stage('validate', f'{df.shape[0]} rows loaded'):
+            # Validate it if requested
+            validator = source_setting.get('validator', None)
+            if validator is not None:
+                status, message = validator(df)
+                if not status:
+                    return status, message
+
+        with stage('normalize', f'{df.shape[0]} rows loaded'):
+            # Renaming rules
+            renaming_rules = source_setting.get('renaming_rules', {})
+            df.rename(columns=renaming_rules, inplace=True)
+
+            # Keep columns
+            required_columns = ['origin_id', 'title', 'location', 'institution',
+                                'deadline', 'url']
+            optional_columns = ['section', 'division', 'department', 'keywords',
+                                'full_text']
+
+            keep = (
+                set(required_columns) | set(optional_columns) |
+                set([x for x in renaming_rules.values()])
+            ) & set(df.columns)
+            keep = list(keep)
+            df = df.loc[:, keep].copy()
+
+            # Load the current postings for reference
+            if os.path.isfile(self._postings_url):
+                all_postings = self._load_postings()
             else:
-                df[col] = df.apply(
-                    lambda x: generator(x, all_postings), axis=1)
-
-        # Order the right way, just for easier inspection
-        col_order = required_columns + optional_columns
-        col_order += [x for x in df.columns if x not in col_order]
-        df = df.loc[:, col_order].copy()
-
-        # Add the custom columns
-        df['date_received'] = "{}".format(settings['today'])
-        df['origin'] = origin
-        df['reviewed'] = False
-        df['status'] = 'new'
-        df['notes'] = ''
-        df['update_notes'] = ''
-        df['updated'] = False
+                all_postings = None
+
+            # Handle missing required
+            missing_required = [x for x in required_columns if x not in df.columns]
+            for col in missing_required:
+                generator = source_setting.get(f'{col}_generator', None)
+                if generator is None:
+                    message = dedent(f"""
+                    The file for {origin} is missing required columns {col}
+                    and a generator was not supplied in the setting. This
+                    likely indicates your file is corrupted or wrong, or that
+                    you modified the system setting erronously.
+                    """)
+                    return False, message
+                df[col] = df.apply(lambda x: generator(x, all_postings), axis=1)
+
+            # Handle missing optional
+            missing_optional = [x for x in optional_columns if x not in df.columns]
+            for col in missing_optional:
+                generator = source_setting.get(f'{col}_generator', None)
+                if generator is None:
+                    df[col] = ''
+                else:
+                    df[col] = df.apply(
+                        lambda x: generator(x, all_postings), axis=1)
+
+            # Order the right way, just for easier inspection
+            col_order = required_columns + optional_columns
+            col_order += [x for x in df.columns if x not in col_order]
+            df = df.loc[:, col_order].copy()
+
+            # Add the custom columns
+            df['date_received'] = "{}".format(settings['today'])
+            df['origin'] = origin
+            df['reviewed'] = False
+            df['status'] = 'new'
+            df['notes'] = ''
+            df['update_notes'] = ''
+            df['updated'] = False
 
         # --- 2) Compare with stored values --- #
 
+        # Nothing is stored before the store stage, so a failed update, or
+        # one cancelled before that stage starts, leaves the store untouched.
+        # The store stage doesn't report progress, so it can't be cancelled
         if self._first_run:
             # In this case we just add the extra info and store
             logging.info(f"First time storing {origin} data")
-            df.to_pickle(self._postings_url)
+            run.inc('rows_new', df.shape[0])
+            with stage('store', f'{df.shape[0]} new postings'):
+                self._save_postings(df)
             self._first_run = False
             return True, ''
 
-        postings = pd.read_pickle(self._postings_url)
+        postings = self._load_postings()
         previous = postings.loc[postings['origin'] == origin, ['origin_id']]
         if previous.shape[0] == 0:
             logging.info(f"First time storing {origin} data, appending")
+            run.inc('rows_new', df.shape[0])
             postings = pd.concat([postings,df], ignore_index=True)
-            postings.to_pickle(self._postings_url)
+            with stage('store', f'{df.shape[0]} new postings'):
+                self._save_postings(postings)
             return True, ''
 
-        new_ix = ~df['origin_id'].isin(previous['origin_id'].values)
+        notes = []
+        with stage('diff_new'):
+            new_ix = ~df['origin_id'].isin(previous['origin_id'].values)
+        run.inc('rows_new', new_ix.sum())
         if new_ix.any():
             logging.info(
                 f"Found {new_ix.sum()} new {origin} postings! appending")
-            sg.popup(f"Found {new_ix.sum()} new {origin} postings, adding to list.\n"
-                     "==== PLEASE REVIEW ALL DEADLINES ===\n"
-                     "They are quite often wrong or not available in the platforms.")
+            notes.append(
+                f"Found {new_ix.sum()} new {origin} postings, adding to list.\n"
+                "==== PLEASE REVIEW ALL DEADLINES ===\n"
+                "They are quite often wrong or not available in the platforms.")
             new_postings = df.loc[new_ix, :].copy()
             postings = pd.concat([postings,new_postings], ignore_index=True)
-            postings.to_pickle(self._postings_url)
             df = df.loc[~new_ix, :].copy()
 
         # No more to add
         if df.shape[0] == 0:
             logging.info(f"All {origin} postings were new")
-            return True, ''
+            with stage('store', f'{new_ix.sum()} new postings'):
+                self._save_postings(postings)
+            return True, '\n'.join(notes)
 
         # Check the overlapp to see if there's anything new
         check_cols = ['url', 'title', 'section', 'division', 'deadline',
@@ -472,55 +948,69 @@ class Tracker():
         sel = (postings['origin'] == origin) & \
             (postings['status'].isin(['interested', 'maybe']))
         previous = postings.loc[sel, :].copy()
+        # Known postings we are not following are not checked for updates
+        followed = df['origin_id'].isin(previous['origin_id'].values)
+        run.inc('rows_ignored', (~followed).sum())
 
         df = df.loc[:, check_cols + ['origin', 'origin_id']]
         df = previous.merge(df, on=['origin', 'origin_id'], how='left',
                             validate='1:1', suffixes=('', '_new'))
 
-        total_updated = 0
-        for col in check_cols:
-            base_col = col
-            if col == 'deadline' and 'original_deadline' in df.columns:
-                base_col = 'original_deadline'
-            sel = (df[base_col] != df[col + '_new']
-                   ) & (df[col + '_new'].notna())
-            if sel.any() and col == 'deadline':
-                test = pd.to_datetime(df[base_col]) - \
-                    pd.to_datetime(df[col + '_new'])
-                test = test.dt.days != 0
-                sel = sel & test
-            total_updated = max(total_updated, sel.sum())
-            df.loc[sel, 'updated'] = True
-            df.loc[sel, 'update_notes'] += f'new {col},'
-
+        with stage('diff_updates', f'{df.shape[0]} followed postings'):
+            total_updated = 0
+            for col in check_cols:
+                base_col = col
+                if col == 'deadline' and 'original_deadline' in df.columns:
+                    base_col = 'original_deadline'
+                sel = (df[base_col] != df[col + '_new']
+                       ) & (df[col + '_new'].notna())
+                if sel.any() and col == 'deadline':
+                    test = pd.to_datetime(df[base_col]) - \
+                        pd.to_datetime(df[col + '_new'])
+                    test = test.dt.days != 0
+                    sel = sel & test
+                total_updated = max(total_updated, sel.sum())
+                df.loc[sel, 'updated'] = True
+                df.loc[sel, 'update_notes'] += f'new {col},'
+                run.inc('fields_updated', sel.sum(), field=col)
+        run.inc('rows_updated', df['updated'].sum())
+
+        updates = None
         if total_updated > 0:
             logging.info(
                 f"Found {total_updated} updated in {origin} postings!")
-            sg.popup(f"Found {total_updated} updates for {origin} listings. \n"
-                     "You can review them in the `review updates' menu.")
-
-            # Store the updates separately for review
-            df = df.loc[df['updated'], :].drop('updated', axis=1).copy()
-            # Check if we need to merge with any past updates
-            if not os.path.isfile(self._pending_updates_url):
-                df.to_pickle(self._pending_updates_url)
-                return True, ''
-
-            updates = pd.read_pickle(self._pending_updates_url)
-            # In this case we just want to update whatever we have included
-            updates['version'] = 0
-            df['version'] = 1
-            updates = pd.concat([updates,df], ignore_index=True)
-            updates.sort_values('version', inplace=True)
-            updates.drop_duplicates(['origin', 'origin_id', 'version'],
-                                    inplace=True, keep='last')
-            updates.drop('version', axis=1, inplace=True)
-            updates.to_pickle(self._pending_updates_url)
+            notes.append(
+                f"Found {total_updated} updates for {origin} listings. \n"
+                "You can review them in the `review updates' menu.")
+
+            with stage('store_updates'):
+                # Store the updates separately for review
+                updates = df.loc[df['updated'], :].drop('updated', axis=1).copy()
+                # Check if we need to merge with any past updates
+                if os.path.isfile(self._pending_updates_url):
+                    df = updates
+                    updates = self._load_pending_updates()
+                    # In this case we just want to update whatever we have included
+                    updates['version'] = 0
+                    df['version'] = 1
+                    updates = pd.concat([updates,df], ignore_index=True)
+                    updates.sort_values('version', inplace=True)
+                    updates.drop_duplicates(['origin', 'origin_id', 'version'],
+                                            inplace=True, keep='last')
+                    updates.drop('version', axis=1, inplace=True)
         else:
             logging.info(f"No new postings in {origin}")
 
-        return True, ''
+        with stage('store'):
+            # Postings and updates are replaced together
+            if new_ix.any():
+                self._save_postings(postings, updates)
+            elif updates is not None:
+                self._save_pending_updates(updates)
+
+        return True, '\n'.join(notes)
 
+    @profiler.action('review_new_postings')
     def review_new_postings(self, window_location=(None, None),
                             postings=None, window_title=None,
                             allow_delete=False):
@@ -547,12 +1037,11 @@ class Tracker():
             edits the posting data
         """
         if postings is None:
-            postings = pd.read_pickle(self._postings_url)
+            postings = self._load_postings()
             # Restrict to new
             postings.query('status == "new"', inplace=True)
 
         postings.fillna('', inplace=True)
-        break_loop = False
         status_updates = []
         font = 'Helvetica 12'
 
@@ -561,87 +1050,117 @@ class Tracker():
             sg.popup("No new postings to display")
             return
 
-        current_posting = 0
-        for ix, row in postings.iterrows():
-            current_posting += 1
-            # unpack
-            section = row['section']
-            institution = row['institution']
-            division = shorten(row['division'], 100)
-            department = shorten(row['department'], 100)
-            keywords = shorten(row['keywords'], 100)
-            title = row['title']
-            text = row['full_text']
-            location = row['location']
-            deadline = row['deadline']
-            origin = row['origin']
-            url = row['url']
-            origin_id = row['origin_id']
+        # A single window is built and its elements are updated in place
+        # for each posting. Keyboard shortcuts for the triage actions:
+        shortcuts = {'<Key-i>': 'Interested', '<Key-m>': 'Maybe',
+                     '<Key-x>': 'Ignore', '<Key-s>': 'Skip',
+                     '<Escape>': '-CLOSE-'}
+        statuses = {'Interested': 'interested', 'Maybe': 'maybe',
+                    'Ignore': 'ignore'}
+        records = postings.to_dict('records')
+
+        def display_data(position):
+            """Element values showing the posting at position"""
+            row = records[position]
+            if window_title is None:
+                wt = f'New posting ({position + 1} / {num_postings})'
+            else:
+                wt = window_title
+            return {
+                'window_title': wt,
+                '-TITLE-': f"{row['title']}",
+                '-INSTITUTION-': f"{row['institution']}",
+                '-DEPARTMENT-': shorten(row['department'], 100) + " | ",
+                '-DIVISION-': shorten(row['division'], 100) + " | ",
+                '-SECTION-': f"{row['section']} | ",
+                '-LOCATION-': f"Location: {row['location']}",
+                '-DEADLINE-': f"Deadline: {row['deadline']}",
+                '-KEYWORDS-': f"keywords: {shorten(row['keywords'], 100)}",
+                '-SOURCE-': f"Source: {row['origin']}",
+            }
+
+        def gen_layout(data):
             action_list = [
-                sg.Button("Skip"), sg.Button(
-                    "Interested"), sg.Button("Ignore"),
-                sg.Button("Maybe"), sg.Button("Stop Review", key='-CLOSE-')
+                sg.Button("Skip (s)", key="Skip"),
+                sg.Button("Interested (i)", key="Interested"),
+                sg.Button("Ignore (x)", key="Ignore"),
+                sg.Button("Maybe (m)", key="Maybe"),
+                sg.Button("Stop Review", key='-CLOSE-')
             ]
             if allow_delete:
                 action_list.append(sg.Button("DELETE"))
             layout = [
                 [sg.Text('Title:', font=font + ' underline'),
-                 sg.Text(f'{title}', font=font),
+                 sg.Text(data['-TITLE-'], font=font, key='-TITLE-'),
                  sg.Text('Institution:', font=font + ' underline'),
-                 sg.Text(f'{institution}', font=font)],
-                [sg.Text(department + " | "), sg.Text(division + " | "),
-                 sg.Text(section + " | ")],
-                [sg.Text(f'Location: {location}')],
-                [sg.Text(f'Deadline: {deadline}')],
-                [sg.Text(f'keywords: {keywords}')],
-                [sg.Text(f'Source: {origin}'), sg.Button('See posting', key='-VISIT-'),
+                 sg.Text(data['-INSTITUTION-'], font=font,
+                         key='-INSTITUTION-')],
+                [sg.Text(data['-DEPARTMENT-'], key='-DEPARTMENT-'),
+                 sg.Text(data['-DIVISION-'], key='-DIVISION-'),
+                 sg.Text(data['-SECTION-'], key='-SECTION-')],
+                [sg.Text(data['-LOCATION-'], key='-LOCATION-')],
+                [sg.Text(data['-DEADLINE-'], key='-DEADLINE-')],
+                [sg.Text(data['-KEYWORDS-'], key='-KEYWORDS-')],
+                [sg.Text(data['-SOURCE-'], key='-SOURCE-'),
+                 sg.Button('See posting', key='-VISIT-'),
                  sg.Button("See full text", key='-FULL-')],
                 action_list
             ]
+            return layout
 
-            # size = (600, 400)
-            if window_title is None:
-                wt = f'New posting ({current_posting} / {num_postings})'
-            else:
-                wt = window_title
-            window = sg.Window(wt, layout, location=window_location)
-            while True:
-                event, values = window.read()
-                # update the window location
-                window_location = window.CurrentLocation(True)
-                if event == sg.WIN_CLOSED or event in ["-CLOSE-", "Skip"]:
-                    window.close()
-                    if event == '-CLOSE-':
-                        break_loop = True
-                    break
-                elif event == '-VISIT-':
-                    webbrowser.open(url)
-                elif event == "Interested":
-                    window.close()
-                    status_updates.append([origin, origin_id, 'interested'])
-                    break
-                elif event == "Ignore":
-                    status_updates.append([origin, origin_id, 'ignore'])
-                    window.close()
-                    break
-                elif event == "Maybe":
-                    status_updates.append([origin, origin_id, 'maybe'])
-                    window.close()
-                    break
-                elif event == 'DELETE':
-                    res = sg.popup_ok_cancel(
-                        "Are you sure you wish to delete this posting?",
-                        location=window_location
-                    )
-                    if res == 'OK':
-                        status_updates.append([origin, origin_id, 'deleted'])
-                        window.close()
-                        break
-                elif event == "-FULL-":
-                    self.large_text_popup(text, location=window_location)
+        def show(window, data):
+            window.set_title(data['window_title'])
+            for key, value in data.items():
+                if key != 'window_title':
+                    window[key].update(value)
+            return
 
-            if break_loop:
+        position = 0
+        shown = display_data(position)
+        window = sg.Window(shown['window_title'], gen_layout(shown),
+                           location=window_location, finalize=True)
+        for bind_string, key in shortcuts.items():
+            window.bind(bind_string, key)
+        # The next posting is prepared while the user reads the current one
+        upcoming = display_data(1) if num_postings > 1 else None
+        while True:
+            event, values = window.read()
+            # update the window location
+            window_location = window.CurrentLocation(True)
+            if event == sg.WIN_CLOSED or event == "-CLOSE-":
                 break
+            row = records[position]
+            if event == '-VISIT-':
+                self._open_posting(row)
+                continue
+            elif event == "-FULL-":
+                self.large_text_popup(row['full_text'],
+                                      location=window_location)
+                continue
+            elif event in statuses:
+                status_updates.append(
+                    [row['origin'], row['origin_id'], statuses[event]])
+            elif event == 'DELETE':
+                res = sg.popup_ok_cancel(
+                    "Are you sure you wish to delete this posting?",
+                    location=window_location
+                )
+                if res != 'OK':
+                    continue
+                status_updates.append(
+                    [row['origin'], row['origin_id'], 'deleted'])
+            elif event != "Skip":
+                continue
+
+            # Move on to the next posting
+            position += 1
+            if position == num_postings:
+                break
+            with profiler.span('review_new_postings.next_posting'):
+                show(window, upcoming)
+            upcoming = display_data(position + 1) \
+                if position + 1 < num_postings else None
+        window.close()
 
         # Update status
         if len(status_updates) > 0:
@@ -650,17 +1169,18 @@ class Tracker():
             )
             logging.info(
                 f"Updating {status_updates.shape[0]} posting statuses")
-            postings = pd.read_pickle(self._postings_url)
+            postings = self._load_postings()
             postings = postings.merge(status_updates, on=['origin', 'origin_id'],
                                       how='left', validate='1:1',
                                       suffixes=('', '_new'))
             sel = postings['status_new'].notna()
             postings.loc[sel, 'status'] = postings.loc[sel, 'status_new']
             postings.drop('status_new', axis=1, inplace=True)
-            postings.to_pickle(self._postings_url)
+            self._save_postings(postings)
 
         return
 
+    @profiler.action('view_deadlines')
     def view_deadlines(self, window_location=(None, None)):
         """Display the window with the ongoing deadlines
 
@@ -676,73 +1196,78 @@ class Tracker():
                            location=window_location)
             return
 
-        all_postings = pd.read_pickle(self._postings_url)
+        all_postings = self._load_postings()
         posting_cols = ['institution', 'title', 'status'] + \
             self._personal_settings['custom_posting_cols']
 
-        def filter_postings(all_postings, maybe=True, expired=True, applied=False):
+        def statuses(maybe=True, applied=False):
             status = ['interested']
             if maybe:
                 status.append('maybe')
             if applied:
                 status.append('applied')
-            postings = (
-                all_postings.loc[all_postings['status'].isin(status), :]
-                .copy()
-            )
-            if not expired:
-                sel = (
-                    pd.to_datetime(postings['deadline']
-                                   ) >= pd.Timestamp("today")
-                ) | (
-                    postings['deadline'].isna()
-                )
-                postings = postings.loc[sel, :].copy()
-            return postings
+            return status
 
-        def deadlines_from_postings(postings):
-            # Ensure we have the right columns
-
-            postings = postings.copy()
-            postings['deadline_str'] = pd.to_datetime(
-                postings['deadline']).astype(str)
-            sel = postings['deadline_str'] == 'NaT'
-            postings.loc[sel, 'deadline_str'] = 'Unknown'
-            sel = postings['deadline'].notna()
-            postings.loc[sel, 'deadline'] =\
-                pd.to_datetime(postings.loc[sel, 'deadline'])
-            postings['unique_id'] = postings.groupby(
-                ['origin', 'origin_id']).ngroup()
-            postings['deadline'].fillna('Unknown', inplace=True)
-            # Get the number of applications per deadline
-            current_deadlines = postings.groupby(
-                ['deadline'], as_index=False
-            ).agg({'unique_id': 'nunique', 'deadline_str': 'first'})
-            today = settings['today']
-
-            def _human_date_delta(x, today=today):
-                if x == 'Unknown':
-                    return "Unkown deadline"
-                x = pd.to_datetime(x).to_pydatetime().date()
-                return humanize.naturaltime(today - x).replace("from now", "").strip()
-
-            current_deadlines['time_left'] = current_deadlines['deadline'].apply(
-                _human_date_delta
+        @profiler.timed('view_deadlines.filter_postings')
+        def filter_postings(all_postings, maybe=True, expired=True, applied=False):
+            query = PostingQuery().status(*statuses(maybe, applied))
+            if not expired:
+                query.deadline(start=pd.Timestamp(settings['today']))
+            return query.run(all_postings)
+
+        def postings_due(date, maybe=True, expired=True, applied=False):
+            query = PostingQuery().status(*statuses(maybe, applied))
+            return query.due_on(date).run(all_postings)
+
+        @profiler.timed('view_deadlines.deadlines_from_postings')
+        def deadlines_from_postings(maybe=True, expired=True, applied=False):
+            # Counts come from the calendar kept by the postings index
+            calendar = PostingIndex.of(all_postings).calendar()
+            start = None if expired else settings['today']
+            days, counts, unknown = calendar.per_day(
+                statuses(maybe, applied), start)
+            dates = days.astype('datetime64[D]')
+            time_left = time_left_labels(
+                pd.Series(dates), settings['today'], unknown="Unkown deadline"
             )
-            # Convert to str
-            current_deadlines['deadline'] = current_deadlines['deadline'].astype(
-                str)
-
-            current_deadlines = (
-                current_deadlines.loc[:, [
-                    'deadline_str', 'unique_id', 'time_left']]
-                .rename(columns={'deadline_str': 'deadline'})
-                .copy()
+            tbl = [[str(date), int(count), label] for date, count, label in
+                   zip(dates, counts, time_left)]
+            row_dates = [pd.Timestamp(x) for x in dates]
+            if unknown > 0:
+                tbl.append(['Unknown', unknown, "Unkown deadline"])
+                row_dates.append(None)
+            return tbl, row_dates
+
+        def calendar_layout(maybe=True, expired=True, applied=False):
+            """Heatmap of the postings due in the upcoming weeks"""
+            calendar = PostingIndex.of(all_postings).calendar()
+            first_day, counts = calendar.weeks(
+                statuses(maybe, applied), settings['today'],
+                settings['calendar_weeks']
             )
-
-            # starting values
-            tbl = current_deadlines.values.tolist()
-            return tbl, current_deadlines
+            empty = sg.theme_input_background_color()
+            shades = ['#b2dfdb', '#4db6ac', '#00897b', '#004d40']
+            top = max(int(counts.max()), 1)
+            layout = [[sg.Text('', size=(7, 1))] +
+                      [sg.Text(x, size=(4, 1), justification='center')
+                       for x in ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat',
+                                 'Sun']]]
+            for week, week_counts in enumerate(counts):
+                week_start = first_day + 7 * week
+                label = pd.Timestamp(np.datetime64(week_start, 'D'))
+                row = [sg.Text(label.strftime('%b %d'), size=(7, 1))]
+                for weekday, count in enumerate(week_counts):
+                    day = week_start + weekday
+                    color = empty if count == 0 else \
+                        shades[min(len(shades) - 1,
+                                   (len(shades) * int(count)) // (top + 1))]
+                    row.append(sg.Text(
+                        f'{count:d}' if count > 0 else '', size=(4, 1),
+                        justification='center', background_color=color,
+                        enable_events=count > 0, key=('-DAY-', day)
+                    ))
+                layout.append(row)
+            return layout
 
         def gen_layout(deadline_values, application_values, selected_deadline=None,
                        date=None, maybe=True, expired=True, applied=False):
@@ -766,7 +1291,9 @@ class Tracker():
                  sg.CB("show past", key="-EXPIRED-", default=expired,
                        enable_events=True),
                  sg.CB("show applied", key="-APPLIED-", enable_events=True,
-                       default=applied)]
+                       default=applied)],
+                [sg.Text("Coming weeks:", font='Helvetica 12 underline')],
+                [sg.Column(calendar_layout(maybe, expired, applied))]
             ]
             applications_text = "Applications:"
             if date is not None:
@@ -795,13 +1322,26 @@ class Tracker():
             ], [sg.HSeparator()], [footer]]
             return layout
 
+        def select_date(date):
+            selected = postings_due(date, **layout_kwargs)
+            if selected.shape[0] == 0:
+                values = [['', '', '']]
+            else:
+                values = selected.loc[:, posting_cols].values.tolist()
+            return selected, values
+
         size = (None, None)
-        postings = filter_postings(all_postings)
+        layout_kwargs = {
+            'maybe': True,
+            'expired': True,
+            'applied': False
+        }
+        postings = filter_postings(all_postings, **layout_kwargs)
         if postings.shape[0] == 0:
             sg.popup_error("You have not marked any posting as interested or maybe"
                            " so the deadline list is empty.")
             return
-        tbl, current_deadlines = deadlines_from_postings(postings)
+        tbl, row_dates = deadlines_from_postings(**layout_kwargs)
         posting_values = [['', '', '']]
         selected_postings = None
         selected_row = None
@@ -809,11 +1349,6 @@ class Tracker():
         layout = gen_layout(tbl, posting_values, selected_row, selected_date)
         window = sg.Window("Deadlines", layout, location=window_location,
                            size=size, resizable=True)
-        layout_kwargs = {
-            'maybe': True,
-            'expired': True,
-            'applied': False
-        }
         while True:
             event, values = window.read()
             window_location = window.CurrentLocation(True)
@@ -827,28 +1362,24 @@ class Tracker():
                          "to your output folder in the file deadlines.xlsx",
                          location=window_location)
                 continue
-            elif event == "-DATE LIST-":
-                row = values['-DATE LIST-']
-                if not isinstance(row, int):
-                    row = row[0]
-                # Get the associated date and posting
-                date = current_deadlines['deadline'].values[row]
-                if date == 'Unknown':
-                    sel = postings['deadline'].isna()
-                else:
-                    sel = pd.to_datetime(postings['deadline']) == date
-                selected_postings = postings.loc[sel, :]
-                if selected_postings.shape[0] == 0:
-                    posting_values = [['', '', '']]
+            elif event == "-DATE LIST-" or \
+                    (isinstance(event, tuple) and event[0] == '-DAY-'):
+                if event == "-DATE LIST-":
+                    row = values['-DATE LIST-']
+                    if not isinstance(row, int):
+                        if len(row) == 0:
+                            continue
+                        row = row[0]
+                    date = row_dates[row]
                 else:
-                    posting_values = (
-                        selected_postings.loc[:, posting_cols]
-                        .values.tolist()
-                    )
+                    date = pd.Timestamp(np.datetime64(event[1], 'D'))
+                    row = row_dates.index(date) if date in row_dates else None
+                selected_postings, posting_values = select_date(date)
                 selected_row = row
-                selected_date = date
-                new_layout = gen_layout(tbl, posting_values, row, date,
-                                        **layout_kwargs)
+                selected_date = 'Unknown' if date is None else \
+                    date.strftime('%Y-%m-%d')
+                new_layout = gen_layout(tbl, posting_values, row,
+                                        selected_date, **layout_kwargs)
                 window.close()
                 window = sg.Window("Deadlines", new_layout, location=window_location,
                                    size=size, resizable=True)
@@ -879,7 +1410,7 @@ class Tracker():
                 layout_kwargs['expired'] = values['-EXPIRED-']
                 layout_kwargs['applied'] = values['-APPLIED-']
                 postings = filter_postings(all_postings, **layout_kwargs)
-                tbl, current_deadlines = deadlines_from_postings(postings)
+                tbl, row_dates = deadlines_from_postings(**layout_kwargs)
                 new_layout = gen_layout(
                     tbl, posting_values, selected_row, selected_date,
                     **layout_kwargs
@@ -894,28 +1425,33 @@ class Tracker():
                     continue
                 row = values['-APPLICATIONS-']
                 if not isinstance(row, int):
+                    if len(row) == 0:
+                        continue
                     row = row[0]
+                if row >= selected_postings.shape[0]:
+                    # The placeholder row of an empty selection
+                    continue
                 posting_row = selected_postings.iloc[row, :]
                 changes = self.view_detailed_posting(
                     posting_row, window_location)
-                # reload and recreate in case we modified something
+                # apply the edit in memory, which also updates the calendar
                 if changes:
-                    all_postings = pd.read_pickle(self._postings_url)
+                    label = selected_postings.index[row]
+                    edit_posting(all_postings,
+                                 all_postings.index.get_loc(label), changes)
                     postings = filter_postings(all_postings, **layout_kwargs)
-                    tbl, current_deadlines = deadlines_from_postings(postings)
-                    date = selected_date
-                    if date == 'Unknown':
-                        sel = postings['deadline'].isna()
-                    else:
-                        sel = pd.to_datetime(postings['deadline']) == date
-                    selected_postings = postings.loc[sel, :]
-                    if selected_postings.shape[0] == 0:
-                        posting_values = [['', '', '']]
-                    else:
+                    tbl, row_dates = deadlines_from_postings(**layout_kwargs)
+                    if selected_date == "any date":
+                        selected_postings = postings
                         posting_values = (
-                            selected_postings.loc[:, posting_cols]
-                            .values.tolist()
+                            postings.loc[:, posting_cols].values.tolist()
                         )
+                    else:
+                        date = None if selected_date == 'Unknown' else \
+                            pd.Timestamp(selected_date)
+                        selected_postings, posting_values = select_date(date)
+                        selected_row = row_dates.index(date) if \
+                            date in row_dates else None
                     new_layout = gen_layout(
                         tbl, posting_values, selected_row, selected_date,
                         **layout_kwargs
@@ -930,6 +1466,7 @@ class Tracker():
 
         return
 
+    @profiler.action('view_detailed_posting')
     def view_detailed_posting(self, row, window_location=(None, None)):
         """Review and edit a post as shown in the deadline menu
 
@@ -940,8 +1477,9 @@ class Tracker():
 
         Returns
         -------
-        Status:
-            indicates whether any edit was done to the postings
+        dict
+            the new values of the edited columns, status included. Empty if
+            the posting was not edited
         """
         status_change = False
         font = 'Helvetica 12'
@@ -1031,7 +1569,7 @@ class Tracker():
                 window.close()
                 break
             elif event == '-VISIT-':
-                webbrowser.open(url)
+                self._open_posting(row)
             elif event == "-APPLIED-":
                 window.close()
                 status_change = True
@@ -1086,70 +1624,55 @@ class Tracker():
                     status_change = True
                     modified_cols.append('notes')
             elif event == "-FOLDER-":
-                base = self._personal_settings['scaffolding_base']
-                out_dir = self._personal_settings['scaffolding_output_dir']
-                if base is None or out_dir is None:
-                    sg.popup_error("To crate a folder you must first configure"
-                                   " the scaffolding paths in the configuration menu")
+                scaffolder = self._scaffolder()
+                if scaffolder is None:
                     continue
-                
-                name = sg.popup_get_text("Select a name for the application folder",
-                                         title="Application scaffolding",
-                                         location=window_location)
-                url = os.path.join(out_dir, name)
-                if os.path.isdir(url):
-                    sg.popup_error(f"The folder path {url}\n"
+
+                name = sg.popup_get_text(
+                    "Select a name for the application folder",
+                    title="Application scaffolding",
+                    default_text=render_name(
+                        settings['scaffolding_name_template'], row),
+                    location=window_location
+                )
+                if name is None or name.strip() == '':
+                    continue
+                try:
+                    url = scaffolder.create(name.strip(), row)
+                except FileExistsError as err:
+                    sg.popup_error(f"The folder path {err}\n"
                                    "is already in use")
                     continue
-                copy_tree(base, url)
                 sg.popup(f"Application folder created successfuly at {url}")
                 continue
             else:
                 logging.warning(f"Got unkown event {event}")
 
-        if status_change:
-            # Update
-            postings = pd.read_pickle(self._postings_url)
-            sel = (postings['origin'] == row['origin']) & \
-                (postings['origin_id'] == row['origin_id'])
-            if not sel.any():
-                logging.warning(
-                    f"Failed to find a match for row {row} in postings")
-                os.popup_error("Failed to match update row to postings. Is the "
-                               " postings file corrupt?")
-                status_change = False
-                return status_change
-            if sel.sum() > 1:
-                logging.warning("Single row selected multiple lines in postings.\n"
-                                "this suggests a corrupted postings file.\n"
-                                f"requested: {row}\n got \n {postings.loc[sel, :]}")
-                os.popup_error("Failed to match update row to postings. Is the "
-                               " postings file corrupt?")
-                status_change = False
-                return status_change
-
-            ix = postings.loc[sel, :].index.values[0]
-            row = row.to_frame().T
-            row.index = [ix]
-            # Test one more time to be sure
-            test = (postings.loc[sel, 'origin'] == row['origin']) & \
-                (postings.loc[sel, 'origin_id'] == row['origin_id'])
-            if not test.all():
-                logging.warning("Failed to match the row with the data. "
-                                " This suggests a corrupted postings file."
-                                f"requested: {row}\n got \n {postings.loc[sel, :]}")
-                os.popup_error("Failed to match update row to postings. Is the "
-                               " postings file corrupt?")
-                status_change = False
-                return status_change
-
-            modified_cols = list(set(modified_cols))
-            row = row.loc[:, ['status'] + modified_cols]
-            logging.info(f"Modifying row to \n{row}")
-            postings.update(row)
-            postings.to_pickle(self._postings_url)
-
-        return status_change
+        if not status_change:
+            return {}
+
+        # Update
+        postings = self._load_postings()
+        sel = (postings['origin'] == row['origin']) & \
+            (postings['origin_id'] == row['origin_id'])
+        if sel.sum() != 1:
+            logging.warning("The edited row matched "
+                            f"{sel.sum():d} lines in postings.\n"
+                            "this suggests a corrupted postings file.\n"
+                            f"requested: {row}\n got \n {postings.loc[sel, :]}")
+            sg.popup_error("Failed to match update row to postings. Is the "
+                           " postings file corrupt?")
+            return {}
+
+        changes = {col: row[col] for col in ['status'] + modified_cols
+                   if col in postings.columns}
+        ix = postings.index[sel.values][0]
+        logging.info(f"Modifying row {ix} with {changes}")
+        for col, value in changes.items():
+            postings.at[ix, col] = value
+        self._save_postings(postings)
+
+        return changes
 
     def large_text_popup(self, text, title="full text", size=(800, 800),
                         location=(None, None)):
@@ -1162,19 +1685,22 @@ class Tracker():
 
         return
 
+    @profiler.action('review_updates')
     def review_updates(self, window_location=(None, None)):
-        """Display a screen for reviewing updates
+        """Display a screen for reviewing updates. Updates can be accepted or
+        rejected in bulk, for the selected or the shown rows, and filtered
+        by source and by updated field.
 
         Returns
         -------
-        TODO
+        None
 
         """
         if not os.path.isfile(self._pending_updates_url):
             sg.popup("There are no pending updates")
             return
 
-        updates = pd.read_pickle(self._pending_updates_url)
+        updates = self._load_pending_updates()
 
         if updates.shape[0] == 0:
             sg.popup("There are no pending updates")
@@ -1182,42 +1708,66 @@ class Tracker():
 
         # Get the updates in presentable form
         updates.reset_index(inplace=True, drop=True)
+        any_value = 'all'
+
+        @profiler.timed('review_updates.get_update_list')
+        def get_update_list(updates, origin=any_value, field=any_value):
+            fields = self._update_fields(updates)
+            shown = np.ones(updates.shape[0], dtype=bool)
+            if origin != any_value:
+                shown &= (updates['origin'] == origin).to_numpy()
+            if field != any_value:
+                shown &= fields[field].to_numpy() if field in fields else False
+            labels = pd.Series('', index=updates.index)
+            for col in fields.columns:
+                labels = labels + np.where(fields[col], f'{col}, ', '')
+            labels = labels.str.rstrip(', ')
+            shown_updates = updates.loc[shown, :]
+            update_list = pd.DataFrame({
+                'origin': shown_updates['origin'],
+                'title': shown_updates['title'],
+                'institution': shown_updates['institution'],
+                'fields': labels[shown]
+            }).fillna('').astype(str).values.tolist()
+            return update_list, shown_updates, list(fields.columns)
+
+        def gen_layout(update_list, origins, fields):
+            columns = ['Origin', 'Title', 'Institution', 'Updated values']
+            table_layout = [[
+                sg.Table(values=update_list, headings=columns,
+                         key='-UPDATE_LIST-', auto_size_columns=True,
+                         select_mode=sg.TABLE_SELECT_MODE_EXTENDED,
+                         bind_return_key=True, expand_y=True)
+            ]]
+            layout = [
+                [sg.Text("Updates pending review:",
+                         font='Helvetica 12 underline')],
+                [sg.Text("(select rows to accept or reject them together, "
+                         "double click on a row to review it)")],
+                [sg.Text("Source:"),
+                 sg.Combo([any_value] + origins, default_value=any_value,
+                          key='-ORIGIN-', enable_events=True, readonly=True),
+                 sg.Text("Updated field:"),
+                 sg.Combo([any_value] + fields, default_value=any_value,
+                          key='-FIELD-', enable_events=True, readonly=True)],
+                [sg.Column(table_layout)],
+                [sg.Text(f"{len(update_list):d} updates shown",
+                         key='-COUNT-', size=(40, 1))],
+                [sg.HSeparator()],
+                [sg.Button("Accept selected", key="-ACCEPT SELECTED-"),
+                 sg.Button("Reject selected", key="-REJECT SELECTED-"),
+                 sg.Button("Accept shown", key="-ACCEPT SHOWN-"),
+                 sg.Button("Reject shown", key="-REJECT SHOWN-")],
+                [sg.Button("Clear all", key="-CLEAR-"),
+                 sg.Button("Close", key="-EXIT-")]
+            ]
+            return layout
 
-        def get_update_list(updates):
-            update_list = []
-            for ix, row in updates.iterrows():
-                update_notes = row['update_notes'].split(',')
-                update_notes = set([x.replace('new', '').strip() for x in
-                                    update_notes])
-                update_notes = [x for x in update_notes if len(x) > 0]
-
-                update_notes = ", ".join(update_notes)
-                update_list.append([
-                    row['origin'], row['title'], row['institution'], update_notes
-                ])
-            return update_list
-
-        update_list = get_update_list(updates)
-
-        columns = ['Origin', 'Title', 'Institution', 'Updated values']
-
-        table_layout = [[
-            sg.Table(values=update_list, enable_events=True, headings=columns,
-                     key='-UPDATE_LIST-', auto_size_columns=True,
-                     expand_y=True)
-        ]]
-
-        layout = [
-            [sg.Text("Updates pending review:", font='Helvetica 12 underline')],
-            [sg.Text("(click on row to edit)")],
-            [sg.Column(table_layout)],
-            [sg.HSeparator()],
-            [sg.Button("Clear all", key="-CLEAR-"),
-             sg.Button("Close", key="-EXIT-")]
-        ]
-
-        window = sg.Window("Updates", layout, location=window_location,
-                           resizable=True)
+        filters = {'origin': any_value, 'field': any_value}
+        update_list, shown_updates, fields = get_update_list(updates)
+        origins = sorted(updates['origin'].dropna().unique().tolist())
+        window = sg.Window("Updates", gen_layout(update_list, origins, fields),
+                           location=window_location, resizable=True)
 
         while True:
             event, values = window.read()
@@ -1234,6 +1784,10 @@ class Tracker():
                     os.remove(self._pending_updates_url)
                     window.close()
                     break
+                continue
+            elif event in ['-ORIGIN-', '-FIELD-']:
+                filters['origin'] = values['-ORIGIN-']
+                filters['field'] = values['-FIELD-']
             elif event == "-UPDATE_LIST-":
                 row = values['-UPDATE_LIST-']
                 if row is None or row == []:
@@ -1243,25 +1797,48 @@ class Tracker():
                 if not isinstance(row, int):
                     row = row[0]
 
-                update_row = updates.iloc[row, :].copy()
-                changes = self.manage_update_request(
-                    update_row, window_location)
-                if changes:
-                    # Reload
-                    updates = pd.read_pickle(self._pending_updates_url)
-                    if updates.shape[0] == 0:
-                        sg.popup("Finished reviewing all updates!")
-                        window.close()
-                        break
-
-                    updates.reset_index(inplace=True, drop=True)
-                    update_list = get_update_list(updates)
-                    window['-UPDATE_LIST-'].update(values=update_list)
+                update_row = shown_updates.iloc[row, :].copy()
+                if not self.manage_update_request(update_row,
+                                                  window_location):
+                    continue
+            elif event in ["-ACCEPT SELECTED-", "-REJECT SELECTED-",
+                           "-ACCEPT SHOWN-", "-REJECT SHOWN-"]:
+                if 'SELECTED' in event:
+                    rows = values['-UPDATE_LIST-']
+                    if rows is None or len(rows) == 0:
+                        sg.popup("Select the updates first",
+                                 location=window_location)
+                        continue
+                    keys = shown_updates.iloc[rows, :]
+                else:
+                    keys = shown_updates
+                field = filters['field']
+                self._resolve_updates(
+                    keys, None if field == any_value else [field],
+                    accept='ACCEPT' in event
+                )
             else:
                 logging.warning(f"Got unkown event {event}")
+                continue
+
+            # Refresh the list after a change or a new filter
+            if not os.path.isfile(self._pending_updates_url):
+                updates = updates.iloc[:0, :]
+            else:
+                updates = self._load_pending_updates()
+            if updates.shape[0] == 0:
+                sg.popup("Finished reviewing all updates!")
+                window.close()
+                break
+            updates.reset_index(inplace=True, drop=True)
+            update_list, shown_updates, fields = get_update_list(
+                updates, **filters)
+            window['-UPDATE_LIST-'].update(values=update_list)
+            window['-COUNT-'].update(f"{len(update_list):d} updates shown")
 
         return
 
+    @profiler.action('manage_update_request')
     def manage_update_request(self, row, window_location=(None, None)):
         """Review and edit an update row as shown in the update menu"""
 
@@ -1314,10 +1891,8 @@ class Tracker():
         ]
 
         def get_update_layout_from_row(row):
-            update_notes = row['update_notes'].split(',')
-            update_notes = set([x.replace('new', '').strip() for x in
-                                update_notes])
-            update_notes = [x for x in update_notes if len(x) > 0]
+            fields = self._update_fields(row.to_frame().T)
+            update_notes = [x for x in fields.columns if fields[x].iloc[0]]
             update_layout = []
             for col in update_notes:
                 list_element = [
@@ -1327,52 +1902,9 @@ class Tracker():
                 update_layout.append(list_element)
             return update_layout, update_notes
 
-        def update_files(row, update_cols=None):
-            # Get the update file
-            updates = pd.read_pickle(self._pending_updates_url)
-            sel = (
-                (updates['origin'] == row['origin'].values[0]) &
-                (updates['origin_id'] == row['origin_id'].values[0])
-            )
-            to_update = updates.loc[sel, :].copy()
-            updates = updates.loc[~sel, :].copy()
-            if update_cols is None:
-                updates.to_pickle(self._pending_updates_url)
-                # In this case we have rejected all updates we're done
-                return None
-
-            # Check if we have any leftover updates
-            update_notes = to_update['update_notes'].values[0].split(',')
-            update_notes = set([x.replace('new', '').strip() for x in
-                                update_notes])
-            update_notes = [x for x in update_notes if len(x) > 0]
-
-            leftovers = set(update_notes) - set(update_cols)
-            new_row = None
-            if len(leftovers) == 0:
-                # nothing is left so we can erase the row
-                updates.to_pickle(self._pending_updates_url)
-            else:
-                # update the list to update
-                lbl = ", ".join(update_notes)
-                to_update['update_notes'] = lbl
-                updates = updates.append(to_update, ignore_index=True)
-                updates.to_pickle(self._pending_updates_url)
-                new_row = to_update
-
-            # Now actually update the data
-            data = pd.read_pickle(self._postings_url)
-            sel = (
-                (data['origin'] == row['origin'].values[0]) &
-                (data['origin_id'] == row['origin_id'].values[0])
-            )
-            for col in update_cols:
-                data.loc[sel, col] = row[col].values[0]
-            data.to_pickle(self._postings_url)
-            return new_row
-
         update_layout, update_cols = get_update_layout_from_row(row)
         layout = header + update_layout + footer
+        keys = row.loc[['origin', 'origin_id']].to_frame().T
 
         window = sg.Window('Update Review', layout, location=window_location,
                            resizable=True)
@@ -1384,41 +1916,36 @@ class Tracker():
                 window.close()
                 return False
             elif event == '-VISIT-':
-                webbrowser.open(url)
+                self._open_posting(row)
             elif event == "-ALL-":
-                keep = ['origin', 'origin_id']
-                for col in update_cols:
-                    keep.append(col + '_new')
-                renames = {col + '_new': col for col in update_cols}
-                row = row.loc[keep].to_frame().T.rename(columns=renames).copy()
-                update_files(row, update_cols)
+                self._resolve_updates(keys, accept=True)
                 window.close()
                 return True
             elif event == '-NONE-':
-                keep = ['origin', 'origin_id']
-                row = row.loc[keep].to_frame().T.copy()
-                update_files(row)
+                self._resolve_updates(keys, accept=False)
                 window.close()
                 return True
-            elif event == '-VISIT-':
-                webbrowser.open(url)
             elif event == "-FULL-":
                 self.large_text_popup(text, location=window_location)
             elif '-ACCEPT-' in event:
                 to_update = event.split('-')[2]
-                keep = ['origin', 'origin_id', to_update]
-                row = row.loc[keep].to_frame().T.copy()
-                new_row = update_files(row)
+                self._resolve_updates(keys, [to_update], accept=True)
                 window.close()
-                if new_row is None:
+                # Review the updates left for this posting, if any
+                updates = self._load_pending_updates()
+                sel = (updates['origin'] == row['origin']) & \
+                    (updates['origin_id'] == row['origin_id'])
+                if not sel.any():
                     return True
-                else:
-                    return self.manage_update_request(new_row, window_location)
+                self.manage_update_request(updates.loc[sel, :].iloc[0, :],
+                                           window_location)
+                return True
             else:
                 logging.warning(f"Got unkown event {event}")
 
         return status_change
 
+    @profiler.action('manual_entry')
     def manual_entry(self, window_location=(None, None)):
         """Manual entry menu for a new postings
 
@@ -1435,7 +1962,7 @@ class Tracker():
             all_postings = None
             next_id = 0
         else:
-            all_postings = pd.read_pickle(self._postings_url)
+            all_postings = self._load_postings()
             sel = all_postings['origin'] == 'manual entry'
             if not sel.any():
                 next_id = 0
@@ -1502,15 +2029,16 @@ class Tracker():
                     row['deadline'] = row['deadline'].dt.date.astype(str)
                 logging.info(f"Adding new postings:\n{row}")
                 if all_postings is None and not os.path.isfile(self._postings_url):
-                    row.to_pickle(self._postings_url)
+                    self._save_postings(row)
                 else:
-                    all_postings = pd.read_pickle(self._postings_url)
+                    all_postings = self._load_postings()
                     all_postings = all_postings.append(row, ignore_index=True)
-                    all_postings.to_pickle(self._postings_url)
+                    self._save_postings(all_postings)
                 break
 
         return
 
+    @profiler.action('review_ignored_gui')
     def review_ignored_gui(self, window_location=(None, None)):
         """Review postings marked as ignored and change their status
 
@@ -1530,45 +2058,22 @@ class Tracker():
                            location=window_location)
             return
 
-        all_postings = pd.read_pickle(self._postings_url)
+        all_postings = self._load_postings()
 
-        def filter_postings(all_postings, expired=True, sort_by='deadline'):
-            status = ['ignore']
-            postings = (
-                all_postings.loc[all_postings['status'].isin(status), :]
-                .copy()
-            )
+        @profiler.timed('review_ignored_gui.filter_postings')
+        def filter_postings(all_postings, expired=True):
+            query = PostingQuery().status('ignore')
             if not expired:
-                sel = (
-                    pd.to_datetime(postings['deadline']
-                                   ) >= pd.Timestamp("today")
-                ) | (
-                    postings['deadline'].isna()
-                )
-                postings = postings.loc[sel, :].copy()
-            postings.sort_values(by=[sort_by], inplace=True)
-            return postings
+                query.deadline(start=pd.Timestamp("today"))
+            return query.mask(all_postings)
 
+        @profiler.timed('review_ignored_gui.table_from_postings')
         def table_from_postings(postings):
             # Ensure we have the right columns
 
             postings = postings.copy()
-            sel = postings['deadline'].notna()
-            postings.loc[sel, 'deadline'] =\
-                pd.to_datetime(postings.loc[sel, 'deadline'])
-            postings['deadline'].fillna('Unknown', inplace=True)
-            # Get the number of applications per deadline
-            today = settings['today']
-
-            def _human_date_delta(x, today=today):
-                if x == 'Unknown':
-                    return "Unknown deadline"
-                x = pd.to_datetime(x).to_pydatetime().date()
-                return humanize.naturaltime(today - x).replace("from now", "").strip()
-
-            postings['time_left'] = postings['deadline'].apply(
-                _human_date_delta
-            )
+            postings['time_left'] = time_left_labels(postings['deadline'],
+                                                     settings['today'])
             columns = [
                 'origin',
                 'institution',
@@ -1578,37 +2083,54 @@ class Tracker():
                 'time_left'
             ]
             for col in columns:
-                postings[col].fillna('', inplace=True)
-                postings[col] = postings[col].astype(str)
+                postings[col] = postings[col].fillna('').astype(str)
 
             # starting values
             tbl = postings.loc[:, columns].values.tolist()
             return tbl
 
+        # Sort options shown to the user and the columns they sort by
+        sort_columns = {'deadline': 'deadline', 'source': 'origin',
+                        'institution': 'institution',
+                        'department': 'department', 'title': 'title',
+                        'location': 'location'}
+
+        def paged_table(all_postings, expired=True, sort_by='deadline'):
+            return PagedTable(all_postings, table_from_postings,
+                              settings['table_page_size'],
+                              sort_columns[sort_by],
+                              row_filter=filter_postings, expired=expired)
+
+        def header_text(table):
+            return (f"{table.num_rows:d} ignored postings, double click on "
+                    "an item to review and modify status or select several "
+                    "to change them together")
+
         def gen_layout(table, expired=True, sort_by='deadline'):
 
             columns = ['Source', 'Institution',
                        'Title', 'Department', 'Location', 'Deadline']
             row_colors = None
-            num_rows = len(table)
 
             dates_list_columns = [
-                [sg.Table(values=table, enable_events=True,
+                [sg.Table(values=table.rows(), bind_return_key=True,
+                          select_mode=sg.TABLE_SELECT_MODE_EXTENDED,
                           headings=columns, key='-IGNORED LIST-',
                           auto_size_columns=True, expand_x=True,
                           col_widths=[10, 50, 50, 50, 10],
                           num_rows=20,
                           expand_y=True, row_colors=row_colors)],
+                [sg.Button("<", key='-PREV-'),
+                 sg.Text(table.description(), key='-PAGE-', size=(35, 1)),
+                 sg.Button(">", key='-NEXT-')],
                 [sg.CB("show past", key="-EXPIRED-", default=expired,
                        enable_events=True),
                  sg.Text("Sort by:"),
-                 sg.Combo(['deadline', 'source', 'institution',
-                           'department', 'deadline', 'title',
-                           'location'], default_value=sort_by,
-                          key='-ORDER-', enable_events=True)]
+                 sg.Combo(list(sort_columns), default_value=sort_by,
+                          key='-ORDER-', enable_events=True)],
+                self._bulk_edit_layout(['interested', 'maybe', 'applied'])
             ]
-            header = [[sg.Text(f"{num_rows:d} ignored postings, click on an item to review"
-                               " and modify status")]]
+            header = [[sg.Text(header_text(table), key='-HEADER-')]]
             footer = [[sg.Button("Close", key='-EXIT-')]]
 
             layout = [[header], [sg.HSeparator()],
@@ -1626,20 +2148,24 @@ class Tracker():
             window['-IGNORED LIST-'].table_frame.pack(expand=True, fill='both')
             return window
 
-        sort_by = 'deadline'
+        def show_page(window, table):
+            window['-IGNORED LIST-'].update(values=table.rows())
+            window['-PAGE-'].update(table.description())
+            window['-HEADER-'].update(header_text(table))
+            return
+
         size = (None, None)
-        postings = filter_postings(all_postings, sort_by)
-        if postings.shape[0] == 0:
+        layout_kwargs = {
+            'expired': True,
+            'sort_by': 'deadline'
+        }
+        table = paged_table(all_postings, **layout_kwargs)
+        if table.num_rows == 0:
             sg.popup_error("You have not marked any posting as ignored"
                            " so the list is empty.")
             return
-        table = table_from_postings(postings)
-        layout = gen_layout(table, sort_by=sort_by)
+        layout = gen_layout(table, **layout_kwargs)
         window = gen_window(layout, size, window_location)
-        layout_kwargs = {
-            'expired': True,
-            'sort_by': sort_by
-        }
         while True:
             event, values = window.read()
             window_location = window.CurrentLocation(True)
@@ -1651,34 +2177,42 @@ class Tracker():
             elif event == "-IGNORED LIST-":
                 row = values['-IGNORED LIST-']
                 if not isinstance(row, int):
+                    if len(row) == 0:
+                        continue
                     row = row[0]
-                selected_postings = postings.iloc[[row], :].copy()
-                if selected_postings.shape[0] == 0:
-                    continue
+                selected_postings = table.postings.iloc[
+                    [table.position(row)], :].copy()
 
                 self.review_new_postings(window_location, selected_postings,
                                          'Ignored posting edit', allow_delete=True)
 
-                all_postings = pd.read_pickle(self._postings_url)
-                postings = filter_postings(all_postings, **layout_kwargs)
-                table = table_from_postings(postings)
-                new_layout = gen_layout(table, **layout_kwargs)
-                window.close()
-                window = gen_window(new_layout, size, window_location)
-            elif event in ['-EXPIRED-', '-ORDER-']:
-                if event == '-EXPIRED-':
-                    layout_kwargs['expired'] = values['-EXPIRED-']
-                else:
-                    layout_kwargs['sort_by'] = values['-ORDER-']
-                postings = filter_postings(all_postings, **layout_kwargs)
-                table = table_from_postings(postings)
+                all_postings = self._load_postings()
+                page = table.page
+                table = paged_table(all_postings, **layout_kwargs)
+                table.set_page(page)
                 new_layout = gen_layout(table, **layout_kwargs)
                 window.close()
                 window = gen_window(new_layout, size, window_location)
+            elif event in ['-PREV-', '-NEXT-']:
+                table.set_page(table.page + (1 if event == '-NEXT-' else -1))
+                show_page(window, table)
+            elif event == '-ORDER-':
+                layout_kwargs['sort_by'] = values['-ORDER-']
+                table.sort(sort_columns[values['-ORDER-']])
+                show_page(window, table)
+            elif event == '-EXPIRED-':
+                layout_kwargs['expired'] = values['-EXPIRED-']
+                table.filter(expired=values['-EXPIRED-'])
+                show_page(window, table)
+            elif event in self._bulk_events:
+                if self._bulk_edit(table, values['-IGNORED LIST-'], event,
+                                   values, window_location):
+                    show_page(window, table)
             else:
                 logging.info(f"Got unknown event {event} with values {values}")
         return
 
+    @profiler.action('review_interested_gui')
     def review_interested_gui(self, window_location=(None, None)):
         """Review postings marked as interested and change their status
 
@@ -1698,7 +2232,7 @@ class Tracker():
                            location=window_location)
             return
 
-        all_postings = pd.read_pickle(self._postings_url)
+        all_postings = self._load_postings()
         order_cols = ['status', 'institution', 'title',
                       'department', 'location', 'deadline'] + \
             self._personal_settings['custom_posting_cols']
@@ -1706,72 +2240,69 @@ class Tracker():
                         'department', 'location', 'time_left'] + \
             self._personal_settings['custom_posting_cols']
 
-        def filter_postings(postings, maybe=False, applied=False,
-                            expired=False, sort_by='deadline'):
+        @profiler.timed('review_interested_gui.filter_postings')
+        def filter_postings(all_postings, maybe=False, applied=False,
+                            expired=False):
             status = ['interested']
             if maybe:
                 status.append('maybe')
             if applied:
                 status.append('applied')
-            postings = (
-                all_postings.loc[all_postings['status'].isin(status), :]
-                .copy()
-            )
+            query = PostingQuery().status(*status)
             if not expired:
-                sel = (
-                    pd.to_datetime(postings['deadline']
-                                   ) >= pd.Timestamp("today")
-                ) | (
-                    postings['deadline'].isna()
-                )
-                postings = postings.loc[sel, :].copy()
-            postings.sort_values(by=sort_by, inplace=True)
-            logging.info(f"Filtered to {postings.shape[0]:d} posting rows")
-            return postings
+                query.deadline(start=pd.Timestamp("today"))
+            sel = query.mask(all_postings)
+            logging.info(f"Filtered to {sel.sum():d} posting rows")
+            return sel
 
+        @profiler.timed('review_interested_gui.table_from_postings')
         def table_from_postings(postings, posting_cols=posting_cols):
             # Ensure we have the right columns
 
             postings = postings.copy()
-            sel = postings['deadline'].notna()
-            postings.loc[sel, 'deadline'] =\
-                pd.to_datetime(postings.loc[sel, 'deadline'])
-            postings['deadline'].fillna('Unknown', inplace=True)
-            # Get the number of applications per deadline
-            today = settings['today']
-
-            def _human_date_delta(x, today=today):
-                if x == 'Unknown':
-                    return "Unknown deadline"
-                x = pd.to_datetime(x).to_pydatetime().date()
-                return humanize.naturaltime(today - x).replace("from now", "").strip()
-
-            postings['time_left'] = postings['deadline'].apply(
-                _human_date_delta
-            )
+            postings['time_left'] = time_left_labels(postings['deadline'],
+                                                     settings['today'])
             columns = posting_cols
             for col in columns:
-                postings[col].fillna('', inplace=True)
-                postings[col] = postings[col].astype(str)
+                postings[col] = postings[col].fillna('').astype(str)
 
             # starting values
             tbl = postings.loc[:, columns].values.tolist()
             return tbl
 
+        def paged_table(all_postings, maybe=False, applied=False,
+                        expired=False, sort_by='deadline',
+                        posting_cols=posting_cols):
+            return PagedTable(
+                all_postings,
+                lambda x: table_from_postings(x, posting_cols),
+                settings['table_page_size'], sort_by,
+                row_filter=filter_postings, maybe=maybe, applied=applied,
+                expired=expired
+            )
+
+        def header_text(table):
+            return (f"{table.num_rows:d} postings marked as interested, "
+                    "double click on an item to review and modify status or "
+                    "select several to change them together")
+
         def gen_layout(table, maybe=False, expired=False, applied=False,
                        sort_by='deadline', order_cols=order_cols):
 
             columns = [x.capitalize() for x in order_cols]
             row_colors = None
 
-            num_rows = len(table)
             dates_list_columns = [
-                [sg.Table(values=table, enable_events=True,
+                [sg.Table(values=table.rows(), bind_return_key=True,
+                          select_mode=sg.TABLE_SELECT_MODE_EXTENDED,
                           headings=columns, key='-POSTING LIST-',
                           auto_size_columns=True, expand_x=True,
                           col_widths=[10, 50, 50, 50, 10],
                           num_rows=20,
                           expand_y=True, row_colors=row_colors)],
+                [sg.Button("<", key='-PREV-'),
+                 sg.Text(table.description(), key='-PAGE-', size=(35, 1)),
+                 sg.Button(">", key='-NEXT-')],
                 [sg.CB("show past", key="-EXPIRED-", default=expired,
                        enable_events=True),
                  sg.CB("show maybes", key="-MAYBE-", default=maybe,
@@ -1780,13 +2311,14 @@ class Tracker():
                        enable_events=True),
                  sg.Text("Sort by:"),
                  sg.Combo(order_cols, default_value=sort_by,
-                          key='-ORDER-', enable_events=True)]
+                          key='-ORDER-', enable_events=True)],
+                self._bulk_edit_layout(['maybe', 'interested', 'ignore'])
             ]
-            header = [[sg.Text(f"{num_rows:d} postings marked as interested, "
-                               "click on an item to review"
-                               " and modify status")]]
+            header = [[sg.Text(header_text(table), key='-HEADER-')]]
             footer = [[sg.Button("Close", key='-EXIT-'),
-                       sg.Button("Export to excel", key='-EXPORT-')]]
+                       sg.Button("Export to excel", key='-EXPORT-'),
+                       sg.Button("Create application folders",
+                                 key='-FOLDERS-')]]
 
             layout = [[header], [sg.HSeparator()],
                       [sg.Column(dates_list_columns, key='-COL-')],
@@ -1803,22 +2335,26 @@ class Tracker():
             window['-POSTING LIST-'].table_frame.pack(expand=True, fill='both')
             return window
 
-        sort_by = 'deadline'
-        size = (None, None)
-        postings = filter_postings(all_postings, sort_by=sort_by)
-        if postings.shape[0] == 0:
-            sg.popup_error("You have not marked any posting as interested"
-                           " so the list is empty.")
+        def show_page(window, table):
+            window['-POSTING LIST-'].update(values=table.rows())
+            window['-PAGE-'].update(table.description())
+            window['-HEADER-'].update(header_text(table))
             return
-        table = table_from_postings(postings)
-        layout = gen_layout(table, sort_by=sort_by)
-        window = gen_window(layout, size, window_location)
+
+        size = (None, None)
         layout_kwargs = {
             'expired': False,
-            'sort_by': sort_by,
+            'sort_by': 'deadline',
             'maybe': False,
             'applied': False
         }
+        table = paged_table(all_postings, **layout_kwargs)
+        if table.num_rows == 0:
+            sg.popup_error("You have not marked any posting as interested"
+                           " so the list is empty.")
+            return
+        layout = gen_layout(table, **layout_kwargs)
+        window = gen_window(layout, size, window_location)
         while True:
             event, values = window.read()
             window_location = window.CurrentLocation(True)
@@ -1829,52 +2365,78 @@ class Tracker():
                 break
             elif event == '-EXPORT-':
                 url = os.path.join(self._output_dir, 'deadlines.xlsx')
-                postings.to_excel(url, index=False)
+                table.sorted_postings().to_excel(url, index=False)
                 sg.popup("All currently filtered deadlines have been exported\n"
                          "to your output folder in the file deadlines.xlsx",
                          location=window_location)
                 continue
+            elif event == '-FOLDERS-':
+                scaffolder = self._scaffolder()
+                if scaffolder is None:
+                    continue
+                rows = values['-POSTING LIST-']
+                if rows is not None and len(rows) > 0:
+                    postings = table.postings.iloc[table.positions(rows), :]
+                else:
+                    postings = table.sorted_postings()
+                res = sg.popup_ok_cancel(
+                    f"Create application folders for {postings.shape[0]:d} "
+                    "postings? (the selected ones, or all shown if none is "
+                    "selected)\nExisting folders are left as they are.",
+                    location=window_location
+                )
+                if res != 'OK':
+                    continue
+                template = settings['scaffolding_name_template']
+                created = scaffolder.create_many([
+                    (render_name(template, posting), posting)
+                    for _, posting in postings.iterrows()
+                ])
+                sg.popup(f"Created {len(created):d} application folders in "
+                         f"{scaffolder.output_dir}", location=window_location)
+                continue
             elif event == "-POSTING LIST-":
                 row = values['-POSTING LIST-']
                 if not isinstance(row, int):
+                    if len(row) == 0:
+                        continue
                     row = row[0]
-                selected_postings = postings.iloc[row, :].copy()
-                if selected_postings.shape[0] == 0:
-                    continue
+                selected_postings = table.postings.iloc[
+                    table.position(row), :].copy()
 
                 changes = self.view_detailed_posting(
                     selected_postings, window_location
                 )
 
                 if changes:
-                    order_cols = ['status', 'institution', 'title',
-                                  'department', 'location', 'deadline'] + \
-                        self._personal_settings['custom_posting_cols']
-                    posting_cols = ['status', 'institution', 'title',
-                                    'department', 'location', 'time_left'] + \
-                        self._personal_settings['custom_posting_cols']
-                    all_postings = pd.read_pickle(self._postings_url)
-                    postings = filter_postings(all_postings, **layout_kwargs)
-                    table = table_from_postings(postings, posting_cols)
-                    new_layout = gen_layout(table, order_cols=order_cols,
-                                            **layout_kwargs)
-                    window.close()
-                    window = gen_window(new_layout, size, window_location)
-            elif event in ['-EXPIRED-', '-ORDER-', '-MAYBE-', '-APPLIED-']:
+                    # Apply the edit in memory rather than reloading, only
+                    # the edited row is formatted again
+                    table.update(table.position(row), changes)
+                    show_page(window, table)
+            elif event in ['-PREV-', '-NEXT-']:
+                table.set_page(table.page + (1 if event == '-NEXT-' else -1))
+                show_page(window, table)
+            elif event == '-ORDER-':
+                layout_kwargs['sort_by'] = values['-ORDER-']
+                table.sort(values['-ORDER-'])
+                show_page(window, table)
+            elif event in ['-EXPIRED-', '-MAYBE-', '-APPLIED-']:
                 layout_kwargs['maybe'] = values['-MAYBE-']
                 layout_kwargs['expired'] = values['-EXPIRED-']
                 layout_kwargs['applied'] = values['-APPLIED-']
-                layout_kwargs['sort_by'] = values['-ORDER-']
-                postings = filter_postings(all_postings, **layout_kwargs)
-                table = table_from_postings(postings, posting_cols)
-                new_layout = gen_layout(table, order_cols=order_cols,
-                                        **layout_kwargs)
-                window.close()
-                window = gen_window(new_layout, size, window_location)
+                table.filter(maybe=values['-MAYBE-'],
+                             applied=values['-APPLIED-'],
+                             expired=values['-EXPIRED-'])
+                show_page(window, table)
+            elif event in self._bulk_events:
+                if self._bulk_edit(table, values['-POSTING LIST-'], event,
+                                   values, window_location):
+                    show_page(window, table)
             else:
                 logging.info(f"Got unknown event {event} with values {values}")
         return
 
+    @profiler.action('review_applications_gui')
     def review_applications_gui(self, window_location=(None, None)):
         """Review ongoing applications and mark answers received
 
@@ -1895,12 +2457,12 @@ class Tracker():
                            location=window_location)
             return
 
-        all_postings = pd.read_pickle(self._postings_url)
+        all_postings = self._load_postings()
         # verify we have the new "letters_recieved" columns
         if 'letters_recieved' not in all_postings.columns:
             all_postings['letters_recieved'] = ''
             all_postings['letters_status'] = ''
-            all_postings.to_pickle(self._postings_url)
+            self._save_postings(all_postings)
 
         # filter applied
         sel = all_postings['status'] == 'applied'
@@ -1928,7 +2490,7 @@ class Tracker():
             all_postings['application_status'] = ''
             all_postings.loc[sel, 'application_status'] = 'awaiting response'
             # overwrite if its a new column
-            all_postings.to_pickle(self._postings_url)
+            self._save_postings(all_postings)
         else:
             # Check if any application became applied and has no status
             sel2 = sel & (
@@ -1946,17 +2508,16 @@ class Tracker():
             all_postings.loc[sel2, 'letters_status'] = f'0/{num_let:d}'
             all_postings.loc[sel2, 'letters_recieved'] = ''
 
-            all_postings.to_pickle(self._postings_url)
+            self._save_postings(all_postings)
 
-        def filter_postings(all_postings, resolved=True, sort_by='institution'):
-            sel = all_postings['status'] == 'applied'
-            postings = all_postings.loc[sel, :].copy()
+        @profiler.timed('review_applications_gui.filter_postings')
+        def filter_postings(all_postings, resolved=True):
+            query = PostingQuery().status('applied')
             if not resolved:
-                sel = postings['application_status'].isin(resolved_statuses)
-                postings = postings.loc[~sel, :].copy()
-            postings.sort_values(by=sort_by, inplace=True)
-            return postings
+                query.exclude('application_status', resolved_statuses)
+            return query.mask(all_postings)
 
+        @profiler.timed('review_applications_gui.table_from_postings')
         def table_from_postings(postings, posting_cols=posting_cols):
             # Ensure we have the right columns
 
@@ -1964,35 +2525,44 @@ class Tracker():
 
             columns = posting_cols
             for col in columns:
-                postings[col].fillna('', inplace=True)
-                postings[col] = postings[col].astype(str)
+                postings[col] = postings[col].fillna('').astype(str)
 
             # starting values
             tbl = postings.loc[:, columns].values.tolist()
             return tbl
 
+        def paged_table(all_postings, resolved=True, sort_by='institution'):
+            return PagedTable(all_postings, table_from_postings,
+                              settings['table_page_size'], sort_by,
+                              row_filter=filter_postings, resolved=resolved)
+
+        def header_text(table):
+            return (f"{table.num_rows:d} ongoing applications, "
+                    "click on an item to modify status")
+
         def gen_layout(table, resolved=True,
                        sort_by='institution', order_cols=order_cols):
 
             columns = [x.replace('_', ' ').capitalize() for x in order_cols]
             row_colors = None
-            num_rows = len(table)
 
             dates_list_columns = [
-                [sg.Table(values=table, enable_events=True,
+                [sg.Table(values=table.rows(), enable_events=True,
                           headings=columns, key='-APPLICATION LIST-',
                           auto_size_columns=True, expand_x=True,
                           col_widths=[10, 50, 50, 50, 10],
                           num_rows=20,
                           expand_y=True, row_colors=row_colors)],
+                [sg.Button("<", key='-PREV-'),
+                 sg.Text(table.description(), key='-PAGE-', size=(35, 1)),
+                 sg.Button(">", key='-NEXT-')],
                 [sg.CB("show resolved", key="-RESOLVED-", default=resolved,
                        enable_events=True),
                  sg.Text("Sort by:"),
                  sg.Combo(order_cols, default_value=sort_by,
                           key='-ORDER-', enable_events=True)]
             ]
-            header = [[sg.Text(f"{num_rows:d} ongoing applications, "
-                               "click on an item to modify status")]]
+            header = [[sg.Text(header_text(table), key='-HEADER-')]]
             footer = [[sg.Button("Close", key='-EXIT-'),
                        sg.Button("Export to excel", key='-EXPORT-')]]
 
@@ -2012,20 +2582,24 @@ class Tracker():
                 expand=True, fill='both')
             return window
 
-        sort_by = 'institution'
+        def show_page(window, table):
+            window['-APPLICATION LIST-'].update(values=table.rows())
+            window['-PAGE-'].update(table.description())
+            window['-HEADER-'].update(header_text(table))
+            return
+
         size = (None, None)
-        postings = filter_postings(all_postings, sort_by=sort_by)
-        if postings.shape[0] == 0:
+        layout_kwargs = {
+            'resolved': True,
+            'sort_by': 'institution',
+        }
+        table = paged_table(all_postings, **layout_kwargs)
+        if table.num_rows == 0:
             sg.popup_error("You have not marked any posting as applied"
                            " so the list is empty.")
             return
-        table = table_from_postings(postings)
-        layout = gen_layout(table, sort_by=sort_by)
+        layout = gen_layout(table, **layout_kwargs)
         window = gen_window(layout, size, window_location)
-        layout_kwargs = {
-            'resolved': True,
-            'sort_by': sort_by,
-        }
         while True:
             event, values = window.read()
             window_location = window.CurrentLocation(True)
@@ -2036,7 +2610,7 @@ class Tracker():
                 break
             elif event == '-EXPORT-':
                 url = os.path.join(self._output_dir, 'applications.xlsx')
-                postings.to_excel(url, index=False)
+                table.sorted_postings().to_excel(url, index=False)
                 sg.popup("All currently filtered applications have been exported\n"
                          "to your output folder in the file applications.xlsx",
                          location=window_location)
@@ -2044,34 +2618,37 @@ class Tracker():
             elif event == "-APPLICATION LIST-":
                 row = values['-APPLICATION LIST-']
                 if not isinstance(row, int):
+                    if len(row) == 0:
+                        continue
                     row = row[0]
-                selected_postings = postings.iloc[row, :].copy()
-                if selected_postings.shape[0] == 0:
-                    continue
+                selected_postings = table.postings.iloc[
+                    table.position(row), :].copy()
 
                 changes = self.view_awaiting_application(
                     selected_postings, window_location
                 )
 
                 if changes:
-                    all_postings = pd.read_pickle(self._postings_url)
-                    postings = filter_postings(all_postings, **layout_kwargs)
-                    table = table_from_postings(postings)
-                    new_layout = gen_layout(table, **layout_kwargs)
-                    window.close()
-                    window = gen_window(new_layout, size, window_location)
-            elif event in ['-RESOLVED-', '-ORDER-']:
-                layout_kwargs['resolved'] = values['-RESOLVED-']
+                    # Apply the edit in memory rather than reloading, only
+                    # the edited row is formatted again
+                    table.update(table.position(row), changes)
+                    show_page(window, table)
+            elif event in ['-PREV-', '-NEXT-']:
+                table.set_page(table.page + (1 if event == '-NEXT-' else -1))
+                show_page(window, table)
+            elif event == '-ORDER-':
                 layout_kwargs['sort_by'] = values['-ORDER-']
-                postings = filter_postings(all_postings, **layout_kwargs)
-                table = table_from_postings(postings)
-                new_layout = gen_layout(table, **layout_kwargs)
-                window.close()
-                window = gen_window(new_layout, size, window_location)
+                table.sort(values['-ORDER-'])
+                show_page(window, table)
+            elif event == '-RESOLVED-':
+                layout_kwargs['resolved'] = values['-RESOLVED-']
+                table.filter(resolved=values['-RESOLVED-'])
+                show_page(window, table)
             else:
                 logging.info(f"Got unknown event {event} with values {values}")
         return
 
+    @profiler.action('view_awaiting_application')
     def view_awaiting_application(self, row, window_location=(None, None)):
         """Review and edit a post as shown in the application menu
 
@@ -2082,8 +2659,9 @@ class Tracker():
 
         Returns
         -------
-        Status:
-            indicates whether any edit was done to the postings
+        dict
+            the new values of the edited columns, application status
+            included. Empty if the posting was not edited
         """
         status_change = False
         font = 'Helvetica 12'
@@ -2147,7 +2725,7 @@ class Tracker():
                 window.close()
                 break
             elif event == '-VISIT-':
-                webbrowser.open(url)
+                self._open_posting(row)
             elif event == "-PROGRESS-":
                 window.close()
                 status_change = True
@@ -2204,49 +2782,35 @@ class Tracker():
             else:
                 logging.warning(f"Got unkown event {event}")
 
-        if status_change:
-            # Update
-            postings = pd.read_pickle(self._postings_url)
-            sel = (postings['origin'] == row['origin']) & \
-                (postings['origin_id'] == row['origin_id'])
-            if not sel.any():
-                logging.warning(
-                    f"Failed to find a match for row {row} in postings")
-                os.popup_error("Failed to match update row to postings. Is the "
-                               " postings file corrupt?")
-                status_change = False
-                return status_change
-            if sel.sum() > 1:
-                logging.warning("Single row selected multiple lines in postings.\n"
-                                "this suggests a corrupted postings file.\n"
-                                f"requested: {row}\n got \n {postings.loc[sel, :]}")
-                os.popup_error("Failed to match update row to postings. Is the "
-                               " postings file corrupt?")
-                status_change = False
-                return status_change
-
-            ix = postings.loc[sel, :].index.values[0]
-            row = row.to_frame().T
-            row.index = [ix]
-            # Test one more time to be sure
-            test = (postings.loc[sel, 'origin'] == row['origin']) & \
-                (postings.loc[sel, 'origin_id'] == row['origin_id'])
-            if not test.all():
-                logging.warning("Failed to match the row with the data. "
-                                " This suggests a corrupted postings file."
-                                f"requested: {row}\n got \n {postings.loc[sel, :]}")
-                os.popup_error("Failed to match update row to postings. Is the "
-                               " postings file corrupt?")
-                status_change = False
-                return status_change
-
-            row = row.loc[:, ['application_status', 'deadline', 'letters_recieved',
-                              'letters_status']]
-            postings.update(row)
-            postings.to_pickle(self._postings_url)
-
-        return status_change
-
+        if not status_change:
+            return {}
+
+        # Update
+        postings = self._load_postings()
+        sel = (postings['origin'] == row['origin']) & \
+            (postings['origin_id'] == row['origin_id'])
+        if sel.sum() != 1:
+            logging.warning("The edited row matched "
+                            f"{sel.sum():d} lines in postings.\n"
+                            "this suggests a corrupted postings file.\n"
+                            f"requested: {row}\n got \n {postings.loc[sel, :]}")
+            sg.popup_error("Failed to match update row to postings. Is the "
+                           " postings file corrupt?")
+            return {}
+
+        changes = {col: row[col] for col in ['application_status',
+                                             'letters_recieved',
+                                             'letters_status']
+                   if col in postings.columns}
+        ix = postings.index[sel.values][0]
+        logging.info(f"Modifying row {ix} with {changes}")
+        for col, value in changes.items():
+            postings.at[ix, col] = value
+        self._save_postings(postings)
+
+        return changes
+
+    @profiler.action('set_configuration_gui')
     def set_configuration_gui(self, window_location=(None, None)):
         """A window to set basic configuration
 
@@ -2401,12 +2965,12 @@ class Tracker():
                     continue
                 else:
                     # Validate its not taken
-                    all_postings = pd.read_pickle(self._postings_url)
+                    all_postings = self._load_postings()
                     if val in all_postings.columns:
                         sg.popup_error(f"column name {val} already in use")
                         continue
                     all_postings[val] = ''
-                    all_postings.to_pickle(self._postings_url)
+                    self._save_postings(all_postings)
                     self._personal_settings['custom_posting_cols'].append(val)
                     save_setting()
                     window.close()
@@ -2425,9 +2989,9 @@ class Tracker():
                     location=window_location
                 )
                 if res == 'OK':
-                    all_postings = pd.read_pickle(self._postings_url)
+                    all_postings = self._load_postings()
                     all_postings.drop(val, axis=1, inplace=True)
-                    all_postings.to_pickle(self._postings_url)
+                    self._save_postings(all_postings)
 
                     del letters[num]
                     self._personal_settings['custom_posting_cols'] = letters
@@ -1,7 +1,11 @@
 #! /bin/python3
 import os
+import datetime
+import functools
+import numpy as np
 import pandas as pd
 import xlrd
+import humanize
 
 """
 A collection of auxiliary methods
@@ -186,3 +190,59 @@ def country_state_city_aggregator(row, df):
             locations.append(v)
 
     return ", ".join(locations)
+
+
+@functools.lru_cache(maxsize=4096)
+def _deadline_date(deadline):
+    """Date of a deadline value, None if it is not a date"""
+    try:
+        deadline = pd.to_datetime(deadline)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(deadline):
+        return None
+    return deadline.to_pydatetime().date()
+
+
+@functools.lru_cache(maxsize=4096)
+def _time_left_label(days):
+    """Label for a deadline days away, negative if it passed"""
+    delta = datetime.timedelta(days=-int(days))
+    return humanize.naturaltime(delta).replace("from now", "").strip()
+
+
+def time_left_labels(deadlines, today, unknown="Unknown deadline"):
+    """Human readable time left before each deadline, e.g. "3 days"
+
+    Each distinct deadline is parsed once and each distinct number of days
+    left is labelled once, so long lists cost about as much as short ones.
+
+    Parameters
+    ----------
+    deadlines : Series
+        deadlines as dates, timestamps or date strings. Missing values and
+        values that are not dates get the unknown label
+    today : date
+        the date to count from
+    unknown : str, optional
+        label for unknown deadlines
+
+    Returns
+    -------
+    ndarray
+        the labels, in the order of deadlines
+    """
+    codes, uniques = pd.factorize(pd.Series(deadlines, dtype=object))
+    dates = [_deadline_date(x) for x in uniques]
+    known = np.array([x is not None for x in dates], dtype=bool)
+    days = np.array([(x - today).days if x is not None else 0
+                     for x in dates], dtype=np.int64)
+    # One label per distinct number of days left
+    buckets, inverse = np.unique(days, return_inverse=True)
+    labels = np.array([_time_left_label(x) for x in buckets], dtype=object)
+    unique_labels = np.where(known, labels[inverse], unknown)
+
+    out = np.full(len(codes), unknown, dtype=object)
+    sel = codes >= 0
+    out[sel] = unique_labels[codes[sel]]
+    return out
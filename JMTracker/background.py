@@ -0,0 +1,105 @@
+import logging
+import threading
+
+"""
+Long running work (ingests, scrapes) run off the GUI thread, reporting back
+to the window through events.
+"""
+
+
+class Cancelled(Exception):
+
+    """Raised inside a background job once the user cancelled it"""
+
+
+class BackgroundJob:
+
+    """Runs a function on a worker thread. Progress and the result are sent
+    to a window as events, so its event loop keeps running meanwhile."""
+
+    # Event values: (name, stage, detail)
+    progress_event = '-JOB-PROGRESS-'
+    # Event values: (name, kind, result)
+    done_event = '-JOB-DONE-'
+    # Seconds a closing window waits for its cancelled job
+    close_timeout = 5.0
+
+    def __init__(self, window, target, name, kind=None):
+        """Initialize the job
+
+        Parameters
+        ----------
+        window: sg.Window
+            window receiving the events
+        target: function
+            takes the job's progress function and returns the result. It
+            should call the progress function between steps, which raises
+            Cancelled once the job is cancelled
+        name: str
+            name of the job for the user, e.g. the source origin
+        kind: str, optional
+            tag sent back with the result
+        """
+        self.name = name
+        self.kind = kind
+        self._window = window
+        self._target = target
+        self._cancel = threading.Event()
+        self._detached = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f'job-{name}')
+        return
+
+    def start(self):
+        """Start the job"""
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def cancel(self):
+        """Ask the job to stop at its next progress report"""
+        self._cancel.set()
+        return
+
+    def detach(self):
+        """Stop sending events to the window, e.g. before closing it"""
+        self._detached.set()
+        return
+
+    def join(self, timeout=None):
+        """Wait for the job to finish"""
+        self._thread.join(timeout)
+        return
+
+    def progress(self, stage, detail=''):
+        """Report progress to the window
+
+        Raises
+        ------
+        Cancelled
+            if the job was cancelled
+        """
+        if self._cancel.is_set():
+            raise Cancelled(f"{self.name} cancelled")
+        self._send(self.progress_event, (self.name, stage, detail))
+        return
+
+    def _send(self, event, value):
+        """Write an event to the window, unless the job was detached"""
+        if not self._detached.is_set():
+            self._window.write_event_value(event, value)
+        return
+
+    def _run(self):
+        try:
+            result = self._target(self.progress)
+        except Cancelled:
+            result = (False, f"{self.name} was cancelled, nothing was stored")
+        except Exception as err:
+            logging.exception(f"{self.name} failed")
+            result = (False, f"{self.name} failed: {err}")
+        self._send(self.done_event, (self.name, self.kind, result))
+        return
@@ -0,0 +1,205 @@
+import time
+import logging
+import tempfile
+from contextlib import contextmanager
+import pandas as pd
+import requests
+from JMTracker.scrapper import AJOScrapper, scrapper_registry
+from JMTracker.replay import ReplayServer, FixtureRecorder, load_fixtures
+
+"""
+Benchmarks for the scrappers, meant to be run on recorded pages
+"""
+
+
+def _load_pages(folder):
+    """Read every recorded html page in folder as (url path, text) tuples"""
+    fixtures, _ = load_fixtures(folder)
+    pages = []
+    for path in sorted(fixtures.keys()):
+        page = fixtures[path]
+        if not isinstance(page, bytes):
+            status, headers, page = page
+            if status != 200 or \
+                    'html' not in headers.get('Content-Type', 'html'):
+                continue
+        pages.append((path, page.decode('utf-8', errors='replace')))
+    return pages
+
+
+@contextmanager
+def _scratch_settings():
+    """Point the storage, input and output folders to a temporary one and
+    disable metrics, so that benchmark scrapes leave the user data alone"""
+    from JMTracker.settings import settings
+    keys = ['storage_directory', 'input_directory', 'output_directory',
+            'metrics_enabled']
+    previous = {x: settings[x] for x in keys}
+    with tempfile.TemporaryDirectory() as folder:
+        settings.update({
+            'storage_directory': folder,
+            'input_directory': folder,
+            'output_directory': folder,
+            'metrics_enabled': False,
+        })
+        try:
+            yield folder
+        finally:
+            settings.update(previous)
+
+
+def record_fixtures(folder, origin='AJO'):
+    """Scrape a source for real and store every page fetched in a fixture
+    archive, to replay it later
+
+    Parameters
+    ----------
+    folder: str
+        the fixture archive folder. Pages are added to it if it exists
+    origin: str, optional
+        the source to scrape, one of scrapper_registry
+
+    Returns
+    -------
+    status: bool
+        indicates if scrapping was successfull
+    message: str
+        indicate failure source
+    """
+    recorder = FixtureRecorder(folder)
+    with _scratch_settings():
+        # No cache nor known postings, so that every page is fetched
+        scrapper = scrapper_registry[origin](cache=False, recorder=recorder)
+        status, message = scrapper.get_postings()
+    logging.info(f"Recorded {origin} pages in {folder}")
+    return status, message
+
+
+def benchmark_parsing(folder, repeat=5):
+    """Compare the CPU time spent per page by the 'soup' and 'fast' parse
+    modes on recorded AJO posting pages.
+
+    Parameters
+    ----------
+    folder: str
+        folder with recorded AJO pages. Pages that are not postings (e.g. the
+        listing) are parsed but not extracted
+    repeat: int, optional
+        number of passes over all pages
+
+    Returns
+    -------
+    DataFrame
+        CPU milliseconds per page for each mode, with the number of postings
+        whose extracted data differs from the 'soup' mode
+    """
+    pages = _load_pages(folder)
+    if len(pages) == 0:
+        raise ValueError(f"No recorded pages found in {folder}")
+
+    results = []
+    extracted = {}
+    for mode in ['soup', 'fast']:
+        scrapper = AJOScrapper(cache=False, parse_mode=mode, concurrency=1)
+        rows = {}
+        parse_cpu = 0.0
+        extract_cpu = 0.0
+        for _ in range(repeat):
+            for link, text in pages:
+                start = time.process_time()
+                tree, soup = scrapper.parse_page(text)
+                parse_cpu += time.process_time() - start
+                start = time.process_time()
+                try:
+                    rows[link] = scrapper.parse_posting(tree, link)
+                except (IndexError, ValueError):
+                    # not a posting page
+                    pass
+                extract_cpu += time.process_time() - start
+        extracted[mode] = rows
+        num = repeat * len(pages)
+        results.append({
+            'mode': mode,
+            'pages': len(pages),
+            'parse_ms_per_page': parse_cpu / num * 1e3,
+            'extract_ms_per_page': extract_cpu / num * 1e3,
+            'total_ms_per_page': (parse_cpu + extract_cpu) / num * 1e3,
+        })
+
+    results = pd.DataFrame(results).set_index('mode')
+    results['differences'] = [
+        sum(1 for k, v in extracted[mode].items()
+            if extracted['soup'].get(k, None) != v)
+        for mode in results.index
+    ]
+    saved = results.loc['soup', 'total_ms_per_page'] - \
+        results.loc['fast', 'total_ms_per_page']
+    logging.info(f"Fast parsing saves {saved:.2f} CPU ms per page")
+    return results
+
+
+def benchmark_scraping(folder, concurrency=(1, 2, 4, 8), latency=0.05,
+                       error_rate=0.0, seed=0, start=None, **kwargs):
+    """Time full AJOScrapper.get_postings runs against recorded pages
+    served locally, for several concurrency levels.
+
+    Parameters
+    ----------
+    folder: str
+        fixture archive, or folder with the pages at their url paths
+    concurrency: iterable of int, optional
+        the concurrency levels to compare
+    latency: float or tuple, optional
+        seconds the replay server waits before each answer, or a (min, max)
+        range
+    error_rate: float, optional
+        fraction of requests answered with a 503
+    seed: int, optional
+        seed of the latency and error draws, the same for every level
+    start: str, optional
+        url path of the listing. Defaults to the first page of the archive,
+        or to /ajo/econ
+    kwargs: dict
+        passed on to AJOScrapper. The cache and the rate limit are off
+        unless given
+
+    Returns
+    -------
+    DataFrame
+        seconds, postings per second and requests served by concurrency
+    """
+    pages, archive_start = load_fixtures(folder)
+    if len(pages) == 0:
+        raise ValueError(f"No recorded pages found in {folder}")
+    if start is None:
+        start = archive_start if archive_start is not None else '/ajo/econ'
+    kwargs.setdefault('cache', False)
+    kwargs.setdefault('rate_limit', 0)
+
+    results = []
+    for level in concurrency:
+        server = ReplayServer(pages, latency=latency, error_rate=error_rate,
+                              seed=seed)
+        with _scratch_settings(), server:
+            scrapper = AJOScrapper(base_url=server.url + start,
+                                   concurrency=level, **kwargs)
+            begin = time.perf_counter()
+            try:
+                status, _ = scrapper.get_postings()
+            except requests.RequestException as err:
+                logging.warning(f"Scrape failed at concurrency {level}: {err}")
+                status = False
+            elapsed = time.perf_counter() - begin
+            postings = 0
+            if scrapper.stored_url is not None:
+                postings = pd.read_csv(scrapper.stored_url).shape[0]
+        results.append({
+            'concurrency': level,
+            'success': status,
+            'seconds': elapsed,
+            'postings': postings,
+            'postings_per_sec': postings / elapsed,
+            'requests': server.requests,
+            'errors_injected': server.errors,
+        })
+    return pd.DataFrame(results).set_index('concurrency')
@@ -0,0 +1,194 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+"""
+A persistent response cache for the scrappers. Bodies are stored compressed
+next to their ETag/Last-Modified validators so that later requests can be
+made conditional and 304 answers served from disk.
+"""
+
+
+class HTTPCache:
+
+    """An on-disk, size bounded, least recently used response cache"""
+
+    # Response headers kept with the body
+    _kept_headers = ['Content-Type', 'ETag', 'Last-Modified']
+    # Index changes stored together, see flush
+    _save_every = 100
+
+    def __init__(self, directory, max_bytes=200 * 2**20):
+        """Initialize the cache
+
+        Parameters
+        ----------
+        directory: str
+            folder for the cached bodies and their index
+        max_bytes: int, optional
+            maximum total size of the compressed bodies. The least recently
+            used entries are evicted beyond it
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._index_url = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._index = {}
+        # Index changes not stored yet
+        self._dirty = 0
+        if os.path.isfile(self._index_url):
+            try:
+                with open(self._index_url, 'r') as handle:
+                    self._index = json.load(handle)
+            except ValueError:
+                logging.warning("The http cache index is corrupt, resetting it")
+        # The size budget may have shrunk since the last run
+        with self._lock:
+            self._evict()
+        self.flush()
+        return
+
+    def _body_url(self, url):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, f'{name}.gz')
+
+    def _save_index(self):
+        """Store the index. Expects the lock to be held."""
+        tmp = self._index_url + '.tmp'
+        with open(tmp, 'w') as handle:
+            json.dump(self._index, handle)
+        os.replace(tmp, self._index_url)
+        self._dirty = 0
+        return
+
+    def _changed(self):
+        """Count an index change, storing the index every _save_every of
+        them. Expects the lock to be held."""
+        self._dirty += 1
+        if self._dirty >= self._save_every:
+            self._save_index()
+        return
+
+    def flush(self):
+        """Store the index if it changed, e.g. at the end of a scrape"""
+        with self._lock:
+            if self._dirty > 0:
+                self._save_index()
+        return
+
+    def conditional_headers(self, url):
+        """Headers that make a request for url conditional, if cached"""
+        with self._lock:
+            entry = self._index.get(url, None)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry['headers'].get('ETag', None) is not None:
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified', None) is not None:
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def store(self, url, response):
+        """Cache a successful response if it carries validators
+
+        Parameters
+        ----------
+        url: str
+            the requested url
+        response: requests.Response
+            a 200 response for url
+        """
+        headers = {k: response.headers[k] for k in self._kept_headers
+                   if k in response.headers}
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return
+        body = gzip.compress(response.content)
+        # A crash mid-write leaves a stray temporary file, never a truncated
+        # body. The digest ties the index entry to the body it describes
+        path = self._body_url(url)
+        tmp = path + f'.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as handle:
+            handle.write(body)
+        os.replace(tmp, path)
+        with self._lock:
+            self._index[url] = {
+                'headers': headers,
+                'encoding': response.encoding,
+                'size': len(body),
+                'digest': hashlib.sha1(body).hexdigest(),
+                'last_access': time.time(),
+            }
+            self._evict()
+            self._changed()
+        return
+
+    def response(self, url, not_modified):
+        """Build a full response from disk for a 304 answer
+
+        Parameters
+        ----------
+        url: str
+            the requested url
+        not_modified: requests.Response
+            the 304 response received
+
+        Returns
+        -------
+        requests.Response or None
+            the cached response, None if it is no longer cached
+        """
+        with self._lock:
+            entry = self._index.get(url, None)
+        if entry is None:
+            return None
+        try:
+            with open(self._body_url(url), 'rb') as handle:
+                body = handle.read()
+        except OSError:
+            # evicted in the meantime
+            return None
+        if hashlib.sha1(body).hexdigest() != entry.get('digest', None):
+            # replaced since the index was stored, or from an older cache
+            return None
+        body = gzip.decompress(body)
+        with self._lock:
+            entry['last_access'] = time.time()
+            self._changed()
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry['encoding']
+        response.url = url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def _evict(self):
+        """Drop least recently used entries beyond the size budget. Expects
+        the lock to be held."""
+        total = sum(x['size'] for x in self._index.values())
+        if total <= self._max_bytes:
+            return
+        by_age = sorted(self._index.items(), key=lambda x: x[1]['last_access'])
+        for url, entry in by_age:
+            if total <= self._max_bytes:
+                break
+            path = self._body_url(url)
+            if os.path.isfile(path):
+                os.remove(path)
+            total -= entry['size']
+            del self._index[url]
+            self._dirty += 1
+            logging.debug(f"Evicted {url} from the http cache")
+        return
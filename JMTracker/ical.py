@@ -0,0 +1,211 @@
+import os
+import re
+import json
+import logging
+import datetime
+import numpy as np
+import pandas as pd
+from JMTracker.storage import PostingIndex
+
+"""
+Export of the posting deadlines to an iCalendar (.ics) file, so they can be
+imported in or subscribed to from a calendar app.
+"""
+
+
+def _escape(text):
+    """Escape a TEXT value as required by RFC 5545"""
+    text = '' if not isinstance(text, str) else text
+    text = text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+    return re.sub(r'\r\n|\r|\n', '\\\\n', text)
+
+
+def _fold(line):
+    """Split a content line in lines of at most 75 octets"""
+    if len(line.encode('utf-8')) <= 75:
+        return line
+    parts = []
+    current = ''
+    size = 0
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        # Continuation lines start with a space, which counts
+        if size + char_size > (75 if not parts else 74):
+            parts.append(current)
+            current, size = '', 0
+        current += char
+        size += char_size
+    parts.append(current)
+    return '\r\n '.join(parts)
+
+
+class DeadlineFeed:
+
+    """Deadlines of postings as all-day events of an .ics file. Each event is
+    named after its posting, so it is updated rather than duplicated when a
+    calendar imports the file again. Events are only rendered again when
+    their posting changes, and the file is only written when an event
+    changed. The event of a posting no longer exported is kept cancelled for
+    one more export, so subscribed calendars remove it too."""
+
+    # Posting columns shown in the events
+    columns = ['title', 'institution', 'department', 'location', 'status',
+               'url']
+
+    def __init__(self, url, state_url):
+        """Initialize the feed
+
+        Parameters
+        ----------
+        url: str
+            the .ics file
+        state_url: str
+            file keeping the rendered events between exports
+        """
+        self.url = url
+        self._state_url = state_url
+        self._events = {}
+        if os.path.isfile(state_url):
+            try:
+                with open(state_url, 'r') as handle:
+                    self._events = json.load(handle)
+            except ValueError:
+                logging.warning("The calendar export state is corrupt, "
+                                "resetting it")
+        return
+
+    @staticmethod
+    def uids(postings):
+        """Event ids of postings, from their origin and origin_id"""
+        uids = postings['origin'].astype(str) + '-' + \
+            postings['origin_id'].astype(str)
+        return uids.str.replace(r'[^\w.-]', '_', regex=True) + '@jmtracker'
+
+    def _render(self, uid, posting, day, sequence, stamp):
+        """The VEVENT of a posting"""
+        start = day.strftime('%Y%m%d')
+        end = (day + datetime.timedelta(days=1)).strftime('%Y%m%d')
+        summary = f"Deadline: {posting['institution']}"
+        if isinstance(posting['title'], str) and posting['title'] != '':
+            summary += f" - {posting['title']}"
+        details = [f"Status: {posting['status']}"]
+        if isinstance(posting['department'], str) and \
+                posting['department'] != '':
+            details.append(f"Department: {posting['department']}")
+        lines = [
+            'BEGIN:VEVENT',
+            f'UID:{uid}',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART;VALUE=DATE:{start}',
+            f'DTEND;VALUE=DATE:{end}',
+            f'SEQUENCE:{sequence:d}',
+            f'SUMMARY:{_escape(summary)}',
+            f"DESCRIPTION:{_escape(chr(10).join(details))}",
+            'TRANSP:TRANSPARENT',
+        ]
+        if isinstance(posting['location'], str) and posting['location'] != '':
+            lines.append(f"LOCATION:{_escape(posting['location'])}")
+        if isinstance(posting['url'], str) and \
+                posting['url'].startswith('http'):
+            lines.append(f"URL:{posting['url']}")
+        lines.append('END:VEVENT')
+        return '\r\n'.join(_fold(x) for x in lines)
+
+    @staticmethod
+    def _cancel(event, stamp):
+        """A rendered event marked cancelled, with its sequence bumped"""
+        sequence = event['sequence'] + 1
+        text = re.sub(r'^SEQUENCE:\d+', f'SEQUENCE:{sequence:d}',
+                      event['text'], flags=re.MULTILINE)
+        text = re.sub(r'^DTSTAMP:\w+', f'DTSTAMP:{stamp}', text,
+                      flags=re.MULTILINE)
+        text = text.replace('\r\nEND:VEVENT',
+                            '\r\nSTATUS:CANCELLED\r\nEND:VEVENT')
+        return {'digest': None, 'sequence': sequence, 'cancelled': True,
+                'text': text}
+
+    def export(self, postings, statuses):
+        """Bring the .ics file up to date with the postings
+
+        Parameters
+        ----------
+        postings: DataFrame
+            all the postings
+        statuses: list
+            statuses of the postings exported
+
+        Returns
+        -------
+        dict
+            number of events added, changed, removed and unchanged. Removed
+            events are cancelled in this export and left out of the next
+        """
+        # Callers may go on editing postings directly, so their shared
+        # index is left alone
+        deadlines, missing = PostingIndex(postings).deadlines()
+        sel = postings['status'].isin(statuses).to_numpy() & \
+            ~np.isnat(deadlines)
+        exported = postings.loc[sel, ['origin', 'origin_id']].copy()
+        for col in self.columns:
+            exported[col] = postings.loc[sel, col].fillna('').astype(str) \
+                if col in postings.columns else ''
+        exported['day'] = deadlines[sel].astype('datetime64[D]')
+        digests = pd.util.hash_pandas_object(
+            exported.astype(str), index=False).astype(str).to_numpy()
+
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime(
+            '%Y%m%dT%H%M%SZ')
+        uids = self.uids(exported).to_numpy()
+        # A cancelled event is rendered again if its posting comes back
+        previous = pd.Series({k: v['digest'] for k, v in self._events.items()
+                              if not v.get('cancelled', False)},
+                             dtype=object)
+        changed = pd.Series(uids).map(previous).to_numpy() != digests
+        events = {uid: self._events[uid] for uid in uids[~changed]}
+        counts = {'added': 0, 'changed': 0, 'removed': 0,
+                  'unchanged': len(events)}
+        positions = np.flatnonzero(changed)
+        for position, posting in zip(
+                positions, exported.iloc[positions, :].to_dict('records')):
+            uid = uids[position]
+            known = uid in self._events
+            sequence = self._events[uid]['sequence'] + 1 if known else 0
+            events[uid] = {
+                'digest': digests[position],
+                'sequence': sequence,
+                'text': self._render(uid, posting, posting['day'].date(),
+                                     sequence, stamp)
+            }
+            counts['changed' if known else 'added'] += 1
+        dropped = 0
+        for uid in set(self._events) - set(events):
+            if self._events[uid].get('cancelled', False):
+                dropped += 1
+            else:
+                events[uid] = self._cancel(self._events[uid], stamp)
+                counts['removed'] += 1
+
+        if counts['added'] + counts['changed'] + counts['removed'] + \
+                dropped == 0 and os.path.isfile(self.url):
+            return counts
+        self._events = events
+        self._write()
+        logging.info(f"Exported deadlines to {self.url}: {counts}")
+        return counts
+
+    def _write(self):
+        """Store the .ics file and the rendered events"""
+        text = '\r\n'.join(
+            ['BEGIN:VCALENDAR', 'VERSION:2.0',
+             'PRODID:-//JMTracker//Deadlines//EN', 'CALSCALE:GREGORIAN',
+             'X-WR-CALNAME:Job market deadlines'] +
+            [self._events[x]['text'] for x in sorted(self._events)] +
+            ['END:VCALENDAR']
+        ) + '\r\n'
+        for url, content in [(self.url, text),
+                             (self._state_url, json.dumps(self._events))]:
+            tmp = url + '.tmp'
+            with open(tmp, 'w', encoding='utf-8', newline='') as handle:
+                handle.write(content)
+            os.replace(tmp, url)
+        return
@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import logging
+import datetime
+import threading
+from contextlib import contextmanager
+from JMTracker.profiling import profiler
+
+"""
+Counters and histograms for ingest and scrape runs. Each run is appended to
+a local metrics file (JSON lines) or written as a Prometheus textfile so
+that a local collector can pick it up.
+"""
+
+# Default histogram buckets, in seconds
+_time_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+
+    """A fixed-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets=_time_buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        return
+
+    def observe(self, value):
+        """Add an observation"""
+        self.count += 1
+        self.sum += value
+        for n, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[n] += 1
+        return
+
+    def to_dict(self):
+        """Cumulative bucket counts keyed by upper bound"""
+        buckets = {f"{b:g}": c for b, c in zip(self.buckets, self.counts)}
+        buckets['+Inf'] = self.count
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class MetricsRun:
+
+    """Collects the counters and histograms of a single ingest or scrape"""
+
+    def __init__(self, job, span_prefix=None, **labels):
+        """Initialize a run
+
+        Parameters
+        ----------
+        job: str
+            the kind of run, e.g. 'ingest' or 'scrape'
+        span_prefix: str, optional
+            prefix for the profiler spans opened by `stage`. Defaults to job
+        labels: dict
+            labels attached to every metric of the run (e.g. origin)
+        """
+        self.job = job
+        self.labels = labels
+        self.status = 'success'
+        self._span_prefix = job if span_prefix is None else span_prefix
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._timestamp = datetime.datetime.now()
+        return
+
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name, value=1, **labels):
+        """Increase a counter"""
+        key = self._key(name, labels)
+        if hasattr(value, 'item'):
+            # numpy scalars are not json serializable
+            value = value.item()
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        return
+
+    def observe(self, name, value, buckets=_time_buckets, **labels):
+        """Add an observation to a histogram"""
+        key = self._key(name, labels)
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram(buckets)
+            self._histograms[key].observe(value)
+        return
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage of the run. Also shows up as a profiler span."""
+        start = time.perf_counter()
+        try:
+            with profiler.span(f'{self._span_prefix}.{name}'):
+                yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start,
+                         stage=name)
+
+    def to_record(self):
+        """JSON friendly representation of the run"""
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                dict(name=name, labels=dict(labels), **hist.to_dict())
+                for (name, labels), hist in self._histograms.items()
+            ]
+        return {
+            'timestamp': self._timestamp.isoformat(timespec='seconds'),
+            'job': self.job,
+            'labels': self.labels,
+            'status': self.status,
+            'duration_seconds': time.perf_counter() - self._start,
+            'counters': counters,
+            'histograms': histograms,
+        }
+
+    def to_prometheus(self):
+        """Prometheus text exposition of the run"""
+        record = self.to_record()
+        prefix = f'jmtracker_{self.job}'
+
+        def fmt_labels(labels):
+            labels = {**self.labels, **labels}
+            if len(labels) == 0:
+                return ''
+            inner = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            return '{' + inner + '}'
+
+        lines = []
+        typed = set()
+        for counter in record['counters']:
+            name = f"{prefix}_{counter['name']}_total"
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{fmt_labels(counter['labels'])} "
+                         f"{counter['value']}")
+        for hist in record['histograms']:
+            name = f"{prefix}_{hist['name']}"
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, count in hist['buckets'].items():
+                labels = {**hist['labels'], 'le': bound}
+                lines.append(f"{name}_bucket{fmt_labels(labels)} {count}")
+            lines.append(f"{name}_sum{fmt_labels(hist['labels'])} {hist['sum']}")
+            lines.append(f"{name}_count{fmt_labels(hist['labels'])} "
+                         f"{hist['count']}")
+
+        success = 1 if self.status == 'success' else 0
+        lines += [
+            f"# TYPE {prefix}_last_run_success gauge",
+            f"{prefix}_last_run_success{fmt_labels({})} {success}",
+            f"# TYPE {prefix}_last_run_duration_seconds gauge",
+            f"{prefix}_last_run_duration_seconds{fmt_labels({})} "
+            f"{record['duration_seconds']}",
+            f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+            f"{prefix}_last_run_timestamp_seconds{fmt_labels({})} "
+            f"{self._timestamp.timestamp():.0f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Store the run according to the metric settings
+
+        Returns
+        -------
+        str or None
+            the path written to, None if metrics are disabled
+        """
+        from JMTracker.settings import settings
+        if not settings.get('metrics_enabled', True):
+            return None
+        path = settings['metrics_file']
+        folder = os.path.dirname(path)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        if settings.get('metrics_format', 'jsonl') == 'prometheus':
+            # Textfile collectors expect a full snapshot per file, so each
+            # job and label set gets its own file, replaced atomically
+            suffix = "_".join([self.job] + [str(v) for v in self.labels.values()])
+            path = os.path.splitext(path)[0] + f'_{suffix}.prom'
+            tmp = path + '.tmp'
+            with open(tmp, 'w') as handle:
+                handle.write(self.to_prometheus())
+            os.replace(tmp, path)
+        else:
+            with open(path, 'a') as handle:
+                handle.write(json.dumps(self.to_record(), default=str) + "\n")
+        logging.debug(f"Stored {self.job} metrics at {path}")
+        return path
+
+
+@contextmanager
+def metrics_run(job, span_prefix=None, **labels):
+    """Open a metrics run that is written out when the block ends. Any
+    exception marks the run as failed before propagating."""
+    run = MetricsRun(job, span_prefix=span_prefix, **labels)
+    try:
+        yield run
+    except BaseException:
+        run.status = 'error'
+        raise
+    finally:
+        try:
+            run.write()
+        except OSError as err:
+            logging.warning(f"Failed to store {job} metrics: {err}")
@@ -0,0 +1,181 @@
+import time
+import random
+import logging
+import datetime
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+
+"""
+Networking helpers shared by the scrappers
+"""
+
+
+class RateLimiter:
+
+    """Spaces out requests to the same host. Safe to share across threads."""
+
+    def __init__(self, rate=None):
+        """Initialize the limiter
+
+        Parameters
+        ----------
+        rate: float, optional
+            maximum requests per second per host. None or 0 disables it
+        """
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+        return
+
+    def wait(self, host):
+        """Block until a request to host is allowed"""
+        if self._interval == 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return
+
+
+class CircuitOpenError(requests.ConnectionError):
+
+    """Raised when a host failed too often and is not being contacted"""
+
+
+class PageParseError(requests.RequestException):
+
+    """Raised when a fetched page could not be parsed, so that callers
+    handle it as any other failed request"""
+
+
+class RetryPolicy:
+
+    """Decides which failures are retried and how long to wait in between"""
+
+    # Statuses worth retrying: rate limiting and server side errors
+    retry_statuses = (429, 500, 502, 503, 504)
+
+    def __init__(self, backoff=1.0, max_backoff=60.0, jitter=0.5):
+        """Initialize the policy
+
+        Parameters
+        ----------
+        backoff: float, optional
+            seconds to wait after the first failure, doubled for every
+            following failure
+        max_backoff: float, optional
+            maximum seconds to wait between attempts, also caps Retry-After
+        jitter: float, optional
+            fraction of the delay randomized to spread retries out
+        """
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        return
+
+    def is_retryable(self, response=None, error=None):
+        """Check if a response or exception is worth another attempt"""
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError,
+                                      requests.Timeout))
+        return response is not None and \
+            response.status_code in self.retry_statuses
+
+    @staticmethod
+    def retry_after(response):
+        """Seconds requested by a Retry-After header, None if absent"""
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After', None)
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(when.tzinfo)
+        return max(0.0, (when - now).total_seconds())
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before the next attempt
+
+        Parameters
+        ----------
+        attempt: int
+            number of failed attempts so far, starting at 1
+        response: requests.Response, optional
+            the failed response, if any, to honor Retry-After
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        requested = self.retry_after(response)
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_backoff))
+        return delay
+
+
+class CircuitBreaker:
+
+    """Stops contacting a host after repeated failures. After a cool down a
+    single trial request is let through; its result closes or reopens the
+    circuit."""
+
+    def __init__(self, threshold=5, reset_after=60.0):
+        """Initialize the breaker
+
+        Parameters
+        ----------
+        threshold: int, optional
+            consecutive failures that open the circuit of a host
+        reset_after: float, optional
+            seconds before a trial request is allowed on an open circuit
+        """
+        self._threshold = threshold
+        self._reset_after = reset_after
+        self._failures = {}
+        self._opened_at = {}
+        self._trial = set()
+        self._lock = threading.Lock()
+        return
+
+    def allow(self, host):
+        """Check if a request to host may be sent"""
+        with self._lock:
+            opened_at = self._opened_at.get(host, None)
+            if opened_at is None:
+                return True
+            if host in self._trial:
+                return False
+            if time.monotonic() - opened_at >= self._reset_after:
+                self._trial.add(host)
+                return True
+            return False
+
+    def record_success(self, host):
+        """Close the circuit of host"""
+        with self._lock:
+            self._failures[host] = 0
+            self._opened_at.pop(host, None)
+            self._trial.discard(host)
+        return
+
+    def record_failure(self, host):
+        """Count a failure, opening the circuit of host if needed"""
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if host in self._trial or failures >= self._threshold:
+                if host not in self._opened_at or host in self._trial:
+                    logging.warning(f"Too many failures from {host}, pausing "
+                                    f"requests for {self._reset_after:.0f}s")
+                self._opened_at[host] = time.monotonic()
+                self._trial.discard(host)
+        return
@@ -0,0 +1,178 @@
+import os
+import time
+import cProfile
+import logging
+import datetime
+import functools
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+"""
+Lightweight timing instrumentation for the tracker. Spans are cheap no-ops
+unless the profiler is enabled (see the --profile option of main.py).
+"""
+
+
+class Profiler:
+
+    """Collects timing spans and produces a per-session report"""
+
+    def __init__(self):
+        """Initialize a disabled profiler"""
+        self.enabled = False
+        self._durations = {}
+        self._lock = threading.Lock()
+        self._cprofile_top = 0
+        self._cprofile_active = False
+        self._profiles = []
+        self._started = None
+        return
+
+    def enable(self, cprofile_top=0):
+        """Start collecting spans
+
+        Parameters
+        ----------
+        cprofile_top: int, optional
+            if positive, run every GUI action under cProfile and keep the
+            dumps of this many slowest actions
+        """
+        self.enabled = True
+        self._cprofile_top = cprofile_top
+        self._started = datetime.datetime.now()
+        return
+
+    def record(self, name, duration):
+        """Store a single duration (in seconds) for span name"""
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration)
+        return
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block under the given span name"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator version of span"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def action(self, name):
+        """Decorator for top level GUI actions. Works as timed but also
+        keeps cProfile dumps of the slowest actions when requested."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                # cProfile cannot be nested, so only the outermost action
+                # running in the main thread is profiled
+                use_cprofile = (
+                    self._cprofile_top > 0 and not self._cprofile_active and
+                    threading.current_thread() is threading.main_thread()
+                )
+                if not use_cprofile:
+                    with self.span(f'action.{name}'):
+                        return func(*args, **kwargs)
+
+                self._cprofile_active = True
+                prof = cProfile.Profile()
+                start = time.perf_counter()
+                try:
+                    prof.enable()
+                    return func(*args, **kwargs)
+                finally:
+                    prof.disable()
+                    duration = time.perf_counter() - start
+                    self._cprofile_active = False
+                    self.record(f'action.{name}', duration)
+                    self._keep_profile(name, duration, prof)
+            return wrapper
+        return decorator
+
+    def _keep_profile(self, name, duration, prof):
+        """Keep only the slowest cProfile runs"""
+        with self._lock:
+            self._profiles.append((duration, name, prof))
+            self._profiles.sort(key=lambda x: x[0], reverse=True)
+            del self._profiles[self._cprofile_top:]
+        return
+
+    def report(self):
+        """Produce a text report of call counts, cumulative and p95 durations
+
+        Returns
+        -------
+        str
+            the formatted report, sorted by cumulative time
+        """
+        with self._lock:
+            durations = {k: np.array(v) for k, v in self._durations.items()}
+
+        rows = []
+        for name, values in durations.items():
+            rows.append((name, values.size, values.sum(), values.mean(),
+                         np.percentile(values, 95), values.max()))
+        rows.sort(key=lambda x: x[2], reverse=True)
+
+        width = max([len(x[0]) for x in rows] + [len('span')])
+        lines = [
+            f"Profile report for session started at {self._started}",
+            f"{'span':<{width}} {'calls':>7} {'total(s)':>10} "
+            f"{'mean(ms)':>10} {'p95(ms)':>10} {'max(ms)':>10}"
+        ]
+        for name, calls, total, mean, p95, top in rows:
+            lines.append(
+                f"{name:<{width}} {calls:>7d} {total:>10.3f} "
+                f"{mean * 1e3:>10.2f} {p95 * 1e3:>10.2f} {top * 1e3:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, output_directory):
+        """Store the session report and the kept cProfile dumps
+
+        Parameters
+        ----------
+        output_directory: str
+            folder where the report is written
+
+        Returns
+        -------
+        str
+            path to the written report
+        """
+        stamp = self._started.strftime('%Y%m%d_%H%M%S')
+        if not os.path.isdir(output_directory):
+            os.makedirs(output_directory)
+        path = os.path.join(output_directory, f'profile_report_{stamp}.txt')
+        with open(path, 'w') as handle:
+            handle.write(self.report() + "\n")
+        logging.info(f"Profile report stored at {path}")
+
+        for n, (duration, name, prof) in enumerate(self._profiles):
+            dump = os.path.join(output_directory,
+                                f'profile_{stamp}_{n + 1:d}_{name}.prof')
+            prof.dump_stats(dump)
+            logging.info(f"cProfile dump for {name} ({duration:.2f}s) "
+                         f"stored at {dump}")
+        return path
+
+
+# Shared profiler for the whole session
+profiler = Profiler()
@@ -0,0 +1,267 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+"""
+A local http stand-in that serves recorded pages, so the scrappers can be
+exercised and timed without hitting the real websites, and a recorder that
+stores the pages a scrapper fetches as a fixture archive for it.
+
+A fixture archive is a folder with the page bodies and an exchanges.json
+index mapping each url path (with query) to its status, content type and
+body file.
+"""
+
+_archive_index = 'exchanges.json'
+
+
+def _url_path(url):
+    """Path and query of url, as seen by the server"""
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    if parsed.query:
+        path += '?' + parsed.query
+    return path
+
+
+class FixtureRecorder:
+
+    """Stores the responses received by a scrapper in a fixture archive.
+    Safe to share across threads."""
+
+    def __init__(self, folder):
+        """Initialize the recorder, adding to the archive in folder if any
+
+        Parameters
+        ----------
+        folder: str
+            the fixture archive folder
+        """
+        self._folder = folder
+        self._index_url = os.path.join(folder, _archive_index)
+        self._lock = threading.Lock()
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        self._index = {'start': None, 'exchanges': {}}
+        if os.path.isfile(self._index_url):
+            with open(self._index_url, 'r') as handle:
+                self._index = json.load(handle)
+        return
+
+    def record(self, url, response):
+        """Store the response received for url
+
+        Parameters
+        ----------
+        url: str
+            the requested url
+        response: requests.Response
+            the final response handed to the scrapper
+        """
+        path = _url_path(url)
+        name = hashlib.sha1(path.encode('utf-8')).hexdigest()
+        with self._lock:
+            with open(os.path.join(self._folder, name), 'wb') as handle:
+                handle.write(response.content)
+            if self._index['start'] is None:
+                self._index['start'] = path
+            self._index['exchanges'][path] = {
+                'status': response.status_code,
+                'content_type': response.headers.get('Content-Type', None),
+                'file': name,
+            }
+            tmp = self._index_url + '.tmp'
+            with open(tmp, 'w') as handle:
+                json.dump(self._index, handle, indent=1)
+            os.replace(tmp, self._index_url)
+        return
+
+
+def load_fixtures(folder):
+    """Read a fixture archive, or every file in folder at its relative path
+    if it is not one
+
+    Parameters
+    ----------
+    folder: str
+        the fixture folder
+
+    Returns
+    -------
+    pages: dict
+        maps each url path to the page body (bytes) or a tuple (status,
+        headers, body), as taken by ReplayServer
+    start: str or None
+        path of the first recorded page, usually the scrapper base url.
+        None if folder is not an archive
+    """
+    if not os.path.isfile(os.path.join(folder, _archive_index)):
+        pages = {}
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, folder).replace(os.sep, '/')
+                with open(path, 'rb') as handle:
+                    pages['/' + rel] = handle.read()
+        return pages, None
+
+    with open(os.path.join(folder, _archive_index), 'r') as handle:
+        index = json.load(handle)
+    pages = {}
+    for path, exchange in index['exchanges'].items():
+        with open(os.path.join(folder, exchange['file']), 'rb') as handle:
+            body = handle.read()
+        headers = {}
+        if exchange['content_type'] is not None:
+            headers['Content-Type'] = exchange['content_type']
+        pages[path] = (exchange['status'], headers, body)
+    return pages, index['start']
+
+
+class _HTTPServer(ThreadingHTTPServer):
+
+    # The default backlog of 5 drops connections from concurrent scrapes
+    request_queue_size = 128
+
+
+class ReplayServer:
+
+    """Serves a set of recorded pages from a local port"""
+
+    def __init__(self, pages, host='127.0.0.1', port=0, latency=0.0,
+                 error_rate=0.0, error_status=503, seed=None):
+        """Initialize the server
+
+        Parameters
+        ----------
+        pages: dict
+            maps a url path (with query, if any) to the page body (bytes)
+            or to a tuple (status, headers, body)
+        host: str, optional
+            interface to listen to
+        port: int, optional
+            port to listen to, 0 picks a free one
+        latency: float or tuple, optional
+            seconds to wait before answering, or a (min, max) range to draw
+            them from
+        error_rate: float, optional
+            fraction of requests answered with error_status instead
+        error_status: int, optional
+            status of the injected errors
+        seed: int, optional
+            seed for the latency and error draws
+        """
+        self._pages = pages
+        self._host = host
+        self._port = port
+        self._latency = latency
+        self._error_rate = error_rate
+        self._error_status = error_status
+        self._random = random.Random(seed)
+        # guards the draws and the counters
+        self._random_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.requests = 0
+        self.errors = 0
+        return
+
+    @classmethod
+    def from_directory(cls, folder, **kwargs):
+        """Serve the fixtures in folder, see load_fixtures"""
+        pages, _ = load_fixtures(folder)
+        return cls(pages, **kwargs)
+
+    @property
+    def url(self):
+        """Root url of the running server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _lookup(self, path):
+        """Return status, headers and body for a request path"""
+        page = self._pages.get(path, None)
+        if page is None:
+            return 404, {}, b'not recorded'
+        if isinstance(page, bytes):
+            page = (200, {'Content-Type': 'text/html; charset=utf-8'}, page)
+        status, headers, body = page
+        if status == 200 and 'ETag' not in headers:
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            headers = {**headers, 'ETag': etag}
+        return status, headers, body
+
+    def _faults(self):
+        """Count a request, and draw its latency and whether to inject an
+        error"""
+        with self._random_lock:
+            self.requests += 1
+            latency = self._latency
+            if isinstance(latency, tuple):
+                latency = self._random.uniform(*latency)
+            error = self._random.random() < self._error_rate
+            if error:
+                self.errors += 1
+        return latency, error
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                latency, error = server._faults()
+                if latency > 0:
+                    time.sleep(latency)
+                if error:
+                    status = server._error_status
+                    headers = {'Retry-After': '0'}
+                    body = b'injected error'
+                else:
+                    status, headers, body = server._lookup(self.path)
+                etag = headers.get('ETag', None)
+                if status == 200 and etag is not None and \
+                        self.headers.get('If-None-Match', None) == etag:
+                    status, body = 304, b''
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug("replay: " + format % args)
+
+        return Handler
+
+    def start(self):
+        """Start serving on a background thread"""
+        self._server = _HTTPServer((self._host, self._port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        logging.info(f"Replay server listening on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        return
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+        return False
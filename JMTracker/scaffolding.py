@@ -0,0 +1,210 @@
+import os
+import re
+import errno
+import shutil
+import string
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+Application folders created from a template folder. Files are cloned rather
+than copied when the file system supports it, so creating a folder takes the
+same time whatever the size of the template.
+"""
+
+try:
+    import fcntl
+    # Linux ioctl sharing the blocks of a file (btrfs, XFS, bcachefs...)
+    FICLONE = 0x40049409
+except ImportError:
+    fcntl = None
+
+
+class _PostingFields(dict):
+    """Posting fields for name templates, blank if missing"""
+
+    def __missing__(self, key):
+        return ''
+
+
+def render_name(template, posting=None):
+    """Fill a file or folder name template with the fields of a posting
+
+    Parameters
+    ----------
+    template: str
+        a name using fields as in '{institution} - {title}'
+    posting: Series or dict, optional
+        the posting. Fields are left blank without it
+
+    Returns
+    -------
+    str
+        a name safe to use as a file name
+    """
+    fields = _PostingFields()
+    if posting is not None:
+        for key, value in dict(posting).items():
+            fields[key] = '' if not isinstance(value, str) and \
+                (value is None or value != value) else str(value)
+    try:
+        name = string.Formatter().vformat(template, (), fields)
+    except (ValueError, IndexError):
+        logging.warning(f"Couldn't fill the name template {template}")
+        name = template
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', name)
+    name = re.sub(r'\s+', ' ', name).strip(' .')
+    return name[:120]
+
+
+class Scaffolder:
+
+    """Creates application folders from a template folder. Names in the
+    template folder may use posting fields, as in 'cover_{institution}.docx'.
+    """
+
+    def __init__(self, base, output_dir, link_mode='auto', workers=8):
+        """Initialize the scaffolder
+
+        Parameters
+        ----------
+        base: str
+            the template folder
+        output_dir: str
+            folder in which the application folders are created
+        link_mode: str, optional
+            'auto' clones files when the file system supports it and copies
+            them otherwise, 'hardlink' links them to the template (edits
+            change the template too) and 'copy' always copies
+        workers: int, optional
+            files created concurrently
+        """
+        if link_mode not in ['auto', 'hardlink', 'copy']:
+            raise ValueError(f"Unknown scaffolding link mode {link_mode}")
+        self.base = base
+        self.output_dir = output_dir
+        self._link_mode = link_mode
+        self._workers = max(1, int(workers))
+        self._can_clone = fcntl is not None and link_mode == 'auto'
+        self._lock = threading.Lock()
+        # Template folders and files, relative to base
+        self._folders = []
+        self._files = []
+        for root, folders, files in os.walk(base):
+            relative = os.path.relpath(root, base)
+            for folder in folders:
+                self._folders.append(os.path.normpath(
+                    os.path.join(relative, folder)))
+            for name in files:
+                self._files.append(os.path.normpath(
+                    os.path.join(relative, name)))
+        return
+
+    def folder_url(self, name):
+        return os.path.join(self.output_dir, name)
+
+    def _clone(self, source, target):
+        """Share the blocks of source with a new file target. Returns False
+        if the file system can't"""
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError as err:
+                if err.errno not in [errno.EOPNOTSUPP, errno.ENOTTY,
+                                     errno.EXDEV, errno.EINVAL,
+                                     errno.ENOSYS]:
+                    raise
+                with self._lock:
+                    self._can_clone = False
+                return False
+        shutil.copystat(source, target)
+        return True
+
+    def _place(self, source, target):
+        """Create target from the template file source"""
+        if self._link_mode == 'hardlink':
+            try:
+                os.link(source, target)
+                return
+            except OSError:
+                pass
+        elif self._can_clone and self._clone(source, target):
+            return
+        shutil.copy2(source, target)
+        return
+
+    @staticmethod
+    def _target(relative, posting):
+        """Path of a template folder or file in an application folder"""
+        if '{' not in relative:
+            return relative
+        return os.path.join(*[render_name(x, posting) if '{' in x else x
+                              for x in relative.split(os.sep)])
+
+    def _plan(self, name, posting):
+        """Folders and (source, target) files of one application folder"""
+        url = self.folder_url(name)
+        folders = [url] + [os.path.join(url, self._target(x, posting))
+                           for x in self._folders]
+        files = [(os.path.join(self.base, x),
+                  os.path.join(url, self._target(x, posting)))
+                 for x in self._files]
+        return folders, files
+
+    def create(self, name, posting=None):
+        """Create an application folder
+
+        Parameters
+        ----------
+        name: str
+            name of the folder in output_dir
+        posting: Series, optional
+            the posting filling the template names
+
+        Returns
+        -------
+        str
+            path to the new folder
+
+        Raises
+        ------
+        FileExistsError
+            if the folder already exists
+        """
+        url = self.folder_url(name)
+        if os.path.exists(url):
+            raise FileExistsError(url)
+        return self.create_many([(name, posting)])[0]
+
+    def create_many(self, folders):
+        """Create several application folders, skipping existing ones
+
+        Parameters
+        ----------
+        folders: list
+            (name, posting) pairs
+
+        Returns
+        -------
+        list
+            path to each new folder
+        """
+        created = []
+        files = []
+        for name, posting in folders:
+            url = self.folder_url(name)
+            if name == '' or os.path.exists(url):
+                logging.info(f"Application folder {url} already exists")
+                continue
+            new_folders, new_files = self._plan(name, posting)
+            for folder in new_folders:
+                os.makedirs(folder, exist_ok=True)
+            files += new_files
+            created.append(url)
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            list(executor.map(lambda x: self._place(*x), files))
+        logging.info(f"Created {len(created):d} application folders with "
+                     f"{len(files):d} files")
+        return created
@@ -1,21 +1,51 @@
 import re
 import os
+import abc
+import io
+import json
+import datetime
 import logging
 import time
-from urllib.parse import urljoin
+import threading
+import queue
+import multiprocessing
+from concurrent.futures import (
+    ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+)
+from urllib.parse import urljoin, urlparse
 import PySimpleGUI as sg
 from bs4 import BeautifulSoup
 from lxml import html
 import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from JMTracker.metrics import metrics_run
+from JMTracker.network import (
+    RateLimiter, RetryPolicy, CircuitBreaker, CircuitOpenError,
+    PageParseError
+)
+from JMTracker.http_cache import HTTPCache
 
 """
 This script contains the scrapping classes for different websites
 """
 
+_whitespace = re.compile(r'\s+')
 
-class Scrapper:
+# Scrapper subclasses by the origin they download, see Scrapper.origin
+scrapper_registry = {}
+
+
+class Scrapper(abc.ABC):
+
+    # Origin of the source in input_option_settings. Subclasses setting it
+    # are added to scrapper_registry
+    origin = None
+    # Name of the file get_postings stores in the input folder
+    output_file_name = None
+    # Whether the constructor takes the known_ids of for_update
+    incremental = False
 
     _agents = [
         "Mozilla/5.0 (X11; Fedora; Linux x86_64; rv:46.0) Gecko/20100101 Firefox/46.0",
@@ -24,7 +54,15 @@ class Scrapper:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/50.0.2661.102 Safari/537.36"
     ]
 
-    def __init__(self, base_url, max_errors=5):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.origin is not None:
+            scrapper_registry[cls.origin] = cls
+        return
+
+    def __init__(self, base_url, max_errors=5, concurrency=None,
+                 rate_limit=None, cache=None, parse_mode=None, recorder=None,
+                 progress=None):
         """Initialize a scrapper
 
         Parameters
@@ -32,22 +70,187 @@ class Scrapper:
         base_url: str
             starting point for scrapping
         max_errors: int, optional
-            maximum number of errors before declaring failure
+            maximum number of failed attempts per page before giving up
+        concurrency: int, optional
+            number of pages fetched in parallel by get_pages. Defaults to
+            the scrape_concurrency setting
+        rate_limit: float, optional
+            maximum requests per second to a single host. Defaults to the
+            scrape_rate_limit setting
+        cache: HTTPCache or bool, optional
+            response cache used for conditional requests. Defaults to the
+            shared cache in the storage folder if http_cache_enabled is set,
+            False disables caching
+        parse_mode: str, optional
+            'fast' parses each page once with lxml and exposes no soup,
+            'soup' goes through BeautifulSoup as before. Defaults to the
+            scrape_parse_mode setting
+        recorder: FixtureRecorder, optional
+            stores every page handed out, to replay them later
+        progress: function, optional
+            called by get_postings with the stage and a detail string as the
+            scrape goes. It may raise background.Cancelled to stop it
         """
+        from JMTracker.settings import settings
+        if concurrency is None:
+            concurrency = settings['scrape_concurrency']
+        if rate_limit is None:
+            rate_limit = settings['scrape_rate_limit']
+        if cache is None and settings['http_cache_enabled']:
+            cache = HTTPCache(
+                os.path.join(settings['storage_directory'], 'http_cache'),
+                max_bytes=settings['http_cache_max_mb'] * 2**20
+            )
+        if parse_mode is None:
+            parse_mode = settings['scrape_parse_mode']
+        if parse_mode not in ['fast', 'soup']:
+            raise ValueError(f"Unknown parse mode {parse_mode}")
+        self._cache = cache if cache else None
+        self._parse_mode = parse_mode
+        self._recorder = recorder
+        self._progress = progress
         self._base_url = base_url
         self._agent_index = 1
-        self._max_errors = 5
-        self._session = requests.Session()
+        self._max_errors = max_errors
+        self._timeout = settings['scrape_timeout']
+        self._retry = RetryPolicy(backoff=settings['scrape_backoff'],
+                                  max_backoff=settings['scrape_max_backoff'])
+        self._breaker = CircuitBreaker(
+            threshold=settings['scrape_breaker_threshold'],
+            reset_after=settings['scrape_breaker_reset']
+        )
+        self._concurrency = max(1, int(concurrency))
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._session_lock = threading.Lock()
+        self._session = self._new_session()
         self._header = {'User-Agent': self._agents[self._agent_index]}
+        # metrics run of the ongoing scrape, if any
+        self._metrics = None
+        # file stored by the last get_postings, if any
+        self.stored_url = None
+        return
+
+    @classmethod
+    def for_update(cls, source_setting=None, known_ids=None, **kwargs):
+        """An instance set up to refresh the stored postings of its origin
+
+        Parameters
+        ----------
+        source_setting: dict, optional
+            the settings of the source. Its download_url, if any, is used as
+            the starting point. Defaults to the input option settings of the
+            scrapper origin
+        known_ids: iterable, optional
+            origin_id of the postings of the origin already stored. Passed
+            on to incremental scrappers, ignored by the others
+        kwargs: dict
+            passed on to the constructor
+
+        Returns
+        -------
+        Scrapper
+        """
+        if source_setting is None:
+            from JMTracker.settings import input_option_settings
+            source_setting = next(
+                (x for x in input_option_settings if x['origin'] == cls.origin),
+                {}
+            )
+        if cls.incremental:
+            kwargs['known_ids'] = known_ids
+        return cls(base_url=source_setting.get('download_url', None), **kwargs)
+
+    @property
+    def output_url(self):
+        """Path to the file get_postings stores"""
+        from JMTracker.settings import settings
+        return os.path.join(settings['input_directory'], self.output_file_name)
+
+    def _new_session(self):
+        """A session whose connection pool matches the fetch concurrency"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._concurrency,
+                              pool_maxsize=self._concurrency)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _record_request(self, page, latency):
+        """Record an http exchange into the ongoing metrics run"""
+        if self._metrics is None:
+            return
+        self._metrics.inc('http_requests')
+        self._metrics.inc('http_responses', status=page.status_code)
+        self._metrics.inc('bytes_downloaded', len(page.content))
+        self._metrics.observe('http_latency_seconds', latency)
         return
 
+    def _fetch(self, url, redirect=False, headers=None):
+        """GET url, revalidating against the response cache if possible.
+        Requests the caller made conditional itself bypass the cache, so
+        their 304 answers reach the caller."""
+        headers = {**self._header, **(headers or {})}
+        cache = self._cache
+        if cache is not None and any(
+                x in headers for x in ['If-None-Match', 'If-Modified-Since']):
+            cache = None
+        if cache is not None:
+            headers = {**cache.conditional_headers(url), **headers}
+        start = time.perf_counter()
+        page = self._session.get(url, headers=headers, timeout=self._timeout,
+                                 allow_redirects=redirect)
+        self._record_request(page, time.perf_counter() - start)
+        if cache is None:
+            return page
+
+        if page.status_code == 304:
+            cached = cache.response(url, page)
+            if cached is not None:
+                if self._metrics is not None:
+                    self._metrics.inc('http_cache_hits')
+                return cached
+            # Evicted in the meantime, ask for the full page
+            start = time.perf_counter()
+            page = self._session.get(url, headers=self._header,
+                                     timeout=self._timeout,
+                                     allow_redirects=redirect)
+            self._record_request(page, time.perf_counter() - start)
+        if page.status_code == 200:
+            cache.store(url, page)
+        return page
+
     def clean_text(self, txt, lower=True):
-        txt = BeautifulSoup(txt, "lxml").text
-        txt = " ".join(txt.split())
+        if self._parse_mode == 'fast':
+            # lxml already decoded entities and dropped the markup
+            txt = _whitespace.sub(' ', txt).strip()
+        else:
+            txt = BeautifulSoup(txt, "lxml").text
+            txt = " ".join(txt.split())
         if lower:
             txt = txt.lower()
         return txt
 
+    def parse_page(self, text):
+        """Parse a page according to the parse mode
+
+        Parameters
+        ----------
+        text: str
+            the page content
+
+        Returns
+        -------
+        tree: XMLTree
+            tree representation of the website
+        soup: BeautifulSoup object or None
+            a beautification of the content, None in fast mode
+        """
+        if self._parse_mode == 'fast':
+            return html.fromstring(text), None
+        soup = BeautifulSoup(text, "lxml")
+        tree = html.fromstring(soup.prettify())
+        return tree, soup
+
     def get_page(self, url=None, tree_only=False, redirect=False):
         """
         Fetches a page from url.
@@ -66,134 +269,409 @@ class Scrapper:
         -------
         tree: XMLTree
             tree representation of the website
-        soup: BeautifulSoup object
-            a beautification of the content
+        soup: BeautifulSoup object or None
+            a beautification of the content, None in fast parse mode
         page: request object
             the session object
+
+        Raises
+        ------
+        requests.RequestException
+            if the page could not be fetched or parsed after max_errors
+            attempts, the answer is not retryable, or the host circuit is
+            open. Parse failures raise a network.PageParseError
         """
+        page, tree, soup = self._request(url, redirect, parse=True)
+        if tree_only:
+            return tree
+        else:
+            return (tree, soup, page)
+        return
+
+    def get_raw(self, url=None, redirect=False, headers=None):
+        """Fetch a page from url without parsing it, e.g. to parse it in
+        another process. Same retries and errors as get_page.
+
+        Parameters
+        ----------
+        headers: dict, optional
+            extra request headers, e.g. to make the request conditional
+
+        Returns
+        -------
+        page: request object
+            the response
+        """
+        page, _, _ = self._request(url, redirect, parse=False,
+                                   headers=headers)
+        return page
+
+    def _request(self, url, redirect, parse, headers=None):
+        """Fetch url with retries. Unparseable pages are retried too if
+        parse is set. Returns the response, tree and soup."""
         if url is None:
             url = self._base_url
+        host = urlparse(url).netloc
+        tree = None
+        soup = None
         err_count = 0
-        while err_count < self._max_errors:
-            page = self._session.get(url,
-                                     headers=self._header,
-                                     allow_redirects=redirect)
+        while True:
+            if not self._breaker.allow(host):
+                raise CircuitOpenError(f"Too many failures from {host}, "
+                                       "try again later")
+            self._rate_limiter.wait(host)
+            page = None
+            error = None
             try:
-                soup = BeautifulSoup(page.text, "lxml")
-                tree = html.fromstring(soup.prettify())
-            except Exception:
-                err_count += 1
-                self._session.close()
-                self._session = requests.Session()
+                page = self._fetch(url, redirect, headers)
+                if self._retry.is_retryable(response=page):
+                    error = requests.HTTPError(
+                        f"{page.status_code} answer for {url}", response=page)
+                elif parse:
+                    tree, soup = self.parse_page(page.text)
+            except requests.RequestException as err:
+                if not self._retry.is_retryable(error=err):
+                    raise
+                error = err
+            except Exception as err:
+                # The page could not be parsed, try again with a new agent
+                error = PageParseError(f"Couldn't parse {url}: {err}",
+                                       response=page)
+                error.__cause__ = err
+
+            if error is None:
+                self._breaker.record_success(host)
+                break
+
+            self._breaker.record_failure(host)
+            err_count += 1
+            if err_count >= self._max_errors:
+                raise error
+            if self._metrics is not None:
+                self._metrics.inc('http_retries')
+            with self._session_lock:
+                # Other threads may still be using the old session, so
+                # it is left for the garbage collector to close
+                self._session = self._new_session()
                 self._agent_index = self._agent_index + \
                     1 if (self._agent_index + 1 < len(self._agents)) else 0
                 self._header = {
                     'User-Agent': self._agents[self._agent_index]}
-                print("\t Warning: failed to get an answer, changing agent")
-                time.sleep(60)
-            else:
-                break
-        if tree_only:
-            return tree
-        else:
-            return (tree, soup, page)
-        return
+            delay = self._retry.delay(err_count, page)
+            logging.warning(f"Failed to get {url} ({error}), changing agent "
+                            f"and retrying in {delay:.1f}s")
+            time.sleep(delay)
+        if self._recorder is not None:
+            self._recorder.record(url, page)
+        return page, tree, soup
 
+    def get_postings(self):
+        """Get the current postings of the origin and store them to the
+        input folder, at output_url
 
-class AJOScrapper(Scrapper):
+        Returns
+        -------
+        status: bool
+            indicates if scrapping was successfull
+        message: str
+            indicate failure source, or a note for the user
 
-    """A scrapper for AJO postings"""
+        """
+        with metrics_run('scrape',
+                         span_prefix=f'{type(self).__name__}.get_postings',
+                         origin=self.origin) as run:
+            self._metrics = run
+            try:
+                success, message = self._scrape_postings(run)
+            finally:
+                self._metrics = None
+                if self._cache is not None:
+                    self._cache.flush()
+            if not success:
+                run.status = 'failed'
+        return success, message
+
+    @abc.abstractmethod
+    def _scrape_postings(self, run):
+        """Core of get_postings, recording metrics into run. Implemented by
+        each scrapper.
+
+        Returns
+        -------
+        status: bool
+            indicates if scrapping was successfull
+        message: str
+            indicate failure source, or a note for the user
+        """
 
-    def __init__(self):
-        """Initialize the object"""
-        base_url = 'https://academicjobsonline.org/ajo/econ'
-        Scrapper.__init__(self, base_url)
+    def _store_output(self, content):
+        """Store a downloaded file at output_url"""
+        logging.info(f"Storing {self.origin} file to input")
+        with open(self.output_url, 'wb') as handle:
+            handle.write(content)
+        self.stored_url = self.output_url
         return
 
-    def get_postings(self):
-        """Get current postings from AJO and store to file
+    def _stage(self, run, name, detail=''):
+        """A metrics stage of run, also reported as progress"""
+        if self._progress is not None:
+            self._progress(name, detail)
+        return run.stage(name)
 
+    @classmethod
+    def scrape_for_user(cls, progress=None, known_ids=None):
+        """Create an instance and scrape, with a message for the user
+
+        Parameters
+        ----------
+        progress: function, optional
+            as in Scrapper
+        known_ids: iterable, optional
+            as in for_update
 
         Returns
         -------
         status: bool
             indicates if scrapping was successfull
         message: str
-            indicate failure source
+            the outcome for the user
+        """
+        scrapper = cls.for_update(known_ids=known_ids, progress=progress)
+        try:
+            success, message = scrapper.get_postings()
+        except requests.RequestException as err:
+            success = False
+            message = f"Failed to download the {cls.origin} postings:\n{err}"
+        if success and len(message) == 0:
+            message = ("Done processing. The data should be in the input folder"
+                       f" and called {cls.output_file_name}\n"
+                       "Please review it and include it as with the other sources.")
+        return success, message
+
+    @classmethod
+    def gui_scrape(cls, window_location=(None, None)):
+        """Create an instance and scrape with user messages.
 
+        Returns
+        -------
+        None
         """
-        tree, soup, page = self.get_page()
+        sg.popup(f"Downloading posting data from {cls.origin}",
+                 location=window_location)
+        _, message = cls.scrape_for_user()
+        sg.popup(message, location=window_location)
+
+        return
 
-        # Traverse list to get positions
-        dls = tree.xpath('//dl')
-        links = []
-        for item in dls:
-            links.append(urljoin(
-                self._base_url,
-                item.xpath('dt/ol/li/a')[0].get('href')
-            ))
+    def get_pages(self, urls, tree_only=False, redirect=False):
+        """Fetch several pages in parallel, bounded by the scrapper
+        concurrency.
+
+        Parameters
+        ----------
+        urls: list of str
+            the pages to fetch
+        tree_only: bool, optional
+            as in get_page
+        redirect: bool, optional
+            follow page redirections
+
+        Returns
+        -------
+        generator
+            the get_page result of each url, in the same order as urls
+        """
+        def fetch(url):
+            return self.get_page(url, tree_only=tree_only, redirect=redirect)
+
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+            # map hands results back in submission order
+            for result in executor.map(fetch, urls):
+                yield result
+        return
+
+
+class PageFetcher(Scrapper):
+
+    """Fetches pages with the retries, rate limits and cache of a Scrapper,
+    for callers with no postings to scrape such as the snapshots"""
+
+    def _scrape_postings(self, run):
+        return False, "A PageFetcher has no postings to scrape"
+
+
+class AJOScrapper(Scrapper):
+
+    """A scrapper for AJO postings"""
+
+    origin = 'AJO'
+    output_file_name = 'latest_ajo_postings.csv'
+    incremental = True
+
+    # Below this many pages starting the parse processes costs more than
+    # parsing in the fetch threads
+    _min_pool_pages = 100
+
+    def __init__(self, base_url=None, known_ids=None, full_refresh_days=None,
+                 parse_workers=None, **kwargs):
+        """Initialize the object
+
+        Parameters
+        ----------
+        base_url: str, optional
+            listing page, defaults to the AJO economics listings
+        known_ids: iterable of int, optional
+            AJO ids already in the postings store, as given by the Tracker. Their detail pages are
+            not fetched unless a full refresh is due
+        full_refresh_days: int, optional
+            days between full refreshes that refetch known postings to pick
+            up edits. Defaults to the ajo_full_refresh_days setting
+        parse_workers: int, optional
+            processes parsing posting pages while they are being fetched.
+            Defaults to the scrape_parse_workers setting, 0 parses in the
+            fetch threads
+        kwargs: dict
+            passed on to Scrapper
+        """
+        from JMTracker.settings import settings
+        if base_url is None:
+            base_url = 'https://academicjobsonline.org/ajo/econ'
+        if full_refresh_days is None:
+            full_refresh_days = settings['ajo_full_refresh_days']
+        if parse_workers is None:
+            parse_workers = settings['scrape_parse_workers']
+        if parse_workers is None:
+            # A single parse process on a single core only adds overhead
+            cores = os.cpu_count() or 1
+            parse_workers = cores if cores > 1 else 0
+        Scrapper.__init__(self, base_url, **kwargs)
+        self._known_ids = set() if known_ids is None else \
+            set(int(x) for x in known_ids)
+        self._full_refresh_days = full_refresh_days
+        self._parse_workers = max(0, int(parse_workers))
+        self._state_url = os.path.join(settings['storage_directory'],
+                                       'ajo_scrape_state.json')
+        self._checkpoint_url = os.path.join(settings['storage_directory'],
+                                            'ajo_scrape_checkpoint.jsonl')
+        return
+
+    @staticmethod
+    def id_from_link(link):
+        """The AJO id of a posting link"""
+        return int(re.sub(r'[^0-9]', '', link.split('/')[-1]))
+
+    def _full_refresh_due(self):
+        """Check if known postings should be refetched this time"""
+        if len(self._known_ids) == 0:
+            return True
+        if not os.path.isfile(self._state_url):
+            return True
+        with open(self._state_url, 'r') as handle:
+            state = json.load(handle)
+        last = datetime.date.fromisoformat(state['last_full_refresh'])
+        age = (datetime.date.today() - last).days
+        return age >= self._full_refresh_days
+
+    def _store_full_refresh(self):
+        """Remember when the last full refresh happened"""
+        state = {'last_full_refresh': datetime.date.today().isoformat()}
+        with open(self._state_url, 'w') as handle:
+            json.dump(state, handle)
+        return
+
+    def _load_checkpoint(self, links):
+        """Postings already scrapped by an interrupted run
+
+        Parameters
+        ----------
+        links: list of str
+            the posting links in the current listing. Checkpointed postings
+            no longer listed are dropped
+
+        Returns
+        -------
+        dict
+            maps an AJO id to its posting data
+        """
+        records = {}
+        if not os.path.isfile(self._checkpoint_url):
+            return records
+        listed = set(self.id_from_link(x) for x in links)
+        with open(self._checkpoint_url, 'r') as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # a partially written last line
+                    continue
+                if record['origin_id'] in listed:
+                    records[record['origin_id']] = record
+        return records
+
+    def _scrape_postings(self, run):
+        """Core of get_postings, recording metrics into run
+
+        Every scrapped posting is appended to a checkpoint file in storage as
+        soon as it is parsed. If the run is interrupted, the next one resumes
+        from it and only fetches the missing postings. The checkpoint is
+        removed once the postings are stored.
+        """
+        with self._stage(run, 'listing'):
+            tree, soup, page = self.get_page()
+
+            # Traverse list to get positions
+            dls = tree.xpath('//dl')
+            links = []
+            for item in dls:
+                links.append(urljoin(
+                    self._base_url,
+                    item.xpath('dt/ol/li/a')[0].get('href')
+                ))
+        run.inc('listings_found', len(links))
+
+        # Skip the postings we already have unless a full refresh is due
+        full_refresh = self._full_refresh_due()
+        if not full_refresh:
+            num_listings = len(links)
+            links = [x for x in links if
+                     self.id_from_link(x) not in self._known_ids]
+            num_skipped = num_listings - len(links)
+            run.inc('listings_skipped_known', num_skipped)
+            logging.info(f"Skipping {num_skipped:d} known AJO postings")
+            if len(links) == 0:
+                return True, 'No new AJO postings since the last update.'
+
+        # Resume from an interrupted run, if any
+        records = self._load_checkpoint(links)
+        if len(records) > 0:
+            logging.info(f"Resuming AJO scrape, {len(records):d} postings "
+                         "already checkpointed")
+            run.inc('postings_resumed', len(records))
+        pending = [x for x in links if self.id_from_link(x) not in records]
 
         # Now iterate over links to get details
         success = True
         message = ''
-        data = []
-        for link in links:
-            tree, soup, page = self.get_page(link)
-            data_row = {}
-            title = self.clean_text(tree.xpath('//h2')[0].text_content(), lower=False)
-            splt = title.split(',')
-            institution = splt[0]
-            department = ','.join(splt[1:])
-            data_row['institution'] = institution
-            data_row['department'] = department
-            data_row['url'] = link
-            # Get the full description
-            desc = self.clean_text(tree.xpath('//table')[1].text_content(), lower=False)
-            data_row['full_text'] = desc
-
-            # Split the id
-            link_id = int(link.split('/')[-1].replace(r'[^0-9]', ''))
-            data_row['origin_id'] = link_id
-
-
-            table = tree.xpath('//table[@class="nobr"]')[0]
-            rows = table.xpath('tr')
-            for row in rows:
-                row_text = self.clean_text(row.text_content(), lower=False)
-                key = row_text.split(':')
-                value = ':'.join(key[1:])
-                value = value.strip()
-                key = key[0].strip().lower()
-                if ' id' in key:
-                    continue
-                elif 'location' in key:
-                    key = 'location'
-                    value = value.split('[ map ]')[0].strip()
-                elif 'deadline' in key:
-                    key = 'deadline'
-                    value = value.lower()
-                    group = re.findall(
-                        r'\d{4}/\d{2}/\d{2}',
-                        value
-                    )
-                    if len(group) == 0:
-                        value = np.nan
-                    else:
-                        value = group[0]
-                elif 'description' in key:
-                    continue
-                elif 'subject' in key:
-                    key = 'keywords'
-                elif 'title' in key:
-                    key = 'title'
-                elif 'type' in key:
-                    key = 'division'
-
-                data_row[key] = value
-            data_row = pd.Series(data_row).to_frame().T
-            data.append(data_row)
-
-        data = pd.concat(data, ignore_index=True, axis=0)
+        with self._stage(run, 'details'):
+            start = time.perf_counter()
+            with open(self._checkpoint_url, 'a') as handle:
+                for data_row in self._posting_details(pending):
+                    handle.write(json.dumps(data_row) + '\n')
+                    handle.flush()
+                    records[data_row['origin_id']] = data_row
+                    run.inc('postings_parsed')
+                    if self._progress is not None:
+                        self._progress('details', f"{len(records):d} / "
+                                       f"{len(links):d} postings")
+            elapsed = time.perf_counter() - start
+        if len(pending) > 0:
+            logging.info(f"Scrapped {len(pending):d} AJO postings in "
+                         f"{elapsed:.1f}s ({len(pending) / elapsed:.1f} "
+                         "pages/s)")
+
+        # Build the frame in one go, in listing order
+        data = pd.DataFrame.from_records(
+            [records[self.id_from_link(x)] for x in links])
         data['origin'] = 'AJO'
 
         from JMTracker.settings import settings
@@ -201,34 +679,264 @@ class AJOScrapper(Scrapper):
         if test:
             success = False
             message = 'Failed to collect some ids for AJO'
+            run.inc('postings_missing_id', data['origin_id'].isna().sum())
             # store
             path = os.path.join(settings['output_directory'], 'ajo_failures.csv')
             data.to_csv(path)
             return success, message
 
         logging.info("Storing AJO files to input")
-        path = os.path.join(settings['input_directory'], 'latest_ajo_postings.csv')
-        data.to_csv(path)
+        with self._stage(run, 'store'):
+            data.to_csv(self.output_url)
+        self.stored_url = self.output_url
+        os.remove(self._checkpoint_url)
+        if full_refresh:
+            self._store_full_refresh()
 
         return success, message
 
-    @staticmethod
-    def gui_scrape(window_location=(None, None)):
-        """Create an instance and scrape with user messages.
+    def _posting_details(self, links):
+        """Fetch and parse posting pages, yielding their data as soon as it
+        is ready (not in the order of links).
+
+        Fetch threads put the raw pages in a queue that feeds a pool of
+        parse processes, so that parsing does not hold back the fetch
+        threads and is not bound to a single core. Pages the pool fails to
+        parse are fetched and parsed again here, retried as in get_page.
+        """
+        if self._parse_workers == 0 or len(links) < self._min_pool_pages:
+            pages = self.get_pages(links, tree_only=True)
+            for link, tree in zip(links, pages):
+                yield self.parse_posting(tree, link)
+            return
+
+        fetched = queue.Queue()
+
+        def fetch(link):
+            try:
+                fetched.put((link, self.get_raw(link).text, None))
+            except Exception as err:
+                fetched.put((link, None, err))
+            return
+
+        # Scrapes run next to the GUI and snapshot threads, and forking a
+        # threaded process can deadlock the children on a copied lock
+        method = 'forkserver' if 'forkserver' in \
+            multiprocessing.get_all_start_methods() else 'spawn'
+        parsers = ProcessPoolExecutor(
+            max_workers=min(self._parse_workers, len(links)),
+            mp_context=multiprocessing.get_context(method))
+        fetchers = ThreadPoolExecutor(max_workers=self._concurrency)
+
+        def result(future):
+            link = in_flight.pop(future)
+            try:
+                return future.result()
+            except Exception as err:
+                logging.warning(f"Failed to parse {link} ({err}), fetching "
+                                "it again")
+                if self._metrics is not None:
+                    self._metrics.inc('parse_retries')
+                return self.parse_posting(
+                    self.get_page(link, tree_only=True), link)
+
+        try:
+            for link in links:
+                fetchers.submit(fetch, link)
+
+            # link of each pending parse
+            in_flight = {}
+            for _ in range(len(links)):
+                link, text, error = fetched.get()
+                if error is not None:
+                    raise error
+                in_flight[parsers.submit(
+                    _parse_ajo_posting, text, link, self._parse_mode)] = link
+                for future in [x for x in in_flight if x.done()]:
+                    yield result(future)
+            for future in as_completed(list(in_flight)):
+                yield result(future)
+        finally:
+            fetchers.shutdown(cancel_futures=True)
+            parsers.shutdown(cancel_futures=True)
+        return
+
+    def parse_posting(self, tree, link):
+        """Extract the posting details from an AJO posting page
+
+        Parameters
+        ----------
+        tree: XMLTree
+            the parsed posting page
+        link: str
+            url of the posting
 
         Returns
         -------
-        None
+        dict
+            the posting data
         """
-        sg.popup("Downloading posting data from AJO", location=window_location)
-        scrapper = AJOScrapper()
-        success, message = scrapper.get_postings()
-        if success:
-            sg.popup("Done processing. The data should be in the input folder"
-                     " and called latest_ajo_postings.csv\n"
-                     "Please review it and include it as with the other sources.",
-                     location=window_location)
-        else:
-            sg.popup(message, location=window_location)
+        data_row = {}
+        title = self.clean_text(tree.xpath('//h2')[0].text_content(), lower=False)
+        splt = title.split(',')
+        institution = splt[0]
+        department = ','.join(splt[1:])
+        data_row['institution'] = institution
+        data_row['department'] = department
+        data_row['url'] = link
+        # Get the full description
+        desc = self.clean_text(tree.xpath('//table')[1].text_content(), lower=False)
+        data_row['full_text'] = desc
+
+        # Split the id
+        data_row['origin_id'] = self.id_from_link(link)
+
+
+        table = tree.xpath('//table[@class="nobr"]')[0]
+        rows = table.xpath('tr')
+        for row in rows:
+            row_text = self.clean_text(row.text_content(), lower=False)
+            key = row_text.split(':')
+            value = ':'.join(key[1:])
+            value = value.strip()
+            key = key[0].strip().lower()
+            if ' id' in key:
+                continue
+            elif 'location' in key:
+                key = 'location'
+                value = value.split('[ map ]')[0].strip()
+            elif 'deadline' in key:
+                key = 'deadline'
+                value = value.lower()
+                group = re.findall(
+                    r'\d{4}/\d{2}/\d{2}',
+                    value
+                )
+                if len(group) == 0:
+                    value = np.nan
+                else:
+                    value = group[0]
+            elif 'description' in key:
+                continue
+            elif 'subject' in key:
+                key = 'keywords'
+            elif 'title' in key:
+                key = 'title'
+            elif 'type' in key:
+                key = 'division'
+
+            data_row[key] = value
+        return data_row
+
+
+
+class EJMScrapper(Scrapper):
+
+    """Downloads the EJM postings CSV"""
+
+    origin = 'EJM'
+    output_file_name = 'latest_ejm_download.csv'
+
+    def __init__(self, base_url=None, **kwargs):
+        """Initialize the object
+
+        Parameters
+        ----------
+        base_url: str, optional
+            the CSV download endpoint, defaults to all EJM postings
+        kwargs: dict
+            passed on to Scrapper
+        """
+        if base_url is None:
+            base_url = 'https://econjobmarket.org/users/positions/download/a'
+        Scrapper.__init__(self, base_url, **kwargs)
+        return
+
+    def _scrape_postings(self, run):
+        """Core of get_postings, recording metrics into run"""
+        with self._stage(run, 'download'):
+            page = self.get_raw(redirect=True)
+        if page.status_code != 200:
+            return False, f"EJM answered the download with {page.status_code}"
+
+        with self._stage(run, 'validate'):
+            # Same layout as a manual download: a title line, then the header
+            try:
+                data = pd.read_csv(io.BytesIO(page.content), header=1)
+            except (ValueError, pd.errors.ParserError):
+                data = None
+        if data is None or 'Id' not in data.columns:
+            message = ("EJM did not answer with the postings CSV. Please "
+                       "download it manually.")
+            return False, message
+        run.inc('postings_parsed', data.shape[0])
+
+        with self._stage(run, 'store'):
+            self._store_output(page.content)
+        return True, ''
+
+
+class AEAScrapper(Scrapper):
+
+    """Downloads the AEA JOE listings as a native xlsx file"""
+
+    origin = 'AEA'
+    output_file_name = 'latest_aea_download.xlsx'
+    # Links to the spreadsheet export of the JOE listings page
+    export_xpath = '//a[contains(@href, "xls")]/@href'
+
+    def __init__(self, base_url=None, **kwargs):
+        """Initialize the object
 
+        Parameters
+        ----------
+        base_url: str, optional
+            the JOE listings page, defaults to the current listings
+        kwargs: dict
+            passed on to Scrapper
+        """
+        if base_url is None:
+            base_url = 'https://www.aeaweb.org/joe/listings'
+        Scrapper.__init__(self, base_url, **kwargs)
         return
+
+    def _scrape_postings(self, run):
+        """Core of get_postings, recording metrics into run"""
+        with self._stage(run, 'listing'):
+            tree = self.get_page(tree_only=True, redirect=True)
+            links = tree.xpath(self.export_xpath)
+        if len(links) == 0:
+            return False, "Couldn't find the spreadsheet export in JOE"
+
+        with self._stage(run, 'download'):
+            page = self.get_raw(urljoin(self._base_url, links[0]),
+                                redirect=True)
+        # xlsx files are zip archives
+        if page.status_code != 200 or not page.content.startswith(b'PK'):
+            message = ("JOE did not answer with the listings spreadsheet. "
+                       "Please download it manually.")
+            return False, message
+
+        with self._stage(run, 'store'):
+            self._store_output(page.content)
+        return True, ''
+
+
+# AJOScrapper used by each parse process, see AJOScrapper._posting_details
+_process_parser = None
+
+
+def _ajo_parser(parse_mode):
+    """The AJOScrapper of the current parse process"""
+    global _process_parser
+    if _process_parser is None or _process_parser._parse_mode != parse_mode:
+        _process_parser = AJOScrapper(cache=False, parse_mode=parse_mode,
+                                      concurrency=1, parse_workers=0)
+    return _process_parser
+
+
+def _parse_ajo_posting(text, link, parse_mode):
+    """Parse an AJO posting page in a parse process"""
+    parser = _ajo_parser(parse_mode)
+    tree, _ = parser.parse_page(text)
+    return parser.parse_posting(tree, link)
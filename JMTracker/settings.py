@@ -1,7 +1,7 @@
 import datetime
 import os
 import pandas as pd
-from JMTracker.scrapper import AJOScrapper
+from JMTracker.scrapper import AJOScrapper, AEAScrapper, EJMScrapper
 from JMTracker.auxiliary import (
     corrupt_excel_reader, country_state_city_aggregator,
     validate_unique_id, validator_generator, validate_extension
@@ -29,6 +29,67 @@ settings = {
     'custom_settings': os.path.abspath(os.path.join(pwd, '../custom_settings.py')),
     # Decide whether custom input settings are overriden or appended
     'custom_overrides_default': False,
+    # Metrics of every ingest and scrape run. Format is either 'jsonl'
+    # (one line per run appended to the file) or 'prometheus' (a textfile
+    # per job next to the metrics file, replaced on every run)
+    'metrics_enabled': True,
+    'metrics_format': 'jsonl',
+    'metrics_file': os.path.abspath(os.path.join(pwd, '../output/metrics.jsonl')),
+    # Scrapping: number of pages fetched in parallel and maximum requests
+    # per second sent to a single host (None for no limit)
+    'scrape_concurrency': 4,
+    'scrape_rate_limit': 4.0,
+    # AJO scrapes only fetch postings not yet stored, except every this
+    # many days when all postings are refetched to pick up edits
+    'ajo_full_refresh_days': 7,
+    # Keep scrapped pages in storage/http_cache and only download them again
+    # if they changed. Cache size limit in megabytes
+    'http_cache_enabled': True,
+    'http_cache_max_mb': 200,
+    # How scrapped pages are parsed: 'fast' parses once with lxml, 'soup'
+    # goes through BeautifulSoup first (slower, more forgiving)
+    'scrape_parse_mode': 'fast',
+    # Processes parsing AJO pages while they download (large scrapes only).
+    # None uses every core, 0 parses in the download threads
+    'scrape_parse_workers': None,
+    # Failed requests (connection errors, timeouts, 429 and 5xx answers) are
+    # retried with exponential backoff starting at scrape_backoff seconds.
+    # A host failing scrape_breaker_threshold times in a row is left alone
+    # for scrape_breaker_reset seconds. Timeouts are in seconds.
+    'scrape_timeout': 30,
+    'scrape_backoff': 1.0,
+    'scrape_max_backoff': 60.0,
+    'scrape_breaker_threshold': 5,
+    'scrape_breaker_reset': 60.0,
+    # Keep compressed copies of the pages of postings with these statuses in
+    # storage/snapshots, opened by the "See posting" buttons. Pages are
+    # checked for changes at most every snapshot_refresh_hours. With
+    # snapshots_auto_refresh they are refreshed in the background when
+    # postings are marked applied, and with snapshots_refresh_on_start also
+    # when the app starts
+    'snapshots_enabled': True,
+    'snapshots_auto_refresh': True,
+    'snapshots_refresh_on_start': False,
+    'snapshot_statuses': ['interested', 'maybe', 'applied'],
+    'snapshot_refresh_hours': 24,
+    # Rows per page in the interested, ignored and applications tables
+    'table_page_size': 100,
+    # Weeks shown in the deadline calendar
+    'calendar_weeks': 8,
+    # Application folders are created from the scaffolding base folder set
+    # in the configuration menu. Their default name, and any file or folder
+    # name in the base folder, may use posting fields as in {institution}.
+    # Files are cloned where the file system supports it and copied
+    # otherwise ('auto'), always copied ('copy') or linked to the base
+    # folder ('hardlink': editing a file then edits it in every folder)
+    'scaffolding_name_template': '{institution} - {title}',
+    'scaffolding_link_mode': 'auto',
+    'scaffolding_workers': 8,
+    # Keep output/deadlines.ics current with the deadlines of postings with
+    # these statuses, to import in or subscribe to from a calendar app. The
+    # file is updated each time the postings change
+    'ical_export_enabled': True,
+    'ical_statuses': ['interested', 'maybe', 'applied'],
 }
 
 # == Input Type Configuration === #
@@ -84,6 +145,10 @@ input_option_settings = [
         'origin': 'AEA',
         # The url to link to for file download
         'download_url': 'https://www.aeaweb.org/joe/listings?issue=2024-02',
+        # Optional. A function called with the window location that downloads
+        # the file for the user. The scrappers in JMTracker.scrapper provide
+        # one as gui_scrape, and are also used by `./main.py --action update`
+        'download_action': AEAScrapper.gui_scrape,
         # Excepcted extension, lower-case no period
         'expected_extension': 'xlsx',
         # Instructions to show user
@@ -128,6 +193,7 @@ input_option_settings = [
     {
         'origin': 'EJM',
         'download_url': 'https://econjobmarket.org/users/positions/download/a',
+        'download_action': EJMScrapper.gui_scrape,
         'expected_extension': 'csv',
         # A validator for the path given for the file to load
         'url_validator': validator_generator(
@@ -0,0 +1,253 @@
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import logging
+import pathlib
+import threading
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from JMTracker.scrapper import PageFetcher
+
+"""
+Local snapshots of the posting web pages, so that shortlisted postings open
+instantly and can still be seen once they are taken down.
+"""
+
+
+class SnapshotArchive:
+
+    """Compressed copies of posting pages. Identical pages are stored once,
+    named after the hash of their content."""
+
+    def __init__(self, directory):
+        """Initialize the archive
+
+        Parameters
+        ----------
+        directory: str
+            folder for the compressed pages, their index and the copies
+            opened in the browser
+        """
+        self._directory = directory
+        self._blob_dir = os.path.join(directory, 'blobs')
+        self._view_dir = os.path.join(directory, 'view')
+        self._index_url = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+        # Held by the running refresh, so refreshes never overlap
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        for folder in [self._blob_dir, self._view_dir]:
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+        self._index = {}
+        if os.path.isfile(self._index_url):
+            try:
+                with open(self._index_url, 'r') as handle:
+                    self._index = json.load(handle)
+            except ValueError:
+                logging.warning("The snapshot index is corrupt, resetting it")
+        return
+
+    @staticmethod
+    def _key(origin, origin_id):
+        return f'{origin}-{origin_id}'
+
+    def _blob_url(self, digest):
+        return os.path.join(self._blob_dir, f'{digest}.gz')
+
+    def _save_index(self):
+        """Store the index. Expects the lock to be held."""
+        tmp = self._index_url + '.tmp'
+        with open(tmp, 'w') as handle:
+            json.dump(self._index, handle)
+        os.replace(tmp, self._index_url)
+        return
+
+    def has(self, origin, origin_id):
+        """Check if a posting has a snapshot"""
+        with self._lock:
+            return self._key(origin, origin_id) in self._index
+
+    def refresh(self, postings, max_age_hours=None):
+        """Fetch the pages of postings concurrently into the archive.
+
+        Pages checked less than max_age_hours ago are left alone, the others
+        are requested conditionally so unchanged pages are not downloaded
+        again. Snapshots of postings no longer given are kept. A refresh
+        started while another runs waits for it to finish.
+
+        Parameters
+        ----------
+        postings: DataFrame
+            postings with origin, origin_id and url columns
+        max_age_hours: float, optional
+            defaults to the snapshot_refresh_hours setting
+
+        Returns
+        -------
+        dict
+            number of pages fetched, unchanged, failed and skipped
+        """
+        with self._refresh_lock:
+            return self._refresh(postings, max_age_hours)
+
+    def _refresh(self, postings, max_age_hours):
+        """Core of refresh, expects the refresh lock to be held"""
+        from JMTracker.settings import settings
+        if max_age_hours is None:
+            max_age_hours = settings['snapshot_refresh_hours']
+        now = time.time()
+        jobs = []
+        skipped = 0
+        cols = ['origin', 'origin_id', 'url']
+        for origin, origin_id, url in postings[cols].itertuples(index=False):
+            if not isinstance(url, str) or not url.startswith('http'):
+                continue
+            key = self._key(origin, origin_id)
+            with self._lock:
+                entry = self._index.get(key, None)
+            if entry is not None and entry['url'] == url and \
+                    now - entry['checked'] < max_age_hours * 3600:
+                skipped += 1
+                continue
+            jobs.append((key, url, entry))
+
+        # The archive keeps the pages, the http cache would store them twice
+        fetcher = PageFetcher(None, cache=False)
+
+        def fetch(job):
+            key, url, entry = job
+            headers = {}
+            if entry is not None and entry['url'] == url:
+                if entry['etag'] is not None:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified'] is not None:
+                    headers['If-Modified-Since'] = entry['last_modified']
+            try:
+                page = fetcher.get_raw(url, redirect=True, headers=headers)
+            except requests.RequestException as err:
+                logging.warning(f"Couldn't snapshot {url}: {err}")
+                return 'failed'
+            if page.status_code == 304:
+                with self._lock:
+                    self._index[key]['checked'] = time.time()
+                    self._save_index()
+                return 'unchanged'
+            if page.status_code != 200:
+                logging.warning(f"Couldn't snapshot {url}: got a "
+                                f"{page.status_code} answer")
+                return 'failed'
+            return self._store(key, url, page)
+
+        with ThreadPoolExecutor(
+                max_workers=settings['scrape_concurrency']) as executor:
+            results = list(executor.map(fetch, jobs))
+        self._prune()
+
+        counts = {x: results.count(x) for x in
+                  ['fetched', 'unchanged', 'failed']}
+        counts['skipped'] = skipped
+        logging.info(f"Posting snapshots refreshed: {counts}")
+        return counts
+
+    def _store(self, key, url, page):
+        """Store a fetched page, returns 'fetched' or 'unchanged'"""
+        body = page.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob_url = self._blob_url(digest)
+        if not os.path.isfile(blob_url):
+            tmp = blob_url + f'.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as handle:
+                handle.write(gzip.compress(body))
+            os.replace(tmp, blob_url)
+        with self._lock:
+            previous = self._index.get(key, None)
+            self._index[key] = {
+                'url': url,
+                'digest': digest,
+                'content_type': page.headers.get('Content-Type', None),
+                'etag': page.headers.get('ETag', None),
+                'last_modified': page.headers.get('Last-Modified', None),
+                'checked': time.time(),
+            }
+            self._save_index()
+        if previous is not None and previous['digest'] == digest:
+            return 'unchanged'
+        return 'fetched'
+
+    def _prune(self):
+        """Remove the stored pages no snapshot refers to"""
+        with self._lock:
+            used = set(x['digest'] for x in self._index.values())
+        for folder in [self._blob_dir, self._view_dir]:
+            for name in os.listdir(folder):
+                if name.split('.')[0] not in used:
+                    os.remove(os.path.join(folder, name))
+        return
+
+    def view_url(self, origin, origin_id):
+        """Path to a copy of the snapshot the browser can open, None if the
+        posting has no snapshot"""
+        with self._lock:
+            entry = self._index.get(self._key(origin, origin_id), None)
+        if entry is None or not os.path.isfile(self._blob_url(entry['digest'])):
+            return None
+        content_type = entry['content_type'] or ''
+        extension = '.pdf' if 'pdf' in content_type else '.html'
+        # Identical pages of different postings need their own base url
+        url_hash = hashlib.sha1(entry['url'].encode('utf-8')).hexdigest()[:8]
+        path = os.path.join(self._view_dir,
+                            f"{entry['digest']}.{url_hash}{extension}")
+        if os.path.isfile(path):
+            return path
+
+        with open(self._blob_url(entry['digest']), 'rb') as handle:
+            body = gzip.decompress(handle.read())
+        if extension == '.html':
+            # Resolve relative links and resources against the original page
+            base = f'<base href="{entry["url"]}">'.encode('utf-8')
+            body, found = re.subn(rb'<head[^>]*>',
+                                  lambda x: x.group(0) + base, body, count=1,
+                                  flags=re.IGNORECASE)
+            if found == 0:
+                body = base + body
+        with open(path, 'wb') as handle:
+            handle.write(body)
+        return path
+
+    def open(self, origin, origin_id, url):
+        """Open the snapshot of a posting in the browser, or its url if it
+        has none
+
+        Returns
+        -------
+        bool
+            whether the snapshot was opened
+        """
+        path = self.view_url(origin, origin_id)
+        if path is None:
+            webbrowser.open(url)
+            return False
+        webbrowser.open(pathlib.Path(path).as_uri())
+        return True
+
+    def refresh_in_background(self, postings, max_age_hours=None):
+        """Run refresh on a background thread, unless one is running
+
+        Returns
+        -------
+        Thread
+            the running refresh thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._thread = threading.Thread(
+            target=self.refresh, args=(postings, max_age_hours),
+            name='snapshots', daemon=True
+        )
+        self._thread.start()
+        return self._thread
@@ -0,0 +1,522 @@
+import weakref
+import numpy as np
+import pandas as pd
+
+"""
+Queries over the stored postings. Predicates are answered from indexes kept
+per postings frame instead of scanning and copying the frame every time.
+"""
+
+# Day number of unknown deadlines, the integer value of NaT
+UNKNOWN_DAY = np.iinfo(np.int64).min
+
+
+def day_numbers(deadlines):
+    """Days since 1970-01-01 of datetime64 deadlines, UNKNOWN_DAY for NaT"""
+    return np.asarray(deadlines).astype('datetime64[D]').astype(np.int64)
+
+
+def day_number(date):
+    """Days since 1970-01-01 of a date"""
+    return int(np.datetime64(pd.Timestamp(date), 'D').astype(np.int64))
+
+
+class DeadlineCalendar:
+
+    """Number of postings due each day, by status. Built once with a
+    bincount, then kept current by moving a single posting between days or
+    statuses on every edit."""
+
+    def __init__(self, days, statuses):
+        """Initialize the calendar
+
+        Parameters
+        ----------
+        days: ndarray
+            day number of the deadline of every posting, UNKNOWN_DAY if
+            unknown
+        statuses: ndarray
+            status of every posting
+        """
+        status_codes, uniques = pd.factorize(statuses)
+        self._statuses = list(uniques)
+        known = days != UNKNOWN_DAY
+        self._start = int(days[known].min()) if known.any() else 0
+        span = int(days[known].max()) - self._start + 1 if known.any() else 1
+        # Unknown deadlines are counted in the extra last day
+        slots = np.where(known, days - self._start, span)
+        width = len(self._statuses)
+        valid = status_codes >= 0
+        self._counts = np.bincount(
+            slots[valid] * width + status_codes[valid],
+            minlength=(span + 1) * width
+        ).reshape(span + 1, width)
+        # Day and status of every posting, to undo them on edits
+        self._row_days = days.copy()
+        self._row_statuses = status_codes
+        return
+
+    def _slot(self, day):
+        """Row of counts of a day, growing counts to include it"""
+        span = self._counts.shape[0] - 1
+        if day == UNKNOWN_DAY:
+            return span
+        if day < self._start:
+            grow = self._start - day
+            self._counts = np.vstack([
+                np.zeros((grow, self._counts.shape[1]), dtype=np.int64),
+                self._counts
+            ])
+            self._start = day
+        elif day - self._start >= span:
+            grow = day - self._start - span + 1
+            self._counts = np.vstack([
+                self._counts[:span],
+                np.zeros((grow, self._counts.shape[1]), dtype=np.int64),
+                self._counts[span:]
+            ])
+        return day - self._start
+
+    def _status_code(self, status):
+        if pd.isna(status):
+            return -1
+        if status not in self._statuses:
+            self._statuses.append(status)
+            self._counts = np.hstack([
+                self._counts,
+                np.zeros((self._counts.shape[0], 1), dtype=np.int64)
+            ])
+        return self._statuses.index(status)
+
+    def update(self, position, day, status):
+        """Move a posting to its new day and status
+
+        Parameters
+        ----------
+        position: int
+            position of the posting
+        day: int
+            new day number of its deadline, UNKNOWN_DAY if unknown
+        status: str
+            its new status
+        """
+        old_code = self._row_statuses[position]
+        if old_code >= 0:
+            slot = self._slot(self._row_days[position])
+            self._counts[slot, old_code] -= 1
+        code = self._status_code(status)
+        if code >= 0:
+            # Growing the counts replaces the array, so find the slot first
+            slot = self._slot(day)
+            self._counts[slot, code] += 1
+        self._row_days[position] = day
+        self._row_statuses[position] = code
+        return
+
+    def _totals(self, statuses):
+        """Postings due each day with any of statuses, unknown last"""
+        codes = [self._statuses.index(x) for x in statuses
+                 if x in self._statuses]
+        return self._counts[:, codes].sum(axis=1)
+
+    def per_day(self, statuses, start=None):
+        """Days with postings due
+
+        Parameters
+        ----------
+        statuses: list
+            statuses counted
+        start: date, optional
+            first day included
+
+        Returns
+        -------
+        days: ndarray
+            day numbers with postings due, in order
+        counts: ndarray
+            postings due each of those days
+        unknown: int
+            postings without a known deadline
+        """
+        totals = self._totals(statuses)
+        slots = np.flatnonzero(totals[:-1])
+        days = slots + self._start
+        if start is not None:
+            keep = days >= day_number(start)
+            days, slots = days[keep], slots[keep]
+        return days, totals[slots], int(totals[-1])
+
+    def weeks(self, statuses, start, count):
+        """Postings due each day of count weeks, by week and weekday
+
+        Parameters
+        ----------
+        statuses: list
+            statuses counted
+        start: date
+            any day of the first week, which starts on Monday
+        count: int
+            number of weeks
+
+        Returns
+        -------
+        first_day: int
+            day number of the Monday starting the first week
+        counts: ndarray
+            count by count x 7 array of postings due
+        """
+        first_day = day_number(start)
+        first_day -= pd.Timestamp(start).weekday()
+        totals = self._totals(statuses)[:-1]
+        offsets = np.arange(count * 7) + first_day - self._start
+        inside = (offsets >= 0) & (offsets < len(totals))
+        counts = np.zeros(count * 7, dtype=np.int64)
+        counts[inside] = totals[offsets[inside]]
+        return first_day, counts.reshape(count, 7)
+
+
+class PostingIndex:
+
+    """Indexes of a postings frame, each built the first time a query needs
+    it: codes of the values of a column, parsed deadlines, lower-cased text
+    and sort orders. Edits made through update keep them current."""
+
+    # Index of each live frame, by id of the frame
+    _indexes = {}
+
+    def __init__(self, postings):
+        """Initialize the index
+
+        Parameters
+        ----------
+        postings: DataFrame
+            the postings to index. Edit them through update, or the index
+            goes stale
+        """
+        self._frame = weakref.ref(postings)
+        # column: (codes of every row, distinct values)
+        self._codes = {}
+        self._deadlines = None
+        self._deadline_missing = None
+        # columns: lower-cased text of every row
+        self._text = {}
+        self._sort_orders = {}
+        self._calendar = None
+        return
+
+    @classmethod
+    def of(cls, postings):
+        """The index of a frame, created if needed.
+
+        Indexes are kept by the id of their frame, so they only stay current
+        while the frame is edited through edit_posting or edit_postings.
+        Other in-place edits, as in postings.loc[sel, 'status'] = 'maybe',
+        leave the index of the frame stale: edit a copy instead."""
+        key = id(postings)
+        index = cls._indexes.get(key, None)
+        if index is not None and index._frame() is postings:
+            return index
+        index = cls(postings)
+        cls._indexes[key] = index
+        weakref.finalize(postings, cls._indexes.pop, key, None)
+        return index
+
+    @property
+    def postings(self):
+        return self._frame()
+
+    def codes(self, column):
+        """Code of the value of column in every row, -1 where missing, and
+        the distinct values the codes refer to"""
+        if column not in self._codes:
+            codes, uniques = pd.factorize(self.postings[column])
+            self._codes[column] = (codes, pd.Index(uniques))
+        return self._codes[column]
+
+    def isin(self, column, values):
+        """Boolean array of the rows whose column is one of values"""
+        codes, uniques = self.codes(column)
+        wanted = np.flatnonzero(uniques.isin(list(values)))
+        return np.isin(codes, wanted)
+
+    def deadlines(self):
+        """Parsed deadlines, NaT where not a date, and whether each deadline
+        is missing"""
+        if self._deadlines is None:
+            column = self.postings['deadline']
+            codes, uniques = pd.factorize(column)
+            parsed = pd.DatetimeIndex(
+                [pd.to_datetime(x, errors='coerce') for x in uniques]
+            ).to_numpy(dtype='datetime64[ns]')
+            deadlines = np.full(len(codes), np.datetime64('NaT'),
+                                dtype='datetime64[ns]')
+            deadlines[codes >= 0] = parsed[codes[codes >= 0]]
+            self._deadlines = deadlines
+            self._deadline_missing = column.isna().to_numpy(copy=True)
+        return self._deadlines, self._deadline_missing
+
+    def calendar(self):
+        """Postings due each day by status, a DeadlineCalendar"""
+        if self._calendar is None:
+            deadlines, missing = self.deadlines()
+            self._calendar = DeadlineCalendar(
+                day_numbers(deadlines),
+                self.postings['status'].to_numpy(dtype=object)
+            )
+        return self._calendar
+
+    def text(self, columns):
+        """Lower-cased text of columns, one string per row"""
+        columns = tuple(columns)
+        if columns not in self._text:
+            postings = self.postings
+            text = postings[columns[0]].fillna('').astype(str)
+            for col in columns[1:]:
+                text = text + ' ' + postings[col].fillna('').astype(str)
+            self._text[columns] = text.str.lower()
+        return self._text[columns]
+
+    def sort_order(self, column):
+        """Positions of the rows sorted by column, missing values last"""
+        if column not in self._sort_orders:
+            values = self.postings[column].reset_index(drop=True)
+            self._sort_orders[column] = values.sort_values(
+                kind='stable').index.to_numpy()
+        return self._sort_orders[column]
+
+    def update(self, position, changes):
+        """Bring the indexes up to date with an edited row
+
+        Parameters
+        ----------
+        position: int
+            position of the edited row
+        changes: dict
+            new values of the edited columns
+        """
+        self.update_rows([position], changes)
+        return
+
+    def update_rows(self, positions, changes):
+        """Bring the indexes up to date with rows edited to the same values
+
+        Parameters
+        ----------
+        positions: array-like
+            positions of the edited rows
+        changes: dict
+            new values of the edited columns
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        for column, value in changes.items():
+            if column in self._codes:
+                codes, uniques = self._codes[column]
+                code = -1 if pd.isna(value) else \
+                    uniques.get_indexer([value])[0]
+                if code >= 0 or pd.isna(value):
+                    codes[positions] = code
+                else:
+                    # A new value, the codes are rebuilt when next needed
+                    del self._codes[column]
+            if column == 'deadline' and self._deadlines is not None:
+                parsed = pd.to_datetime(value, errors='coerce')
+                self._deadlines[positions] = np.datetime64('NaT') if \
+                    pd.isna(parsed) else np.datetime64(parsed)
+                self._deadline_missing[positions] = pd.isna(value)
+            self._text = {k: v for k, v in self._text.items()
+                          if column not in k}
+            self._sort_orders.pop(column, None)
+        if self._calendar is not None and \
+                ('status' in changes or 'deadline' in changes):
+            days = day_numbers(self._deadlines[positions])
+            statuses = self.postings['status'].to_numpy()[positions]
+            for position, day, status in zip(positions, days, statuses):
+                self._calendar.update(position, int(day), status)
+        return
+
+
+def edit_posting(postings, position, changes):
+    """Edit a posting in place, keeping the index of postings current
+
+    Parameters
+    ----------
+    postings: DataFrame
+        the postings to edit
+    position: int
+        position of the posting
+    changes: dict
+        new values by column. Columns not in postings are ignored
+
+    Returns
+    -------
+    dict
+        the changes applied
+    """
+    label = postings.index[position]
+    changes = {col: value for col, value in changes.items()
+               if col in postings.columns}
+    for col, value in changes.items():
+        postings.at[label, col] = value
+    PostingIndex.of(postings).update(position, changes)
+    return changes
+
+
+def edit_postings(postings, positions, changes):
+    """Set several postings to the same values in place, keeping the index
+    of postings current
+
+    Parameters
+    ----------
+    postings: DataFrame
+        the postings to edit
+    positions: array-like
+        positions of the postings
+    changes: dict
+        new values by column. Columns not in postings are ignored
+
+    Returns
+    -------
+    dict
+        the changes applied
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    changes = {col: value for col, value in changes.items()
+               if col in postings.columns}
+    for col, value in changes.items():
+        postings.iloc[positions, postings.columns.get_loc(col)] = value
+    PostingIndex.of(postings).update_rows(positions, changes)
+    return changes
+
+
+class PostingQuery:
+
+    """Builds a selection of postings. Each method adds a condition and
+    returns the query, so they can be chained:
+
+        PostingQuery().status('interested', 'maybe').deadline(start=today)
+    """
+
+    # Columns searched by text()
+    text_columns = ('title', 'institution', 'department', 'location')
+
+    def __init__(self):
+        self._isin = []
+        self._deadline = None
+        self._due_day = None
+        self._text = None
+        self._sort_by = None
+        self._limit = None
+        self._columns = None
+        return
+
+    def where(self, column, values):
+        """Keep postings whose column is one of values"""
+        self._isin.append((column, list(values), False))
+        return self
+
+    def exclude(self, column, values):
+        """Drop postings whose column is one of values"""
+        self._isin.append((column, list(values), True))
+        return self
+
+    def status(self, *statuses):
+        """Keep postings with one of the statuses"""
+        return self.where('status', statuses)
+
+    def origin(self, *origins):
+        """Keep postings from one of the sources"""
+        return self.where('origin', origins)
+
+    def deadline(self, start=None, end=None, include_unknown=True):
+        """Keep postings with a deadline between start and end, both
+        included and either optional
+
+        Parameters
+        ----------
+        start, end: date-like, optional
+            limits of the deadlines kept
+        include_unknown: bool, optional
+            also keep postings without a deadline
+        """
+        self._deadline = (start, end, include_unknown)
+        return self
+
+    def due_on(self, date):
+        """Keep postings due on a date, or without a deadline if None"""
+        self._due_day = UNKNOWN_DAY if date is None else day_number(date)
+        return self
+
+    def text(self, pattern, columns=None):
+        """Keep postings containing pattern, ignoring case
+
+        Parameters
+        ----------
+        pattern: str
+            text to look for
+        columns: list, optional
+            columns searched, defaults to text_columns
+        """
+        columns = self.text_columns if columns is None else columns
+        self._text = (pattern.lower(), tuple(columns))
+        return self
+
+    def sort(self, by):
+        """Order the postings by a column, missing values last"""
+        self._sort_by = by
+        return self
+
+    def limit(self, count):
+        """Keep at most count postings"""
+        self._limit = count
+        return self
+
+    def columns(self, *columns):
+        """Only return these columns"""
+        self._columns = list(columns)
+        return self
+
+    def mask(self, postings):
+        """Boolean array of the postings matching the conditions"""
+        index = PostingIndex.of(postings)
+        sel = np.ones(postings.shape[0], dtype=bool)
+        for column, values, negate in self._isin:
+            matches = index.isin(column, values)
+            sel &= ~matches if negate else matches
+        if self._deadline is not None:
+            start, end, include_unknown = self._deadline
+            deadlines, missing = index.deadlines()
+            within = np.ones(postings.shape[0], dtype=bool)
+            if start is not None:
+                within &= deadlines >= np.datetime64(pd.Timestamp(start))
+            if end is not None:
+                within &= deadlines <= np.datetime64(pd.Timestamp(end))
+            if include_unknown:
+                within |= missing
+            sel &= within
+        if self._due_day is not None:
+            deadlines, missing = index.deadlines()
+            sel &= day_numbers(deadlines) == self._due_day
+        if self._text is not None:
+            pattern, columns = self._text
+            sel &= index.text(columns).str.contains(
+                pattern, regex=False).to_numpy()
+        return sel
+
+    def positions(self, postings):
+        """Positions of the matching postings, sorted and limited"""
+        sel = self.mask(postings)
+        if self._sort_by is None:
+            positions = np.flatnonzero(sel)
+        else:
+            order = PostingIndex.of(postings).sort_order(self._sort_by)
+            positions = order[sel[order]]
+        if self._limit is not None:
+            positions = positions[:self._limit]
+        return positions
+
+    def run(self, postings):
+        """The matching postings, a copy"""
+        selected = postings.iloc[self.positions(postings), :]
+        if self._columns is not None:
+            selected = selected.loc[:, self._columns]
+        return selected.copy()
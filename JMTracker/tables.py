@@ -0,0 +1,187 @@
+import math
+import numpy as np
+from JMTracker.storage import PostingIndex, edit_posting, edit_postings
+
+"""
+Helpers for the tables of the review screens
+"""
+
+
+class PagedTable:
+
+    """Postings shown a page at a time. The table holds every posting of a
+    screen, its filters only pick which ones are shown. Sort orders come
+    from the postings' index and are reused across filters, and rows are
+    formatted for display when first shown and then kept until edited, so
+    long lists render, filter and sort as fast as short ones."""
+
+    def __init__(self, postings, formatter, page_size=100, sort_by=None,
+                 row_filter=None, **filters):
+        """Initialize the table
+
+        Parameters
+        ----------
+        postings: DataFrame
+            every posting the screen may show
+        formatter: function
+            takes a slice of postings and returns the table rows, a list of
+            lists of strings
+        page_size: int, optional
+            rows per page
+        sort_by: str, optional
+            column to sort by
+        row_filter: function, optional
+            takes postings and the filters and returns a boolean array of
+            the postings to show. All postings are shown without it
+        **filters:
+            passed to row_filter
+        """
+        self.postings = postings
+        self._formatter = formatter
+        self._page_size = max(1, int(page_size))
+        self._row_filter = row_filter
+        self._filters = {}
+        self._mask = np.ones(postings.shape[0], dtype=bool)
+        self._sort_by = None
+        # Formatted rows by position, with the row version they show
+        self._versions = np.zeros(postings.shape[0], dtype=np.int64)
+        self._display = {}
+        self._order = np.arange(postings.shape[0])
+        self.page = 0
+        self.filter(**filters)
+        if sort_by is not None:
+            self.sort(sort_by)
+        return
+
+    @property
+    def num_rows(self):
+        return len(self._order)
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.num_rows / self._page_size))
+
+    def _reorder(self):
+        if self._sort_by is None:
+            self._order = np.flatnonzero(self._mask)
+        else:
+            order = PostingIndex.of(self.postings).sort_order(self._sort_by)
+            self._order = order[self._mask[order]]
+        return
+
+    def filter(self, **filters):
+        """Show the postings passing the row filter, keeping the order, and
+        go to the first page"""
+        self._filters = filters
+        if self._row_filter is not None:
+            self._mask = np.asarray(
+                self._row_filter(self.postings, **filters), dtype=bool)
+        self._reorder()
+        self.page = 0
+        return
+
+    def sort(self, by):
+        """Sort by a column, missing values last, and go to the first page"""
+        self._sort_by = by
+        self._reorder()
+        self.page = 0
+        return
+
+    def set_page(self, page):
+        """Go to a page, clipped to the available ones"""
+        self.page = min(max(0, page), self.num_pages - 1)
+        return
+
+    def _display_rows(self, positions):
+        """Formatted rows of postings, formatting only the ones not cached
+        or edited since"""
+        missing = [x for x in positions if x not in self._display or
+                   self._display[x][0] != self._versions[x]]
+        if len(missing) > 0:
+            rows = self._formatter(self.postings.iloc[missing, :])
+            for position, row in zip(missing, rows):
+                self._display[position] = (self._versions[position], row)
+        return [self._display[x][1] for x in positions]
+
+    def rows(self):
+        """Rows of the current page, ready for sg.Table"""
+        start = self.page * self._page_size
+        positions = self._order[start:start + self._page_size]
+        return self._display_rows(positions)
+
+    def update(self, position, changes):
+        """Apply the changes of an edited posting
+
+        Parameters
+        ----------
+        position: int
+            position of the posting in postings
+        changes: dict
+            new values of the edited columns
+
+        Returns
+        -------
+        bool
+            True if only the edited row needs to be redrawn, False if the
+            page changed
+        """
+        changes = edit_posting(self.postings, position, changes)
+        self._versions[position] += 1
+
+        keep = True
+        if self._row_filter is not None:
+            # Filtering every posting reuses the index edit_posting keeps
+            # current, a slice of them would need an index of its own
+            keep = bool(self._row_filter(self.postings,
+                                         **self._filters)[position])
+        if keep != self._mask[position] or self._sort_by in changes:
+            self._mask[position] = keep
+            page = self.page
+            self._reorder()
+            self.set_page(page)
+            return False
+        return True
+
+    def update_rows(self, positions, changes):
+        """Apply the same changes to several postings and refilter them,
+        keeping the current page
+
+        Parameters
+        ----------
+        positions: array-like
+            positions of the postings in postings
+        changes: dict
+            new values of the edited columns
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        edit_postings(self.postings, positions, changes)
+        self._versions[positions] += 1
+        if self._row_filter is not None:
+            self._mask[positions] = np.asarray(self._row_filter(
+                self.postings, **self._filters), dtype=bool)[positions]
+        page = self.page
+        self._reorder()
+        self.set_page(page)
+        return
+
+    def position(self, row):
+        """Position in postings of a row of the current page"""
+        return self._order[self.page * self._page_size + row]
+
+    def positions(self, rows):
+        """Positions in postings of several rows of the current page"""
+        return self._order[self.page * self._page_size +
+                           np.asarray(rows, dtype=np.int64)]
+
+    def sorted_postings(self):
+        """The postings shown, in the current order"""
+        return self.postings.iloc[self._order, :]
+
+    def description(self):
+        """Text describing the current page"""
+        if self.num_rows == 0:
+            return "No postings"
+        start = self.page * self._page_size
+        stop = min(start + self._page_size, self.num_rows)
+        return (f"Page {self.page + 1:d} of {self.num_pages:d}, "
+                f"rows {start + 1:d}-{stop:d} of {self.num_rows:d}")
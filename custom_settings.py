@@ -23,6 +23,13 @@ settings = {
     # override and set no sources, the system will likely crash and papa will
     # be very mad at you.
     # 'custom_overrides_default': False,
+
+    # Every ingest and scrape run stores its counters (rows loaded, new,
+    # updated, http requests, ...) and stage durations in a metrics file.
+    # Use 'prometheus' to write textfiles for a local collector instead of
+    # appending JSON lines.
+    # 'metrics_format': 'jsonl',
+    # 'metrics_file': '/path/to/metrics.jsonl',
 }
 
 
@@ -14,6 +14,45 @@ def launch_gui(args=None):
     return
 
 
+def update_postings(args):
+    """Download and process the postings of every source with a scrapper"""
+    from JMTracker import Tracker
+    tracker = Tracker()
+    results = tracker.update_all_postings()
+    for origin, (status, message) in results.items():
+        print(f"{origin}: {'updated' if status else 'failed'} {message}")
+    return
+
+
+def bench_parse(args):
+    """Benchmark the page parsing modes on recorded AJO pages"""
+    from JMTracker.benchmarks import benchmark_parsing
+    if args.fixtures is None:
+        raise ValueError("bench-parse requires --fixtures with recorded pages")
+    print(benchmark_parsing(args.fixtures))
+    return
+
+
+def record(args):
+    """Scrape a source and store its pages as fixtures for the benchmarks"""
+    from JMTracker.benchmarks import record_fixtures
+    if args.fixtures is None:
+        raise ValueError("record requires --fixtures to store the pages")
+    print(record_fixtures(args.fixtures, origin=args.origin))
+    return
+
+
+def bench_scrape(args):
+    """Benchmark AJO scrapes of recorded pages at several concurrencies"""
+    from JMTracker.benchmarks import benchmark_scraping
+    if args.fixtures is None:
+        raise ValueError("bench-scrape requires --fixtures with recorded pages")
+    concurrency = [int(x) for x in args.concurrency.split(',')]
+    print(benchmark_scraping(args.fixtures, concurrency=concurrency,
+                             latency=args.latency, error_rate=args.error_rate))
+    return
+
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description=dedent("""
@@ -27,18 +66,38 @@ if __name__ == "__main__":
     - Update the current local collection of job postings from
       econjobmarket.org and aeaweb.org.
 
-      ./main.py update
+      ./main.py --action update
 
     """), formatter_class=argparse.RawTextHelpFormatter)
 
     available_actions = {
         'gui': launch_gui,
+        'update': update_postings,
+        'bench-parse': bench_parse,
+        'bench-scrape': bench_scrape,
+        'record': record,
     }
 
     parser.add_argument("--action", type=str, choices=available_actions.keys(),
                         help="action to execute", default='gui')
     parser.add_argument("--debug", action="store_true",
                         help="Debug log level")
+    parser.add_argument("--fixtures", type=str, default=None,
+                        help="folder of recorded pages for the benchmarks")
+    parser.add_argument("--origin", type=str, default='AJO',
+                        help="source to record pages from")
+    parser.add_argument("--concurrency", type=str, default='1,2,4,8',
+                        help="comma separated concurrency levels to benchmark")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="seconds the replayed pages take to answer")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of replayed requests failing with 503")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time every action and store a report in the "
+                        "output folder when done")
+    parser.add_argument("--profile-dumps", type=int, default=0,
+                        help="with --profile, keep cProfile dumps of this many "
+                        "of the slowest actions")
 
     args = parser.parse_args()
     action = args.action
@@ -50,8 +109,20 @@ if __name__ == "__main__":
     FORMAT = "[%(filename)s:%(lineno)s][%(levelname)s]\t %(message)s"
     logging.basicConfig(format=FORMAT, level=logging_level)
 
-    # Process
-    available_actions[action](args)
+    # process profiling
+    if args.profile:
+        from JMTracker.profiling import profiler
+        profiler.enable(cprofile_top=args.profile_dumps)
+
+    # Process, keeping the profile of runs that crash too
+    try:
+        available_actions[action](args)
+    finally:
+        if args.profile:
+            from JMTracker import settings
+            path = profiler.write_report(settings['output_directory'])
+            print(profiler.report())
+            print(f"Profile report stored at {path}")
 
     print("Done")
 
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+"""
+Fixtures shared by the test modules.
+"""
+
+
+@pytest.fixture
+def postings():
+    """A small postings frame, with deadlines mixing dates and text"""
+    return pd.DataFrame({
+        'origin': ['AJO', 'AJO', 'EJM', 'EJM', 'AEA'],
+        'origin_id': [1, 2, 3, 4, 5],
+        'status': ['interested', 'maybe', 'interested', 'ignore', 'applied'],
+        'deadline': ['2026-11-15', 'rolling', None, '2026-11-15',
+                     '2026-12-01'],
+        'title': ['Assistant Professor', 'Lecturer', 'Economist',
+                  'Postdoc', 'Assistant Professor'],
+        'institution': ['Harvard University', 'University of Edinburgh',
+                        'World Bank', 'INSEAD', 'Princeton University'],
+        'department': ['Economics', '', 'Research', 'Finance', 'Economics'],
+        'location': ['Cambridge, MA', 'Edinburgh', 'Washington, DC',
+                     'Fontainebleau', 'Princeton, NJ'],
+        'url': ['https://example.org/1', '', '', '', 'https://example.org/5'],
+    })
@@ -0,0 +1,34 @@
+import os
+from JMTracker.ical import DeadlineFeed
+
+"""
+Export of the posting deadlines to an .ics file.
+"""
+
+
+def test_removed_events_are_cancelled_then_dropped(tmp_path, postings):
+    statuses = ['interested', 'applied']
+    feed = DeadlineFeed(os.path.join(tmp_path, 'deadlines.ics'),
+                        os.path.join(tmp_path, 'deadlines_ics.json'))
+    counts = feed.export(postings, statuses)
+    assert counts == {'added': 2, 'changed': 0, 'removed': 0, 'unchanged': 0}
+
+    postings.loc[4, 'status'] = 'ignore'
+    counts = feed.export(postings, statuses)
+    assert counts == {'added': 0, 'changed': 0, 'removed': 1, 'unchanged': 1}
+    with open(feed.url, 'r', newline='') as handle:
+        text = handle.read()
+    assert text.count('BEGIN:VEVENT') == 2
+    cancelled = text.split('UID:AEA-5@jmtracker')[1].split('END:VEVENT')[0]
+    assert 'STATUS:CANCELLED' in cancelled
+    assert 'SEQUENCE:1' in cancelled
+
+    # The next export, even from a new feed, leaves the cancelled event out
+    feed = DeadlineFeed(feed.url, os.path.join(tmp_path, 'deadlines_ics.json'))
+    counts = feed.export(postings, statuses)
+    assert counts == {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 1}
+    with open(feed.url, 'r', newline='') as handle:
+        text = handle.read()
+    assert text.count('BEGIN:VEVENT') == 1
+    assert 'AEA-5@jmtracker' not in text
+    return
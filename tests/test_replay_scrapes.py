@@ -0,0 +1,154 @@
+import os
+import pandas as pd
+import pytest
+from JMTracker.settings import settings, input_option_settings
+from JMTracker.scrapper import AJOScrapper, EJMScrapper, AEAScrapper
+from JMTracker.replay import ReplayServer, load_fixtures
+
+"""
+Scrapes of the recorded pages in tests/fixtures, served by a local
+ReplayServer so that no job site is contacted.
+"""
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@pytest.fixture
+def scratch(tmp_path, monkeypatch):
+    """Storage, input and output folders in tmp_path, metrics off"""
+    for key in ['storage_directory', 'input_directory', 'output_directory']:
+        monkeypatch.setitem(settings, key, str(tmp_path))
+    monkeypatch.setitem(settings, 'metrics_enabled', False)
+    monkeypatch.setitem(settings, 'scrape_rate_limit', 0)
+    return tmp_path
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """Serve the archive of an origin and point its download_url to it"""
+    servers = []
+
+    def serve(origin):
+        pages, start = load_fixtures(os.path.join(fixtures, origin.lower()))
+        server = ReplayServer(pages).start()
+        servers.append(server)
+        source = next(x for x in input_option_settings
+                      if x['origin'] == origin)
+        monkeypatch.setitem(source, 'download_url', server.url + start)
+        return server
+
+    yield serve
+    for server in servers:
+        server.stop()
+    return
+
+
+def test_ajo_scrape_for_user(scratch, replay):
+    replay('AJO')
+    success, message = AJOScrapper.scrape_for_user()
+    assert success, message
+    data = pd.read_csv(os.path.join(scratch, AJOScrapper.output_file_name))
+    assert list(data['origin_id']) == [27101, 27102, 27103, 27104, 27105,
+                                       27106]
+    assert data.loc[0, 'institution'] == 'Harvard University'
+    assert data.loc[2, 'location'] == 'Montréal, Québec, Canada'
+    assert data.loc[1, 'deadline'] == '2026/11/01'
+    assert pd.isna(data.loc[3, 'deadline'])
+    # The checkpoint of an interrupted run is gone once stored
+    assert not os.path.isfile(
+        os.path.join(scratch, 'ajo_scrape_checkpoint.jsonl'))
+    return
+
+
+def test_ajo_parse_processes_match_threads(scratch, replay):
+    server = replay('AJO')
+    results = []
+    for workers in [0, 2]:
+        scrapper = AJOScrapper(base_url=server.url + '/ajo/econ',
+                               parse_workers=workers, cache=False)
+        # Use the process pool even for a handful of pages
+        scrapper._min_pool_pages = 0
+        success, message = scrapper.get_postings()
+        assert success, message
+        results.append(pd.read_csv(scrapper.stored_url)
+                       .sort_values('origin_id').reset_index(drop=True))
+    pd.testing.assert_frame_equal(results[0], results[1])
+    return
+
+
+def test_ejm_scrape_for_user(scratch, replay):
+    server = replay('EJM')
+    success, message = EJMScrapper.scrape_for_user()
+    assert success, message
+    data = pd.read_csv(os.path.join(scratch, EJMScrapper.output_file_name),
+                       header=1)
+    assert list(data['Id']) == [9001, 9002, 9003, 9004]
+
+    # A second refresh revalidates the cached download
+    requests = server.requests
+    success, message = EJMScrapper.scrape_for_user()
+    assert success, message
+    assert server.requests == requests + 1
+    return
+
+
+def test_aea_scrape_for_user(scratch, replay):
+    replay('AEA')
+    success, message = AEAScrapper.scrape_for_user()
+    assert success, message
+    data = pd.read_excel(os.path.join(scratch, AEAScrapper.output_file_name))
+    assert list(data['jp_id']) == [51001, 51002, 51003]
+    return
+
+
+def test_missing_page_fails_without_raising(scratch, monkeypatch):
+    with ReplayServer({}) as server:
+        source = next(x for x in input_option_settings
+                      if x['origin'] == 'EJM')
+        monkeypatch.setitem(source, 'download_url', server.url + '/missing')
+        success, message = EJMScrapper.scrape_for_user()
+    assert not success
+    return
+
+
+def test_caller_validators_bypass_cache(scratch):
+    from JMTracker.scrapper import PageFetcher
+    pages, _ = load_fixtures(os.path.join(fixtures, 'ejm'))
+    with ReplayServer(pages) as server:
+        url = server.url + '/users/positions/download/a'
+        scrapper = PageFetcher(url)
+        page = scrapper.get_raw()
+        assert page.status_code == 200
+        # The caller's own validators get the 304, not the cached page
+        page = scrapper.get_raw(headers={'If-None-Match': page.headers['ETag']})
+        assert page.status_code == 304
+        # Stale validators of the caller win over the cached ones
+        page = scrapper.get_raw(headers={'If-None-Match': '"stale"'})
+        assert page.status_code == 200
+    return
+
+
+def test_ajo_known_ids_are_not_fetched(scratch, replay):
+    server = replay('AJO')
+    success, message = AJOScrapper.scrape_for_user()
+    assert success, message
+    requests = server.requests
+    # The full refresh is recent, so only the listing and new pages are
+    # fetched
+    success, message = AJOScrapper.scrape_for_user(
+        known_ids={27101, 27102, 27103})
+    assert success, message
+    assert server.requests == requests + 4
+    return
+
+
+def test_unparseable_page_raises_request_error(scratch, monkeypatch):
+    monkeypatch.setitem(settings, 'scrape_backoff', 0)
+    from JMTracker.scrapper import PageFetcher
+    from JMTracker.network import PageParseError
+    pages = {'/empty': (200, {'Content-Type': 'text/html'}, b'')}
+    with ReplayServer(pages) as server:
+        scrapper = PageFetcher(server.url, max_errors=2, cache=False)
+        with pytest.raises(PageParseError):
+            scrapper.get_page(server.url + '/empty')
+    return
@@ -0,0 +1,32 @@
+import numpy as np
+from JMTracker.storage import PostingQuery, PostingIndex, edit_postings
+
+"""
+Queries over postings frames and the indexes answering them.
+"""
+
+
+def test_deadlines_mixing_dates_and_text(postings):
+    deadlines, missing = PostingIndex(postings).deadlines()
+    assert deadlines.dtype == np.dtype('datetime64[ns]')
+    assert list(np.isnat(deadlines)) == [False, True, True, False, False]
+    assert list(missing) == [False, False, True, False, False]
+    return
+
+
+def test_due_on(postings):
+    due = PostingQuery().due_on('2026-11-15').mask(postings)
+    assert list(due) == [True, False, False, True, False]
+    unknown = PostingQuery().due_on(None).mask(postings)
+    assert list(unknown) == [False, True, True, False, False]
+    # Without due_on every posting is kept
+    assert PostingQuery().mask(postings).all()
+    return
+
+
+def test_edits_keep_the_index_current(postings):
+    query = PostingQuery().status('interested')
+    assert list(query.mask(postings)) == [True, False, True, False, False]
+    edit_postings(postings, [0, 3], {'status': 'maybe'})
+    assert list(query.mask(postings)) == [False, False, True, False, False]
+    return